@@ -0,0 +1,480 @@
+"""음성 특성 추출 모듈
+
+요청 스레드와 특성 추출 워커 프로세스에서 함께 사용합니다.
+워커 프로세스가 Flask 앱과 데이터 저장소를 다시 초기화하지 않도록
+server.py에 의존하지 않는 순수 함수만 둡니다.
+"""
+import io
+import logging
+import os
+import tempfile
+import threading
+import warnings
+import wave
+
+import librosa
+import numpy as np
+import scipy.fft
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 22050  # 특성 추출 샘플링 레이트
+MAX_DURATION = 5.0  # 최대 분석 길이 (초)
+
+ENGINE_LIBROSA = 'librosa'
+ENGINE_FAST = 'fast'
+
+# 음성 구간 검출 (VAD) - MFCC 분석 프레임 단위로 앞뒤 비음성 구간 제거
+VAD_ENERGY_RANGE_DB = 35.0  # 가장 큰 프레임 에너지 대비 음성으로 볼 범위
+VAD_ENERGY_FLOOR_DB = -55.0  # 이보다 작은 프레임은 항상 비음성 (dBFS)
+VAD_ZCR_THRESHOLD = 0.3  # 에너지가 조금 낮아도 영교차율이 이 이상이면 무성 자음("ㅅ", "ㅊ")으로 보고 유지
+VAD_ZCR_ENERGY_MARGIN_DB = 10.0  # 영교차율 기준을 적용할 추가 에너지 범위
+VAD_HANGOVER_FRAMES = 3  # 음성 구간 앞뒤로 남길 프레임 수 (약 70ms)
+VAD_MIN_SPEECH_FRAMES = 5  # 검출된 음성이 이보다 짧으면 자르지 않음
+
+
+def compute_features(y, sr, n_mfcc=13):
+    """신호에서 MFCC 평균/표준편차 특성 벡터 계산"""
+    # MFCC 특성 추출
+    mfcc = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=n_mfcc)
+
+    # 통계적 특성 계산 (평균, 표준편차)
+    mfcc_mean = np.mean(mfcc.T, axis=0)
+    mfcc_std = np.std(mfcc.T, axis=0)
+
+    # 특성 벡터 결합
+    return np.concatenate([mfcc_mean, mfcc_std])
+
+
+class MFCCFeatureExtractor:
+    """멜 필터뱅크/DCT 행렬을 캐시하는 고속 MFCC 특성 추출기
+
+    librosa.feature.mfcc 기본 설정(hann 창, center 패딩, slaney 멜 필터,
+    power_to_db top_db=80, ortho DCT-II)과 같은 계산을 numpy 일괄 연산으로
+    수행합니다. 행렬은 (sr, n_fft, n_mels, n_mfcc) 조합마다 한 번만 만듭니다.
+
+    허용 오차:
+    - 22050Hz 입력: librosa 결과와 float32 반올림 오차 수준 (최대 절대 오차 1e-3 이하)
+    - 그 외 레이트: 리샘플링 없이 창 길이/홉을 같은 시간 길이로 맞추고 멜 대역을
+      22050Hz 기준으로 유지합니다. 리샘플링 후 librosa로 계산한 벡터와의 코사인
+      유사도는 음성류 신호에서 0.999 이상, 무음 구간이 길거나 11kHz 이상 성분이
+      많은 신호에서도 0.99 이상입니다 (차이는 리샘플러의 대역 제한에서 발생).
+    """
+
+    _cache = {}
+    _cache_lock = threading.Lock()
+
+    def __init__(self, sr=SAMPLE_RATE, n_fft=2048, hop_length=512, n_mels=128, n_mfcc=13,
+                 win_length=None):
+        self.sr = sr
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+        self.win_length = win_length or n_fft
+        self.n_mels = n_mels
+        self.n_mfcc = n_mfcc
+
+        # 주기형 hann 창 (scipy.signal.get_window('hann', fftbins=True)와 동일),
+        # 창이 FFT 길이보다 짧으면 librosa.stft처럼 가운데 정렬
+        window = 0.5 - 0.5 * np.cos(2 * np.pi * np.arange(self.win_length) / self.win_length)
+        self.window = librosa.util.pad_center(window, size=n_fft).astype(np.float32)
+
+        # 멜 대역은 항상 기준 레이트의 나이퀴스트까지 배치
+        with warnings.catch_warnings():
+            # 기준보다 낮은 레이트에서는 상단 대역이 비어 있는 것이 정상
+            warnings.simplefilter('ignore')
+            self.mel_basis = librosa.filters.mel(
+                sr=sr, n_fft=n_fft, n_mels=n_mels, fmax=SAMPLE_RATE / 2.0
+            ).astype(np.float32)
+
+        # DCT-II (ortho) 행렬의 앞 n_mfcc 행
+        n = np.arange(n_mels)
+        k = np.arange(n_mfcc)[:, None]
+        dct = np.cos(np.pi * k * (2 * n + 1) / (2 * n_mels)) * np.sqrt(2.0 / n_mels)
+        dct[0] *= np.sqrt(0.5)
+        self.dct_basis = dct.astype(np.float32)
+
+        # 기준 레이트와 창 길이가 다를 때의 파워 스케일 보정 (창 길이 비율의 제곱)
+        self.power_scale = np.float32((2048 / self.win_length) ** 2)
+
+    @classmethod
+    def for_rate(cls, sr, n_mfcc=13, n_mels=128):
+        """샘플링 레이트별 추출기 (기준 레이트와 같은 시간 길이의 창/홉 사용)"""
+        win_length = int(round(2048 * sr / SAMPLE_RATE))
+        hop_length = int(round(512 * sr / SAMPLE_RATE))
+        # 창 길이가 소수 인수를 가지면 FFT가 느리므로 빠른 길이로 0 패딩
+        n_fft = scipy.fft.next_fast_len(win_length, real=True)
+        key = (sr, n_fft, n_mels, n_mfcc)
+
+        extractor = cls._cache.get(key)
+        if extractor is None:
+            with cls._cache_lock:
+                extractor = cls._cache.get(key)
+                if extractor is None:
+                    extractor = cls(sr, n_fft, hop_length, n_mels, n_mfcc, win_length)
+                    cls._cache[key] = extractor
+        return extractor
+
+    def frames(self, y):
+        """center 패딩 후 프레임 분할 (n_frames, n_fft)"""
+        pad = self.n_fft // 2
+        y = np.pad(np.asarray(y, dtype=np.float32), (pad, pad))
+        if len(y) < self.n_fft:
+            y = np.pad(y, (0, self.n_fft - len(y)))
+        return np.lib.stride_tricks.sliding_window_view(y, self.n_fft)[::self.hop_length]
+
+    def power_spectrum(self, frames):
+        """프레임별 파워 스펙트럼 (n_frames, 1 + n_fft // 2)"""
+        spectrum = scipy.fft.rfft(frames * self.window, axis=-1)
+        power = spectrum.real ** 2 + spectrum.imag ** 2
+        return power * self.power_scale
+
+    def mfcc_from_power(self, power, top_db=80.0):
+        """파워 스펙트럼에서 MFCC 계산 (n_frames, n_mfcc)"""
+        mel = power @ self.mel_basis.T
+        log_mel = 10.0 * np.log10(np.maximum(mel, 1e-10))
+        if top_db is not None and log_mel.size:
+            log_mel = np.maximum(log_mel, log_mel.max() - top_db)
+        return log_mel @ self.dct_basis.T
+
+    def mfcc(self, y):
+        """신호에서 MFCC 계산 (n_frames, n_mfcc)"""
+        return self.mfcc_from_power(self.power_spectrum(self.frames(y)))
+
+    def features(self, y):
+        """MFCC 평균/표준편차 특성 벡터"""
+        mfcc = self.mfcc(y)
+        return np.concatenate([mfcc.mean(axis=0), mfcc.std(axis=0)])
+
+
+def frame_activity(frames, hop_length):
+    """프레임 가운데 hop 길이 구간의 에너지(dBFS)와 영교차율
+
+    분석 프레임은 hop의 4배 길이로 겹치므로, 각 프레임 중심 구간만 보면
+    신호를 한 번만 훑는 비용으로 MFCC 프레임과 1:1로 대응하는 값을 얻습니다.
+    """
+    offset = (frames.shape[1] - hop_length) // 2
+    block = frames[:, offset:offset + hop_length]
+    energy = np.mean(np.square(block, dtype=np.float32), axis=1)
+    energy_db = 10.0 * np.log10(np.maximum(energy, 1e-12))
+    signs = np.signbit(block)
+    zcr = np.mean(signs[:, 1:] != signs[:, :-1], axis=1)
+    return energy_db, zcr
+
+
+def speech_frame_range(energy_db, zcr):
+    """앞뒤 비음성 프레임을 뺀 음성 구간 [start, end) (음성이 없거나 너무 짧으면 None)
+
+    프레임 에너지가 최댓값 - VAD_ENERGY_RANGE_DB 이상이면 음성, 그보다 조금 낮아도
+    영교차율이 높으면 무성 자음으로 보고 음성에 포함합니다. 중간 휴지는 남깁니다.
+    """
+    if not len(energy_db):
+        return None
+
+    threshold = max(float(energy_db.max()) - VAD_ENERGY_RANGE_DB, VAD_ENERGY_FLOOR_DB)
+    unvoiced_threshold = max(threshold - VAD_ZCR_ENERGY_MARGIN_DB, VAD_ENERGY_FLOOR_DB)
+    speech = (energy_db >= threshold) | ((energy_db >= unvoiced_threshold) & (zcr >= VAD_ZCR_THRESHOLD))
+
+    indices = np.flatnonzero(speech)
+    if len(indices) < VAD_MIN_SPEECH_FRAMES:
+        return None
+    start = max(int(indices[0]) - VAD_HANGOVER_FRAMES, 0)
+    end = min(int(indices[-1]) + 1 + VAD_HANGOVER_FRAMES, len(energy_db))
+    return start, end
+
+
+def trim_silence(y, sr):
+    """앞뒤 비음성 구간 제거 - (신호, VAD 통계 {'frames', 'dropped', 'speech'})
+
+    MFCC와 같은 프레임 배치(창/홉)로 판단하고, 남길 프레임 중심을 모두
+    포함하도록 자르므로 잘린 신호의 MFCC 프레임 수는 남긴 프레임 수와 같습니다.
+    """
+    extractor = MFCCFeatureExtractor.for_rate(sr)
+    frames = extractor.frames(y)
+    energy_db, zcr = frame_activity(frames, extractor.hop_length)
+    bounds = speech_frame_range(energy_db, zcr)
+
+    stats = {'frames': len(frames), 'dropped': 0, 'speech': bounds is not None}
+    if bounds is None:
+        return y, stats
+
+    start, end = bounds
+    stats['dropped'] = len(frames) - (end - start)
+    hop = extractor.hop_length
+    return y[start * hop:(end - 1) * hop + 1], stats
+
+
+def load_audio_file(audio_file_path, engine=ENGINE_LIBROSA):
+    """음성 파일 로드 (fast 엔진은 원본 샘플링 레이트 유지)"""
+    target_sr = None if engine == ENGINE_FAST else SAMPLE_RATE
+    return librosa.load(audio_file_path, sr=target_sr, duration=MAX_DURATION)
+
+
+def compute_features_with_stats(y, sr, n_mfcc=13, engine=ENGINE_LIBROSA, vad=False):
+    """선택된 엔진으로 특성 벡터 계산 - (특성 벡터, VAD 통계 또는 None)
+
+    vad=True이면 앞뒤 비음성 구간을 잘라낸 뒤 MFCC를 계산합니다.
+    """
+    if engine != ENGINE_FAST and sr != SAMPLE_RATE:
+        y = librosa.resample(y, orig_sr=sr, target_sr=SAMPLE_RATE)
+        sr = SAMPLE_RATE
+
+    vad_stats = None
+    if vad:
+        y, vad_stats = trim_silence(y, sr)
+
+    if engine == ENGINE_FAST:
+        return MFCCFeatureExtractor.for_rate(sr, n_mfcc=n_mfcc).features(y), vad_stats
+    return compute_features(y, sr, n_mfcc), vad_stats
+
+
+def compute_features_with_engine(y, sr, n_mfcc=13, engine=ENGINE_LIBROSA, vad=False):
+    """선택된 엔진으로 특성 벡터 계산"""
+    return compute_features_with_stats(y, sr, n_mfcc, engine, vad)[0]
+
+
+def extract_voice_features(audio_file_path, n_mfcc=13, engine=ENGINE_LIBROSA, vad=False):
+    """음성 파일에서 MFCC 특성 추출"""
+    try:
+        y, sr = load_audio_file(audio_file_path, engine)
+        return compute_features_with_engine(y, sr, n_mfcc, engine, vad)
+
+    except Exception as e:
+        logger.error(f"음성 특성 추출 오류: {str(e)}")
+        return None
+
+
+_PCM_DTYPES = {1: np.uint8, 2: np.dtype('<i2'), 4: np.dtype('<i4')}
+
+
+def pcm_to_float(raw, sample_width, n_channels=1):
+    """little-endian PCM 바이트를 [-1, 1) float32 모노 신호로 변환 (지원하지 않는 폭이면 None)"""
+    if sample_width == 3:
+        # 24bit PCM은 상위 바이트를 붙여 32bit로 확장
+        packed = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3)
+        raw = np.pad(packed, ((0, 0), (1, 0))).tobytes()
+        sample_width = 4
+    dtype = _PCM_DTYPES.get(sample_width)
+    if dtype is None:
+        return None
+
+    samples = np.frombuffer(raw, dtype=dtype)
+    if sample_width == 1:
+        # 8bit PCM은 부호 없는 정수
+        y = (samples.astype(np.float32) - 128.0) / 128.0
+    else:
+        y = samples.astype(np.float32) / float(2 ** (8 * sample_width - 1))
+
+    if n_channels > 1:
+        y = y.reshape(-1, n_channels).mean(axis=1)
+
+    return y
+
+
+def parse_wav_header(data):
+    """WAV 헤더 해석 - (sr, 채널 수, 샘플 폭, PCM 시작 위치)
+
+    'data' 청크 헤더까지 아직 받지 못했으면 None, PCM WAV가 아니면 ValueError.
+    """
+    if len(data) < 12:
+        return None
+    if data[:4] != b'RIFF' or data[8:12] != b'WAVE':
+        raise ValueError('WAV 형식이 아닙니다.')
+
+    offset = 12
+    fmt = None
+    while offset + 8 <= len(data):
+        chunk_id = data[offset:offset + 4]
+        chunk_size = int.from_bytes(data[offset + 4:offset + 8], 'little')
+        body = offset + 8
+        if chunk_id == b'data':
+            if fmt is None:
+                raise ValueError('fmt 청크가 없습니다.')
+            return fmt + (body,)
+        if chunk_id == b'fmt ':
+            if body + 16 > len(data):
+                return None
+            audio_format = int.from_bytes(data[body:body + 2], 'little')
+            if audio_format not in (1, 0xFFFE):  # PCM, WAVE_FORMAT_EXTENSIBLE
+                raise ValueError('PCM WAV만 지원합니다.')
+            n_channels = int.from_bytes(data[body + 2:body + 4], 'little')
+            sr = int.from_bytes(data[body + 4:body + 8], 'little')
+            sample_width = int.from_bytes(data[body + 14:body + 16], 'little') // 8
+            fmt = (sr, n_channels, sample_width)
+        offset = body + chunk_size + (chunk_size & 1)
+    return None
+
+
+def decode_wav_bytes(data, max_duration=MAX_DURATION):
+    """PCM WAV 바이트를 메모리에서 디코딩 (지원하지 않는 형식이면 None)"""
+    try:
+        with wave.open(io.BytesIO(data), 'rb') as wav:
+            n_channels = wav.getnchannels()
+            sample_width = wav.getsampwidth()
+            sr = wav.getframerate()
+            n_frames = min(wav.getnframes(), int(max_duration * sr))
+            raw = wav.readframes(n_frames)
+    except (wave.Error, EOFError):
+        return None
+
+    y = pcm_to_float(raw, sample_width, n_channels)
+    if y is None:
+        return None
+    return y, sr
+
+
+def load_audio_bytes(data, filename, spool_dir=None, engine=ENGINE_LIBROSA):
+    """업로드 바이트에서 신호 로드 (WAV는 메모리, 압축 형식은 임시 파일 경유)"""
+    ext = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+
+    if ext == 'wav':
+        decoded = decode_wav_bytes(data)
+        if decoded is not None:
+            y, sr = decoded
+            if sr != SAMPLE_RATE and engine != ENGINE_FAST:
+                y = librosa.resample(y, orig_sr=sr, target_sr=SAMPLE_RATE)
+                sr = SAMPLE_RATE
+            return y, sr
+
+    # m4a/aac 등 압축 형식은 디코더가 파일 경로를 필요로 하므로 디스크 경유
+    fd, path = tempfile.mkstemp(suffix=f'.{ext}' if ext else '', dir=spool_dir)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        return load_audio_file(path, engine)
+    finally:
+        os.remove(path)
+
+
+def extract_voice_features_from_bytes_with_stats(data, filename, n_mfcc=13, spool_dir=None,
+                                                 engine=ENGINE_LIBROSA, vad=False):
+    """업로드된 음성 바이트에서 MFCC 특성 추출 - (특성 벡터 또는 None, VAD 통계 또는 None)"""
+    try:
+        y, sr = load_audio_bytes(data, filename, spool_dir, engine)
+        return compute_features_with_stats(y, sr, n_mfcc, engine, vad)
+
+    except Exception as e:
+        logger.error(f"음성 특성 추출 오류: {str(e)}")
+        return None, None
+
+
+def extract_voice_features_from_bytes(data, filename, n_mfcc=13, spool_dir=None,
+                                      engine=ENGINE_LIBROSA, vad=False):
+    """업로드된 음성 바이트에서 MFCC 특성 추출"""
+    return extract_voice_features_from_bytes_with_stats(data, filename, n_mfcc, spool_dir, engine, vad)[0]
+
+
+class StreamingFeatureExtractor:
+    """청크 단위로 들어오는 PCM에서 MFCC 특성 벡터를 점진 계산
+
+    청크가 올 때마다 완성된 프레임의 STFT/멜 필터뱅크/로그 변환까지 끝내고,
+    원본 신호는 다음 프레임에 필요한 창 길이만큼만 남깁니다. 최종 특성은
+    top_db 클리핑 기준(전체 최댓값 - 80dB)이 끝까지 정해지지 않으므로 프레임별
+    로그 멜 값(프레임당 n_mels개)을 보관했다가 finish에서 클리핑/DCT/평균·표준편차만
+    계산합니다 (수십 마이크로초). 결과는 같은 신호 전체에 대한
+    MFCCFeatureExtractor.features와 같습니다 (fast 엔진, 리샘플링 없음).
+    vad=True이면 프레임별 에너지/영교차율도 함께 모아 두었다가 finish에서
+    앞뒤 비음성 프레임을 빼고 계산합니다 (통계는 vad_stats).
+
+    keep_signal=True이면 프레임 분석 없이 변환한 신호만 모아 두고 signal()로
+    돌려줍니다. 등록 프로필이 fast가 아닌 엔진(librosa)으로 추출된 경우 같은
+    엔진으로 일괄 계산하기 위한 모드입니다 (finish는 None).
+    """
+
+    def __init__(self, sr, n_channels=1, sample_width=2, n_mfcc=13, max_duration=MAX_DURATION,
+                 vad=False, keep_signal=False):
+        if _PCM_DTYPES.get(sample_width) is None and sample_width != 3:
+            raise ValueError('지원하지 않는 샘플 폭입니다.')
+        if not 8000 <= sr <= 96000 or not 1 <= n_channels <= 8:
+            raise ValueError('지원하지 않는 샘플링 레이트/채널 수입니다.')
+
+        self.sr = sr
+        self.n_channels = n_channels
+        self.sample_width = sample_width
+        self.extractor = MFCCFeatureExtractor.for_rate(sr, n_mfcc=n_mfcc)
+        self.max_samples = int(max_duration * sr)
+
+        self._frame_bytes = n_channels * sample_width
+        self._remainder = b''  # 샘플 경계에 걸친 바이트
+        # center 패딩(앞쪽 0)으로 시작, 프레임을 만들고 남은 신호만 유지
+        self._pending = np.zeros(self.extractor.n_fft // 2, dtype=np.float32)
+        max_frames = 1 + self.max_samples // self.extractor.hop_length
+        self._log_mel = np.empty((max_frames, self.extractor.n_mels), dtype=np.float32)
+        self.vad = vad
+        if vad:
+            self._energy_db = np.empty(max_frames, dtype=np.float32)
+            self._zcr = np.empty(max_frames, dtype=np.float32)
+        self.vad_stats = None
+        self.keep_signal = keep_signal
+        self._chunks = []  # keep_signal 모드에서 받은 신호
+        self.n_samples = 0
+        self.n_frames = 0
+        self.finished = False
+
+    def feed(self, data):
+        """PCM 청크 추가 - 처리한 프레임 수 반환 (최대 길이를 넘는 신호는 무시)"""
+        data = self._remainder + data
+        usable = len(data) - len(data) % self._frame_bytes
+        self._remainder = data[usable:]
+
+        y = pcm_to_float(data[:usable], self.sample_width, self.n_channels)
+        y = y[:max(self.max_samples - self.n_samples, 0)]
+        self.n_samples += len(y)
+        if self.keep_signal:
+            self._chunks.append(y)
+            return 0
+        return self._consume(np.concatenate([self._pending, y]))
+
+    def signal(self):
+        """keep_signal 모드에서 받은 전체 신호 (float32 모노)"""
+        return np.concatenate(self._chunks) if self._chunks else np.zeros(0, dtype=np.float32)
+
+    def _consume(self, signal):
+        n_fft = self.extractor.n_fft
+        hop = self.extractor.hop_length
+        if len(signal) < n_fft:
+            self._pending = signal
+            return 0
+
+        n_new = 1 + (len(signal) - n_fft) // hop
+        frames = np.lib.stride_tricks.sliding_window_view(signal, n_fft)[::hop][:n_new]
+        mel = self.extractor.power_spectrum(frames) @ self.extractor.mel_basis.T
+        self._log_mel[self.n_frames:self.n_frames + n_new] = 10.0 * np.log10(np.maximum(mel, 1e-10))
+        if self.vad:
+            energy_db, zcr = frame_activity(frames, hop)
+            self._energy_db[self.n_frames:self.n_frames + n_new] = energy_db
+            self._zcr[self.n_frames:self.n_frames + n_new] = zcr
+        self.n_frames += n_new
+        self._pending = signal[n_new * hop:].copy()
+        return n_new
+
+    def finish(self, top_db=80.0):
+        """남은 프레임 처리 후 MFCC 평균/표준편차 특성 벡터 (받은 신호가 없거나 keep_signal 모드면 None)"""
+        if self.keep_signal:
+            return None
+        if not self.finished:
+            self.finished = True
+            self._consume(np.concatenate([self._pending, np.zeros(self.extractor.n_fft // 2, dtype=np.float32)]))
+        if self.n_samples == 0:
+            return None
+
+        log_mel = self._log_mel[:self.n_frames]
+        if self.vad:
+            bounds = speech_frame_range(self._energy_db[:self.n_frames], self._zcr[:self.n_frames])
+            self.vad_stats = {'frames': self.n_frames, 'dropped': 0, 'speech': bounds is not None}
+            if bounds is not None:
+                log_mel = log_mel[bounds[0]:bounds[1]]
+                self.vad_stats['dropped'] = self.n_frames - len(log_mel)
+        log_mel = np.maximum(log_mel, log_mel.max() - top_db)
+        mfcc = log_mel @ self.extractor.dct_basis.T
+        return np.concatenate([mfcc.mean(axis=0), mfcc.std(axis=0)])
+
+    @property
+    def duration(self):
+        return self.n_samples / self.sr
+
+
+def warm_up():
+    """워커 시작 시 librosa 지연 로딩/JIT 컴파일을 미리 수행"""
+    y = np.zeros(SAMPLE_RATE // 2, dtype=np.float32)
+    librosa.feature.mfcc(y=y, sr=SAMPLE_RATE, n_mfcc=13)
+    MFCCFeatureExtractor.for_rate(SAMPLE_RATE).features(y)
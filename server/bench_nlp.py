@@ -0,0 +1,163 @@
+"""이체 발화 분석 마이크로 벤치마크
+
+사용법: python bench_nlp.py [--repeat 2000]
+
+발화 코퍼스 전체에 대해 NLPService.extract_transfer_info 호출당 지연 시간
+(평균/중앙값/p99)을 측정하고, 비교용으로 기존 순차 패턴 방식도 함께 측정합니다.
+측정 전에 회귀 사례의 추출 결과를 확인하고, 틀리면 종료 코드 1로 끝냅니다.
+"""
+import argparse
+import re
+import statistics
+import sys
+import time
+
+from transfer_nlp import NLPService
+
+# 이체 발화 코퍼스 (STT 결과 형태)
+CORPUS = [
+    '김철수에게 5만원 보내줘',
+    '홍길동한테 3000원 송금해줘',
+    '엄마께 10만원 보내드려',
+    '김철수님에게 2만원 이체해줘',
+    '홍길동 님한테 5천원 보내',
+    '이영희에게 150000원 송금',
+    '5만원 김철수에게 보내줘',
+    '아빠한테 용돈 20만원 보내줘',
+    '박지성에게 1만 보내',
+    '최민수한테 7천 송금해줘',
+    '친구에게 돈 보내줘',
+    '30000원 보내줘',
+    '김철수에게 오만원 보내줘',
+    '오늘 저녁 식사비 김영수한테 45000원 보내줘',
+    '계좌 잔액 알려줘',
+    '홍길동에게 3만5천원 보내줘',
+    '엄마께 삼십오만 이천원 보내줘',
+    '이영희한테 1억 2천만원 송금해줘',
+    '김철수에게 오십만원 이체',
+    '박지성님께 1,500원 보내줘',
+]
+
+# 회귀 사례: (발화, 기대 수취인, 기대 금액)
+# 앞 단어가 수사 글자로 끝나는 경우 ("내일", "친구", "회사", "이")에도 금액을 잃지 않아야 함
+REGRESSION_CASES = [
+    ('김철수에게 내일 5만원 보내줘', '김철수', 50000),
+    ('친구 5만원 김철수에게 보내줘', '김철수', 50000),
+    ('홍길동에게 회사 3만원', '홍길동', 30000),
+    ('김철수에게 이 5만원 보내줘', '김철수', 50000),
+    ('회사 만원 김철수에게', '김철수', 10000),
+    ('김철수에게오만원 보내줘', '김철수', 50000),
+    ('엄마께 삼십오만 이천원 보내줘', '엄마', 352000),
+    ('이영희한테 1억 2천만원 송금해줘', '이영희', 120000000),
+    ('홍길동에게 3만5천원 보내줘', '홍길동', 35000),
+    ('박지성님께 1,500원 보내줘', '박지성', 1500),
+    ('오늘 저녁 식사비 김영수한테 45000원 보내줘', '김영수', 45000),
+    ('계좌 잔액 알려줘', None, None),
+    # '원'이 반복된 금액은 합치거나, 합칠 수 없으면 금액 없음으로 처리
+    ('김철수에게 삼십오만원 이천원', '김철수', 352000),
+    ('김철수에게 삼만원 오천원 보내줘', '김철수', 35000),
+    ('김철수에게 오천원 삼만원 보내줘', '김철수', None),
+]
+
+
+class LegacyNLPService:
+    """비교용: 요청마다 패턴 목록을 만들고 순차 검색하던 기존 방식"""
+
+    def extract_transfer_info(self, text):
+        recipient_patterns = [
+            r'([가-힣]{2,4})(에게|한테|께)',
+            r'([가-힣]{2,4})\s*(님)?\s*(에게|한테|께)',
+        ]
+
+        recipient = None
+        for pattern in recipient_patterns:
+            match = re.search(pattern, text)
+            if match:
+                recipient = match.group(1)
+                break
+
+        amount = self._extract_amount(text)
+        return {
+            'recipient': recipient,
+            'amount': amount,
+            'original_text': text,
+            'extracted_successfully': recipient is not None and amount is not None
+        }
+
+    def _extract_amount(self, text):
+        amount_patterns = [
+            r'(\d+)\s*만\s*원',
+            r'(\d+)\s*천\s*원',
+            r'(\d+)\s*원',
+            r'(\d+)\s*만',
+            r'(\d+)\s*천',
+        ]
+
+        for pattern in amount_patterns:
+            match = re.search(pattern, text)
+            if match:
+                number = int(match.group(1))
+                if '만' in pattern:
+                    return number * 10000
+                elif '천' in pattern:
+                    return number * 1000
+                return number
+        return None
+
+
+def measure(service, repeat):
+    """발화별 호출 지연 시간 목록 (마이크로초)"""
+    samples = []
+    for _ in range(repeat):
+        for text in CORPUS:
+            start = time.perf_counter_ns()
+            service.extract_transfer_info(text)
+            samples.append((time.perf_counter_ns() - start) / 1000)
+    return samples
+
+
+def report(name, samples):
+    samples.sort()
+    p99 = samples[int(len(samples) * 0.99) - 1]
+    print(f"{name:<8} 평균 {statistics.fmean(samples):6.2f}us  중앙값 {statistics.median(samples):6.2f}us  p99 {p99:6.2f}us")
+
+
+def check_regressions(service):
+    """회귀 사례 확인 - 틀린 사례 수 반환"""
+    failures = 0
+    for text, recipient, amount in REGRESSION_CASES:
+        result = service.extract_transfer_info(text)
+        if (result['recipient'], result['amount']) != (recipient, amount):
+            failures += 1
+            print(f"  실패: {text} -> {result['recipient']}, {result['amount']} (기대: {recipient}, {amount})")
+    print(f"회귀 사례 {len(REGRESSION_CASES) - failures}/{len(REGRESSION_CASES)} 통과\n")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description='이체 발화 분석 마이크로 벤치마크')
+    parser.add_argument('--repeat', type=int, default=2000, help='코퍼스 반복 횟수')
+    args = parser.parse_args()
+
+    current = NLPService()
+    legacy = LegacyNLPService()
+
+    if check_regressions(current):
+        sys.exit(1)
+
+    print(f"코퍼스 {len(CORPUS)}문장 x {args.repeat}회\n")
+    for text in CORPUS:
+        result = current.extract_transfer_info(text)
+        print(f"  {text:<32} -> {result['recipient']}, {result['amount']}")
+    print()
+
+    # 워밍업 (정규식 캐시, 바이트코드 특화)
+    measure(current, 10)
+    measure(legacy, 10)
+
+    report('current', measure(current, args.repeat))
+    report('legacy', measure(legacy, args.repeat))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,20 +1,40 @@
-from flask import Flask, request, jsonify
-from flask_jwt_extended import JWTManager, create_access_token, jwt_required, get_jwt_identity
+from flask import Flask, request, jsonify, Response, g, has_request_context
+from flask.json.provider import DefaultJSONProvider
+from flask_jwt_extended import JWTManager, create_access_token, decode_token, jwt_required, get_jwt_identity
 from flask_cors import CORS
-import librosa
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
 import pickle
+import struct
+import zlib
 import os
 import re
 from datetime import datetime, timedelta
-from werkzeug.utils import secure_filename
 import logging
-from functools import wraps
-from collections import defaultdict
+from functools import wraps, partial
+from urllib.parse import parse_qs
+from collections import defaultdict, OrderedDict, deque
+from collections.abc import Mapping
 import uuid
+import asyncio
+import array
+import bisect
+import heapq
+import hashlib
+import hmac
 import threading
+import time
 from datetime import timezone
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+import audio_features
+from transfer_nlp import NLPService, RecipientIndex
+
+try:
+    import orjson  # 선택 의존성: 있으면 응답 JSON 인코딩에 사용
+except ImportError:
+    orjson = None
 
 
 # ========================= 유틸리티 함수 =========================
@@ -63,6 +83,47 @@ def utc_now():
     return datetime.now(timezone.utc)
 
 
+# ========================= JSON 직렬화 =========================
+
+class FastJSONProvider(DefaultJSONProvider):
+    """응답 JSON 인코더 선택 가능한 JSON 프로바이더
+
+    backend='orjson'이면 orjson으로 바로 bytes를 만들고, 'json'이면 Flask 기본
+    (표준 json 모듈)을 사용합니다. 'auto'는 orjson이 설치되어 있을 때만 사용.
+    키 정렬, debug 모드 들여쓰기, datetime 등 기본 타입 변환은 기본 동작과 같습니다.
+    """
+    
+    def __init__(self, app, backend='auto'):
+        super().__init__(app)
+        if backend == 'auto':
+            backend = 'orjson' if orjson is not None else 'json'
+        if backend == 'orjson' and orjson is None:
+            raise ValueError("orjson이 설치되어 있지 않습니다.")
+        self.backend = backend
+    
+    def _orjson_options(self, pretty):
+        options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if pretty:
+            options |= orjson.OPT_INDENT_2
+        return options
+    
+    def dumps(self, obj, **kwargs):
+        if self.backend != 'orjson' or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._orjson_options(False)).decode('utf-8')
+    
+    def response(self, *args, **kwargs):
+        if self.backend != 'orjson':
+            return super().response(*args, **kwargs)
+        
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(obj, default=self.default, option=self._orjson_options(pretty))
+        return self._app.response_class(body + b'\n', mimetype=self.mimetype)
+
+
 # Flask 앱 초기화
 app = Flask(__name__)
 
@@ -70,8 +131,57 @@ app = Flask(__name__)
 app.config['SECRET_KEY'] = 'your-secret-key-here'
 app.config['JWT_SECRET_KEY'] = 'jwt-secret-string'
 app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(hours=24)
+# 관리자 API는 관리자 사용자(is_admin 또는 ADMIN_USERNAMES)의 토큰과 X-Admin-Key 헤더를 함께 요구
+# 로그인은 비밀번호를 확인하지 않으므로 키가 설정되지 않으면 관리자 API를 열지 않음
+app.config['ADMIN_USERNAMES'] = frozenset(filter(None, os.environ.get('ADMIN_USERNAMES', '').split(',')))
+app.config['ADMIN_API_KEY'] = os.environ.get('ADMIN_API_KEY')
 app.config['UPLOAD_FOLDER'] = 'data/uploads'
+app.config['DATA_DIR'] = 'data/store'  # WAL/스냅샷 저장 위치
+# 기본은 인메모리 (재시작 시 테스트 데이터로 초기화) - PERSISTENCE_ENABLED=1이면 WAL/스냅샷으로 영속화
+app.config['PERSISTENCE_ENABLED'] = os.environ.get('PERSISTENCE_ENABLED', '').lower() in ('1', 'true', 'yes')
+app.config['WAL_SYNC_MODE'] = 'group'  # 'group': fsync 완료 후 응답, 'async': 대기 없음, 'off': fsync 안 함
+app.config['SNAPSHOT_INTERVAL'] = 300  # 스냅샷 주기 (초)
+app.config['SNAPSHOT_MIN_RECORDS'] = 1000  # 주기 도래 시 이 개수 이상 변경이 있으면 스냅샷
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+app.config['FEATURE_EXTRACTION_WORKERS'] = os.cpu_count() or 1  # 0이면 스레드 풀에서 실행
+app.config['FEATURE_EXTRACTION_QUEUE_SIZE'] = 32  # 실행 중 + 대기 작업 최대 개수
+app.config['FEATURE_EXTRACTION_TIMEOUT'] = 10.0  # 작업당 최대 대기 시간 (초)
+app.config['VOICE_FEATURE_ENGINE'] = 'librosa'  # 'librosa' 또는 'fast' (캐시된 행렬 기반 MFCC)
+app.config['VOICE_VAD_ENABLED'] = True  # MFCC 계산 전 앞뒤 무음/비음성 프레임 제거 (에너지 + 영교차율)
+app.config['VOICE_INDEX_MODE'] = 'exact'  # 화자 검색 방식: 'exact' 또는 'ivf' (대규모용 근사 검색)
+app.config['VOICE_INDEX_IVF_LISTS'] = 256  # IVF 분할 수
+app.config['VOICE_INDEX_IVF_NPROBE'] = 16  # 검색 시 탐색할 분할 수
+app.config['VOICE_ENROLLMENT_MAX_SAMPLES'] = 10  # 한 번에 등록 가능한 음성 샘플 수
+app.config['VOICE_ADAPTIVE_ENROLLMENT'] = False  # 음성 이체 인증 성공 시 프로필 적응형 갱신
+app.config['VOICE_ADAPTIVE_MIN_SIMILARITY'] = 0.95  # 적응형 갱신에 반영할 최소 유사도
+app.config['VOICE_ADAPTIVE_MAX_SAMPLES'] = 20  # 적응형 갱신 시 표본 수 상한 (최근 샘플 가중치 유지)
+app.config['VOICE_FEATURE_CACHE_MAX_BYTES'] = 8 * 1024 * 1024  # 음성 내용 해시 -> 특성 벡터 캐시 메모리 상한 (0이면 사용 안 함)
+app.config['VOICE_REPLAY_DETECTION'] = False  # 인증에 성공한 녹음과 같은 음성이 다시 오면 거부
+app.config['VOICE_REPLAY_WINDOW'] = 300  # 재전송 판단 기간 (초)
+app.config['VOICE_STREAM_IDLE_TIMEOUT'] = 30  # 청크가 오지 않으면 스트리밍 업로드를 폐기할 시간 (초)
+app.config['VOICE_STREAM_MAX_SESSIONS'] = 256  # 동시에 진행할 수 있는 스트리밍 업로드 수
+app.config['VOICE_STREAM_MAX_ACTIVE_CHUNKS'] = os.cpu_count() or 1  # 동시에 분석할 수 있는 청크 수 (넘치면 429)
+app.config['JSON_ENCODER_BACKEND'] = 'auto'  # 'auto', 'orjson', 'json' (표준 라이브러리)
+app.config['TRANSACTIONS_PAGE_MAX_LIMIT'] = 1000  # 거래 내역 한 페이지 최대 건수 (limit 생략 시 기본값)
+app.config['TRANSACTION_VIEW_CACHE_SIZE'] = 100000  # 미리 포맷팅해 둘 최근 거래 수
+app.config['READ_MODEL_CACHE_SIZE'] = 10000  # 계좌 목록/잔액 요약 캐시 항목 수 (사용자당 최대 2개)
+app.config['READ_MODEL_CACHE_TTL'] = 60  # 캐시 항목 유효 시간 (초)
+app.config['EVENT_BUFFER_SIZE'] = 100  # 사용자별로 보관할 최근 이벤트 수 (재연결 시 이어받기)
+app.config['EVENT_STREAM_HEARTBEAT'] = 15  # SSE keep-alive 주기 (초)
+app.config['EVENT_STREAM_MAX_DURATION'] = 300  # SSE 연결 최대 유지 시간 (초, 이후 클라이언트 재연결)
+app.config['EVENT_POLL_MAX_TIMEOUT'] = 30  # long-poll 최대 대기 시간 (초)
+app.config['EVENT_CHANNEL_IDLE_TTL'] = 60  # 구독자가 없어진 사용자 버퍼 유지 시간 (초, long-poll 간 공백 대비)
+app.config['EVENT_MAX_WAITERS'] = 32  # Flask 경로에서 이벤트 대기로 요청 스레드를 붙잡을 수 있는 최대 연결 수 (대량 연결은 이벤트 서버 사용)
+app.config['EVENT_SERVER_PORT'] = int(os.environ.get('EVENT_SERVER_PORT', '8081'))  # 스레드 없는 이벤트 서버 포트 (SSE/long-poll 대량 연결용, 0이면 사용 안 함)
+app.config['EVENT_SERVER_MAX_CONNECTIONS'] = 50000  # 이벤트 서버 동시 연결 상한 (프로세스 파일 디스크립터 한도 안에서 설정)
+app.config['RECIPIENT_FUZZY_MAX_DISTANCE'] = 2  # 수취인 후보로 보여줄 최대 자모 편집 거리
+app.config['RECIPIENT_FUZZY_AUTO_DISTANCE'] = 1  # 후보가 하나뿐일 때 보정할 최대 자모 편집 거리 (확인 단계가 있는 이체 준비에서만)
+app.config['RECIPIENT_CANDIDATE_LIMIT'] = 5  # 반환할 수취인 후보 수
+app.config['TRANSFER_HOLD_TTL'] = 180  # 준비된 음성 이체의 확인 대기 시간 (초, 이후 보류 금액 해제)
+app.config['IDEMPOTENCY_CACHE_SIZE'] = 10000  # 보관할 Idempotency-Key 응답 수
+app.config['IDEMPOTENCY_KEY_TTL'] = 24 * 60 * 60  # Idempotency-Key 응답 보관 시간 (초)
+
+app.json = FastJSONProvider(app, app.config['JSON_ENCODER_BACKEND'])
 
 # 확장 프로그램 초기화
 jwt = JWTManager(app)
@@ -128,24 +238,753 @@ os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 # 데이터 동기화용 락
 data_lock = threading.RLock()
 
+# ========================= 영속화 (WAL/스냅샷) =========================
+
+class PersistenceError(Exception):
+    """WAL 기록 실패 (디스크 가득 참, 입출력 오류 등) - 이후 변경은 디스크에 남지 않음"""
+    pass
+
+class WriteAheadLog:
+    """DataStore 변경 내용을 기록하는 추가 전용 로그
+
+    - 레코드: [길이 4바이트][CRC32 4바이트][pickle((lsn, op, args))]
+    - 세그먼트 파일 이름은 wal-<첫 LSN>.log, 스냅샷마다 새 세그먼트로 교체
+    - 그룹 커밋: 기록 스레드가 fsync하는 동안 쌓인 레코드를 다음 fsync 한 번으로 처리
+    """
+    
+    HEADER = struct.Struct('<II')
+    _ROTATE = object()
+    
+    def __init__(self, directory, sync_mode='group'):
+        self.directory = directory
+        self.sync_mode = sync_mode
+        os.makedirs(directory, exist_ok=True)
+        
+        self.last_lsn = 0  # 마지막으로 부여한 LSN
+        self.durable_lsn = 0  # 디스크에 기록 완료된 LSN
+        self._pending = []
+        self._cond = threading.Condition()
+        self._file = None
+        self._writer = None
+        self._closing = False
+        self._error = None  # 기록 스레드가 실패한 원인 (이후 모든 대기는 PersistenceError)
+    
+    def segments(self):
+        """(첫 LSN, 경로) 목록 (LSN 오름차순)"""
+        segments = []
+        for name in os.listdir(self.directory):
+            if name.startswith('wal-') and name.endswith('.log'):
+                segments.append((int(name[4:-4]), os.path.join(self.directory, name)))
+        return sorted(segments)
+    
+    def _segment_path(self, first_lsn):
+        return os.path.join(self.directory, f'wal-{first_lsn:020d}.log')
+    
+    def read_records(self, after_lsn=0):
+        """after_lsn 이후 레코드 순회 (잘린/손상된 꼬리는 잘라내고 중단)"""
+        for _, path in self.segments():
+            with open(path, 'rb') as f:
+                data = f.read()
+            
+            offset = 0
+            while offset < len(data):
+                if offset + self.HEADER.size > len(data):
+                    break
+                length, crc = self.HEADER.unpack_from(data, offset)
+                payload = data[offset + self.HEADER.size:offset + self.HEADER.size + length]
+                if len(payload) < length or zlib.crc32(payload) != crc:
+                    break
+                offset += self.HEADER.size + length
+                
+                lsn, op, args = pickle.loads(payload)
+                self.last_lsn = max(self.last_lsn, lsn)
+                if lsn > after_lsn:
+                    yield lsn, op, args
+            
+            if offset < len(data):
+                # 기록 도중 중단된 꼬리 레코드 제거
+                logger.warning(f"WAL 손상 구간 제거 - {path}, 오프셋 {offset}")
+                with open(path, 'r+b') as f:
+                    f.truncate(offset)
+        
+        self.durable_lsn = self.last_lsn
+    
+    def open(self):
+        """새 세그먼트를 열고 기록 스레드 시작"""
+        self._file = open(self._segment_path(self.last_lsn + 1), 'ab')
+        self._writer = threading.Thread(target=self._write_loop, name='wal-writer', daemon=True)
+        self._writer.start()
+    
+    def append(self, op, args):
+        """레코드 추가 후 LSN 반환 (직렬화는 호출 시점 상태 기준)"""
+        with self._cond:
+            self.last_lsn += 1
+            lsn = self.last_lsn
+            payload = pickle.dumps((lsn, op, args), protocol=pickle.HIGHEST_PROTOCOL)
+            self._pending.append(self.HEADER.pack(len(payload), zlib.crc32(payload)) + payload)
+            self._cond.notify_all()
+            return lsn
+    
+    def rotate(self):
+        """다음 레코드부터 새 세그먼트에 기록 - 이전 세그먼트의 마지막 LSN 반환"""
+        with self._cond:
+            self._pending.append((self._ROTATE, self.last_lsn + 1))
+            self._cond.notify_all()
+            return self.last_lsn
+    
+    def wait_durable(self, lsn):
+        """lsn까지 디스크 기록 완료 대기 (group 모드만, 기록 스레드가 실패했으면 PersistenceError)"""
+        with self._cond:
+            if self.sync_mode == 'group':
+                while self.durable_lsn < lsn and not self._closing and self._error is None:
+                    self._cond.wait()
+            if self.durable_lsn < lsn and self._error is not None:
+                raise PersistenceError(f"WAL 기록 실패: {self._error}")
+    
+    def _write_loop(self):
+        try:
+            self._write_batches()
+        except Exception as e:
+            # 대기 중인 쓰기 요청이 무한히 기다리지 않도록 실패를 기록하고 깨움
+            logger.critical(f"WAL 기록 스레드 중단 - 이후 변경은 저장되지 않음: {str(e)}")
+            with self._cond:
+                self._error = e
+                self._cond.notify_all()
+    
+    def _write_batches(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closing:
+                    self._cond.wait()
+                if not self._pending and self._closing:
+                    return
+                batch, self._pending = self._pending, []
+                batch_lsn = self.last_lsn
+            
+            chunk = []
+            for item in batch:
+                if isinstance(item, tuple):
+                    # 세그먼트 교체 표시
+                    self._file.write(b''.join(chunk))
+                    chunk = []
+                    self._flush()
+                    self._file.close()
+                    self._file = open(self._segment_path(item[1]), 'ab')
+                else:
+                    chunk.append(item)
+            self._file.write(b''.join(chunk))
+            self._flush()
+            
+            with self._cond:
+                self.durable_lsn = batch_lsn
+                self._cond.notify_all()
+    
+    def _flush(self):
+        self._file.flush()
+        if self.sync_mode != 'off':
+            os.fsync(self._file.fileno())
+    
+    def remove_segments_through(self, lsn):
+        """lsn 이하 레코드만 담은 세그먼트 삭제 (스냅샷 이후 정리)"""
+        segments = self.segments()
+        for (first_lsn, path), (next_first_lsn, _) in zip(segments, segments[1:]):
+            if next_first_lsn - 1 <= lsn:
+                os.remove(path)
+    
+    def close(self):
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        if self._writer is not None:
+            self._writer.join()
+        if self._file is not None:
+            self._file.close()
+
+class DataPersistence:
+    """WAL + 주기적 스냅샷으로 DataStore 영속화
+
+    복구: 최신 스냅샷 로드 후 스냅샷 LSN 이후의 WAL 레코드만 재적용
+    """
+    
+    SNAPSHOT_MAGIC = b'SHSNAP01'
+    SNAPSHOT_HEADER = struct.Struct('<8sQI')  # magic, lsn, crc32
+    
+    def __init__(self, directory, sync_mode='group', snapshot_interval=300, snapshot_min_records=1000):
+        self.directory = directory
+        self.snapshot_interval = snapshot_interval
+        self.snapshot_min_records = snapshot_min_records
+        os.makedirs(directory, exist_ok=True)
+        
+        self.wal = WriteAheadLog(os.path.join(directory, 'wal'), sync_mode)
+        self.snapshot_lsn = 0
+        self._snapshot_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+    
+    def _snapshots(self):
+        """(LSN, 경로) 목록 (LSN 오름차순)"""
+        snapshots = []
+        for name in os.listdir(self.directory):
+            if name.startswith('snapshot-') and name.endswith('.snap'):
+                snapshots.append((int(name[9:-5]), os.path.join(self.directory, name)))
+        return sorted(snapshots)
+    
+    def _load_snapshot(self, path):
+        with open(path, 'rb') as f:
+            data = f.read()
+        magic, lsn, crc = self.SNAPSHOT_HEADER.unpack_from(data)
+        payload = memoryview(data)[self.SNAPSHOT_HEADER.size:]
+        if magic != self.SNAPSHOT_MAGIC or zlib.crc32(payload) != crc:
+            raise ValueError('스냅샷 손상')
+        return lsn, pickle.loads(payload)
+    
+    def recover(self, store):
+        """스냅샷 + WAL 재적용으로 상태 복구 (저장된 데이터가 없으면 False)"""
+        started = time.monotonic()
+        recovered = False
+        
+        # 최신 스냅샷부터 시도 (손상 시 이전 스냅샷 사용)
+        for lsn, path in reversed(self._snapshots()):
+            try:
+                self.snapshot_lsn, state = self._load_snapshot(path)
+            except Exception as e:
+                logger.error(f"스냅샷 로드 실패 - {path}: {str(e)}")
+                continue
+            store.load_state(state)
+            recovered = True
+            break
+        
+        replayed = 0
+        for lsn, op, args in self.wal.read_records(after_lsn=self.snapshot_lsn):
+            store.replay(op, args)
+            replayed += 1
+        self.wal.last_lsn = max(self.wal.last_lsn, self.snapshot_lsn)
+        self.wal.durable_lsn = self.wal.last_lsn
+        
+        if recovered or replayed:
+            logger.info(f"복구 완료 - 스냅샷 LSN: {self.snapshot_lsn}, WAL 재적용: {replayed}건, "
+                        f"소요: {time.monotonic() - started:.3f}초")
+        
+        # 이후 변경은 새 세그먼트에 기록
+        self.wal.open()
+        return recovered or replayed > 0
+    
+    def snapshot(self, store):
+        """현재 상태 스냅샷 저장 후 반영된 WAL 세그먼트 정리"""
+        with self._snapshot_lock:
+            # 상태 직렬화와 세그먼트 교체를 같은 잠금 구간에서 수행해 경계를 일치
+            with data_lock:
+                payload = pickle.dumps(store.export_state(), protocol=pickle.HIGHEST_PROTOCOL)
+                lsn = self.wal.rotate()
+            
+            # 스냅샷에 포함된 레코드가 디스크에 기록된 뒤 교체
+            self.wal.wait_durable(lsn)
+            
+            path = os.path.join(self.directory, f'snapshot-{lsn:020d}.snap')
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(self.SNAPSHOT_HEADER.pack(self.SNAPSHOT_MAGIC, lsn, zlib.crc32(payload)))
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+            
+            for old_lsn, old_path in self._snapshots():
+                if old_lsn < lsn:
+                    os.remove(old_path)
+            self.wal.remove_segments_through(lsn)
+            
+            self.snapshot_lsn = lsn
+            logger.info(f"스냅샷 저장 - LSN: {lsn}, 크기: {len(payload):,}바이트")
+            return lsn
+    
+    def start(self, store):
+        """주기적 스냅샷 스레드 시작"""
+        self._thread = threading.Thread(
+            target=self._snapshot_loop, args=(store,), name='snapshot', daemon=True
+        )
+        self._thread.start()
+    
+    def _snapshot_loop(self, store):
+        while not self._stop.wait(self.snapshot_interval):
+            if self.wal.last_lsn - self.snapshot_lsn < self.snapshot_min_records:
+                continue
+            try:
+                self.snapshot(store)
+            except Exception as e:
+                logger.error(f"스냅샷 저장 오류: {str(e)}")
+    
+    def close(self):
+        self._stop.set()
+        self.wal.close()
+
 # ========================= 인메모리 데이터 구조 =========================
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_NO_TIME = -(1 << 63)  # completed_at 없음
+
+def _to_epoch_us(value):
+    """datetime -> UTC epoch 마이크로초 (naive는 UTC로 간주)"""
+    if value is None:
+        return _NO_TIME
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - _EPOCH) // timedelta(microseconds=1)
+
+def _from_epoch_us(value):
+    if value == _NO_TIME:
+        return None
+    return _EPOCH + timedelta(microseconds=value)
+
+def _new_id_column():
+    """사용자별 거래 ID 인덱스 (오름차순 uint32 배열)"""
+    return array.array('I')
+
+class TransactionView(Mapping):
+    """TransactionStore 한 행의 읽기 전용 dict형 뷰 (상태 변경이 바로 보임)"""
+    
+    __slots__ = ('_store', '_row')
+    
+    def __init__(self, store, row):
+        self._store = store
+        self._row = row
+    
+    def __getitem__(self, key):
+        return self._store._read(self._row, key)
+    
+    def __iter__(self):
+        return iter(TransactionStore.FIELDS)
+    
+    def __len__(self):
+        return len(TransactionStore.FIELDS)
+    
+    def __repr__(self):
+        return f"TransactionView({dict(self)!r})"
+
+class TransactionStore:
+    """거래를 컬럼(array) 단위로 저장하는 압축 저장소
+
+    - 정수 필드는 array 컬럼, 시각은 epoch 마이크로초 정수로 보관
+    - 설명/상태/거래 유형은 문자열 테이블에 한 번만 저장하고 번호로 참조
+    - 거래 ID는 순차 부여되므로 행 번호 = ID - 1 (ID 인덱스 불필요)
+    - 조회 결과는 TransactionView (dict처럼 transaction['amount'] 형태로 사용)
+    dict 행(키 12개, datetime 2개, 약 630바이트) 대비 거래당 약 55바이트입니다.
+    """
+    
+    FIELDS = (
+        'id', 'sender_id', 'recipient_id', 'sender_account_id', 'recipient_account_id',
+        'amount', 'fee', 'status', 'transaction_type', 'description', 'created_at', 'completed_at',
+    )
+    _INT_COLUMNS = {
+        'sender_id': 'I', 'recipient_id': 'I', 'sender_account_id': 'I', 'recipient_account_id': 'I',
+        'amount': 'q', 'fee': 'q',
+    }
+    _INTERNED_COLUMNS = {'status': 'B', 'transaction_type': 'B', 'description': 'I'}
+    _TIME_COLUMNS = ('created_at', 'completed_at')
+    
+    def __init__(self, transactions=()):
+        self._columns = {name: array.array(code) for name, code in self._INT_COLUMNS.items()}
+        for name, code in self._INTERNED_COLUMNS.items():
+            self._columns[name] = array.array(code)
+        for name in self._TIME_COLUMNS:
+            self._columns[name] = array.array('q')
+        self._strings = {name: [] for name in self._INTERNED_COLUMNS}  # 번호 -> 문자열
+        self._codes = {name: {} for name in self._INTERNED_COLUMNS}  # 문자열 -> 번호
+        
+        for transaction in transactions:
+            self.append(transaction)
+    
+    def _intern(self, name, value):
+        codes = self._codes[name]
+        code = codes.get(value)
+        if code is None:
+            code = len(self._strings[name])
+            self._strings[name].append(value)
+            codes[value] = code
+        return code
+    
+    def _row_of(self, transaction_id):
+        # bool은 int의 하위 타입이므로 True가 거래 1로 해석되지 않도록 정확히 int만 허용
+        row = transaction_id - 1 if type(transaction_id) is int else -1
+        if 0 <= row < len(self):
+            return row
+        return None
+    
+    def _read(self, row, key):
+        if key == 'id':
+            return row + 1
+        if key in self._INT_COLUMNS:
+            return self._columns[key][row]
+        if key in self._INTERNED_COLUMNS:
+            return self._strings[key][self._columns[key][row]]
+        if key in self._TIME_COLUMNS:
+            return _from_epoch_us(self._columns[key][row])
+        raise KeyError(key)
+    
+    def append(self, transaction):
+        """거래 추가 (ID는 순차여야 함)
+
+        값 변환/범위 오류(정수가 아닌 금액, 음수 ID 등)가 나면 이미 추가한 컬럼을
+        되돌리고 예외를 다시 내므로, 컬럼 길이가 어긋나 다른 행을 읽는 일이 없습니다.
+        """
+        if transaction['id'] != len(self) + 1:
+            raise ValueError(f"거래 ID가 순차적이지 않습니다: {transaction['id']} (다음 ID: {len(self) + 1})")
+        
+        columns = self._columns
+        values = [(columns[name], transaction[name]) for name in self._INT_COLUMNS]
+        values.extend((columns[name], _to_epoch_us(transaction[name])) for name in self._TIME_COLUMNS)
+        
+        appended = []
+        try:
+            for column, value in values:
+                column.append(value)
+                appended.append(column)
+            # 문자열 번호는 다른 컬럼이 모두 들어간 뒤 부여 (실패한 거래의 문자열은 테이블에 남기지 않음)
+            for name in self._INTERNED_COLUMNS:
+                columns[name].append(self._intern(name, transaction[name]))
+                appended.append(columns[name])
+        except Exception:
+            for column in appended:
+                column.pop()
+            raise
+    
+    def set_status(self, transaction_id, status, completed_at=None):
+        """거래 상태 변경 (completed_at이 있으면 함께 기록)"""
+        row = self._row_of(transaction_id)
+        if row is None:
+            raise KeyError(transaction_id)
+        self._columns['status'][row] = self._intern('status', status)
+        if completed_at is not None:
+            self._columns['completed_at'][row] = _to_epoch_us(completed_at)
+    
+    def created_at_us(self, transaction_id):
+        """생성 시각 (epoch 마이크로초) - 시각 범위 이진 탐색용 키"""
+        return self._columns['created_at'][transaction_id - 1]
+    
+    def iter_parties(self):
+        """(거래 ID, 송금자 ID, 수취인 ID)를 ID 순으로 반환 (인덱스 재구성용)"""
+        columns = self._columns
+        return zip(range(1, len(self) + 1), columns['sender_id'], columns['recipient_id'])
+    
+    def get(self, transaction_id, default=None):
+        row = self._row_of(transaction_id)
+        if row is None:
+            return default
+        return TransactionView(self, row)
+    
+    def __getitem__(self, transaction_id):
+        row = self._row_of(transaction_id)
+        if row is None:
+            raise KeyError(transaction_id)
+        return TransactionView(self, row)
+    
+    def __contains__(self, transaction_id):
+        return self._row_of(transaction_id) is not None
+    
+    def __len__(self):
+        return len(self._columns['amount'])
+    
+    def __iter__(self):
+        return iter(range(1, len(self) + 1))
+    
+    def keys(self):
+        return iter(self)
+    
+    def values(self):
+        return (TransactionView(self, row) for row in range(len(self)))
+    
+    def items(self):
+        return ((row + 1, TransactionView(self, row)) for row in range(len(self)))
+    
+    def memory_usage(self):
+        """컬럼과 문자열 테이블이 차지하는 대략적인 바이트 수"""
+        column_bytes = sum(column.itemsize * len(column) for column in self._columns.values())
+        string_bytes = sum(
+            len(value.encode('utf-8')) + 49 for strings in self._strings.values() for value in strings
+            if isinstance(value, str)
+        )
+        return column_bytes + string_bytes
+
+class VoiceProfileIndex:
+    """활성 음성 프로필을 L2 정규화된 float32 행렬 하나로 보관하는 벡터 저장소
+
+    - 일괄 유사도 계산과 top-k 화자 검색(중복 등록/계정 탈취 탐지)에 사용
+    - 삽입/삭제는 O(dim) (삭제는 마지막 행을 빈 자리로 옮겨 행렬을 촘촘하게 유지)
+    - mode='ivf'이면 k-means 분할(IVF)로 nprobe개 분할만 탐색하는 근사 검색 사용
+    """
+    
+    def __init__(self, initial_capacity=64, mode='exact', n_lists=64, nprobe=8):
+        self.initial_capacity = initial_capacity
+        self.mode = mode
+        self.n_lists = n_lists
+        self.nprobe = nprobe
+        
+        self._matrix = None  # (capacity, dim) float32
+        self._size = 0
+        self.row_user_ids = []  # row -> user_id
+        self.user_rows = {}  # user_id -> row
+        self._lock = threading.RLock()
+        
+        # IVF 분할 상태
+        self._centroids = None  # (n_lists, dim) float32
+        self._row_lists = []  # row -> 분할 번호
+        self._lists = []  # 분할 번호 -> {row, ...}
+        self._trained_size = 0
+    
+    @staticmethod
+    def normalize(vectors):
+        """행 단위 L2 정규화 (float32)"""
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+    
+    def upsert(self, user_id, features):
+        """프로필 추가/갱신"""
+        vector = self.normalize(features)[0]
+        with self._lock:
+            if self._matrix is None:
+                self._matrix = np.zeros((self.initial_capacity, vector.shape[0]), dtype=np.float32)
+            
+            row = self.user_rows.get(user_id)
+            if row is None:
+                if self._size == self._matrix.shape[0]:
+                    # 용량 2배 확장 (기존 뷰는 이전 배열을 계속 참조)
+                    grown = np.zeros((self._size * 2, self._matrix.shape[1]), dtype=np.float32)
+                    grown[:self._size] = self._matrix[:self._size]
+                    self._matrix = grown
+                row = self._size
+                self._size += 1
+                self.row_user_ids.append(user_id)
+                self.user_rows[user_id] = row
+                if self._centroids is not None:
+                    self._row_lists.append(-1)
+            elif self._centroids is not None:
+                self._lists[self._row_lists[row]].discard(row)
+            
+            self._matrix[row] = vector
+            if self._centroids is not None:
+                self._assign(row)
+    
+    def remove(self, user_id):
+        """프로필 삭제 (마지막 행을 삭제된 자리로 이동)"""
+        with self._lock:
+            row = self.user_rows.pop(user_id, None)
+            if row is None:
+                return False
+            
+            last = self._size - 1
+            if self._centroids is not None:
+                self._lists[self._row_lists[row]].discard(row)
+            
+            if row != last:
+                moved_user_id = self.row_user_ids[last]
+                self._matrix[row] = self._matrix[last]
+                self.row_user_ids[row] = moved_user_id
+                self.user_rows[moved_user_id] = row
+                if self._centroids is not None:
+                    moved_list = self._row_lists[last]
+                    self._lists[moved_list].discard(last)
+                    self._lists[moved_list].add(row)
+                    self._row_lists[row] = moved_list
+            
+            self.row_user_ids.pop()
+            if self._centroids is not None:
+                self._row_lists.pop()
+            self._size -= 1
+            return True
+    
+    def get_vector(self, user_id):
+        """사용자의 정규화된 프로필 벡터 (복사본 - 이후 upsert/remove의 행 이동과 무관)"""
+        with self._lock:
+            row = self.user_rows.get(user_id)
+            if row is None:
+                return None
+            return self._matrix[row].copy()
+    
+    def get_matrix(self, user_ids=None):
+        """(user_ids, 프로필 행렬 복사본) 반환 - user_ids 지정 시 해당 사용자만"""
+        with self._lock:
+            if self._matrix is None:
+                return [], np.zeros((0, 0), dtype=np.float32)
+            if user_ids is None:
+                return list(self.row_user_ids), self._matrix[:self._size].copy()
+            
+            found_ids = [uid for uid in user_ids if uid in self.user_rows]
+            rows = [self.user_rows[uid] for uid in found_ids]
+            return found_ids, self._matrix[rows]
+    
+    def _assign(self, row):
+        """행을 가장 가까운 분할에 배정"""
+        list_no = int(np.argmax(self._centroids @ self._matrix[row]))
+        self._row_lists[row] = list_no
+        self._lists[list_no].add(row)
+    
+    def train(self, n_iter=10, seed=0):
+        """구면 k-means로 IVF 분할 학습"""
+        with self._lock:
+            data = self._matrix[:self._size]
+            n_lists = min(self.n_lists, self._size)
+            if n_lists == 0:
+                return
+            
+            rng = np.random.default_rng(seed)
+            centroids = data[rng.choice(self._size, n_lists, replace=False)].copy()
+            for _ in range(n_iter):
+                assignments = np.argmax(data @ centroids.T, axis=1)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, assignments, data)
+                # 빈 분할은 이전 중심 유지
+                empty = ~np.any(sums, axis=1)
+                sums[empty] = centroids[empty]
+                centroids = self.normalize(sums)
+            
+            assignments = np.argmax(data @ centroids.T, axis=1)
+            self._centroids = centroids
+            self._row_lists = assignments.tolist()
+            self._lists = [set() for _ in range(n_lists)]
+            for row, list_no in enumerate(self._row_lists):
+                self._lists[list_no].add(row)
+            self._trained_size = self._size
+            logger.info(f"음성 프로필 IVF 분할 학습 - 프로필: {self._size}, 분할: {n_lists}")
+    
+    def _maybe_train(self):
+        """분할당 평균 40개 이상 쌓이면 학습, 이후 크기가 2배가 될 때마다 재학습"""
+        if self._size < self.n_lists * 40:
+            return
+        if self._centroids is None or self._size >= self._trained_size * 2:
+            self.train()
+    
+    def search(self, features, k=5, exclude_user_ids=None):
+        """top-k 유사 화자 검색 - [(user_id, similarity), ...] 유사도 내림차순"""
+        query = self.normalize(features)[0]
+        exclude_user_ids = set(exclude_user_ids or ())
+        
+        with self._lock:
+            if self._size == 0:
+                return []
+            
+            if self.mode == 'ivf':
+                self._maybe_train()
+            
+            if self.mode == 'ivf' and self._centroids is not None:
+                probe = np.argsort(-(self._centroids @ query))[:self.nprobe]
+                rows = np.fromiter(
+                    (row for list_no in probe for row in self._lists[list_no]),
+                    dtype=np.int64
+                )
+            else:
+                rows = np.arange(self._size)
+            
+            if rows.size == 0:
+                return []
+            
+            scores = self._matrix[rows] @ query
+            # 제외 대상만큼 여유를 두고 부분 정렬
+            n = min(k + len(exclude_user_ids), rows.size)
+            top = np.argpartition(-scores, n - 1)[:n]
+            top = top[np.argsort(-scores[top])]
+            
+            results = []
+            for i in top:
+                user_id = self.row_user_ids[rows[i]]
+                if user_id in exclude_user_ids:
+                    continue
+                results.append((user_id, float(scores[i])))
+                if len(results) == k:
+                    break
+            return results
+    
+    @property
+    def dim(self):
+        """프로필 벡터 차원 (프로필이 아직 없으면 None)"""
+        matrix = self._matrix
+        return matrix.shape[1] if matrix is not None else None
+    
+    def __len__(self):
+        return self._size
+
+class TransferError(Exception):
+    """이체 처리 실패 (잔액 부족, 계좌 없음, 처리 불가 상태 등)"""
+    
+    def __init__(self, code, message, balance=None):
+        super().__init__(message)
+        self.code = code  # 'insufficient_funds', 'account_not_found', 'invalid_transfer', 'not_pending', 'not_found', 'expired'
+        self.message = message
+        self.balance = balance  # 잔액 부족 시 출금 계좌의 이용 가능 잔액
+
 class DataStore:
-    def __init__(self):
+    # 스냅샷에 저장하는 필드 (음성 프로필 행렬은 복원 시 재구성)
+    SNAPSHOT_FIELDS = (
+        'users', 'accounts', 'transactions', 'voice_profiles',
+        'next_user_id', 'next_account_id', 'next_transaction_id',
+        'username_index', 'account_number_index', 'user_accounts', 'payees',
+        'transfer_holds',
+    )
+    
+    def __init__(self, persistence=None):
+        self.persistence = persistence  # None이면 순수 인메모리
+        self._replaying = False
+        self._write_listeners = []  # 변경 적용 직후 호출 (op, args)
+        self._user_change_listeners = []  # 사용자 데이터 버전 증가 시 호출 (user_id)
+        
         self.users = {}  # user_id -> user_data
         self.accounts = {}  # account_id -> account_data
-        self.transactions = {}  # transaction_id -> transaction_data
+        self.transactions = TransactionStore()  # transaction_id -> 거래 행 뷰 (컬럼 저장)
         self.voice_profiles = {}  # user_id -> voice_profile_data
+        self.voice_profile_index = VoiceProfileIndex(  # 활성 프로필 정규화 행렬 (일괄 비교/top-k 검색)
+            mode=app.config['VOICE_INDEX_MODE'],
+            n_lists=app.config['VOICE_INDEX_IVF_LISTS'],
+            nprobe=app.config['VOICE_INDEX_IVF_NPROBE']
+        )
         
         # ID 카운터
         self.next_user_id = 1
         self.next_account_id = 1
         self.next_transaction_id = 1
         
+        # 사용자명 인덱스 (활성 사용자만)
+        self.username_index = {}  # username -> user_id
+        
+        # 계좌번호 인덱스
+        self.account_number_index = {}  # account_number -> account_id
+        
         # 사용자별 계좌 인덱스
         self.user_accounts = defaultdict(list)  # user_id -> [account_id, ...]
         
-        self._init_test_data()
+        # 사용자별 저장된 수취인 (별칭 -> 계좌)
+        self.payees = defaultdict(dict)  # user_id -> {alias: account_id}
+        
+        # 수취인 이름 검색 색인 (활성 사용자명, 사용자별 저장 수취인 별칭 - 스냅샷 복원 시 재구성)
+        self.recipient_index = RecipientIndex()  # username -> {user_id, ...}
+        self.payee_indexes = defaultdict(RecipientIndex)  # user_id -> alias -> {account_id}
+        
+        # 사용자별 거래 인덱스 (ID = 생성 시각 오름차순, 스냅샷 복원 시 재구성)
+        # ID와 생성 시각이 같은 잠금 구간에서 부여되므로 두 순서가 일치해
+        # before_id/기간 조건을 이진 탐색으로 찾을 수 있음
+        self.user_transactions = defaultdict(_new_id_column)  # user_id -> [transaction_id, ...]
+        self.user_outgoing_transactions = defaultdict(_new_id_column)  # 보낸 거래
+        self.user_incoming_transactions = defaultdict(_new_id_column)  # 받은 거래
+        
+        # 확인 대기 중인 이체의 출금 보류 (이용 가능 잔액 = 잔액 - 보류 합계)
+        self.transfer_holds = {}  # transaction_id -> {'account_id', 'amount', 'expires_at'}
+        self.held_amounts = defaultdict(int)  # account_id -> 보류 합계 (스냅샷 복원 시 재구성)
+        
+        # 계좌별 잠금 (잔액 확인~변경 구간 보호, 이체는 두 계좌만 잠금)
+        self.account_locks = {}  # account_id -> threading.Lock
+        
+        # 사용자별 데이터 버전 (계좌/잔액/거래 변경 시 증가, ETag 생성용)
+        # 재시작 후 같은 번호가 다른 내용을 가리키지 않도록 프로세스별 epoch와 함께 사용
+        self.user_versions = defaultdict(int)  # user_id -> version
+        self.version_epoch = uuid.uuid4().hex[:8]
+        
+        # 스냅샷 + WAL에서 복구하고, 저장된 데이터가 없으면 테스트 데이터 생성
+        if persistence is not None and persistence.recover(self):
+            logger.info(f"저장된 데이터 복구 - 사용자: {len(self.users)}, 계좌: {len(self.accounts)}, 거래: {len(self.transactions)}")
+        else:
+            self._init_test_data()
+        
+        if persistence is not None:
+            persistence.start(self)
     
     def _init_test_data(self):
         """테스트용 초기 데이터 생성"""
@@ -227,11 +1066,13 @@ class DataStore:
             }
         ]
         
+        # 사용자별 거래 인덱스가 시간순을 유지하도록 오래된 거래부터 생성
+        transactions_data.sort(key=lambda x: x['days_ago'], reverse=True)
+        
         for tx_data in transactions_data:
-            created_at = datetime.utcnow() - timedelta(days=tx_data['days_ago'])
+            created_at = utc_now() - timedelta(days=tx_data['days_ago'])
             
             tx_id = self.next_transaction_id
-            self.next_transaction_id += 1
             
             transaction = {
                 'id': tx_id,
@@ -248,13 +1089,223 @@ class DataStore:
                 'completed_at': created_at + timedelta(seconds=30)
             }
             
-            self.transactions[tx_id] = transaction
+            with data_lock:
+                self._apply_create_transaction(transaction)
+                lsn = self._log('create_transaction', transaction)
+            self._sync(lsn)
+    
+    # ---------- 변경 기록 (WAL) ----------
+    
+    def add_user_change_listener(self, listener):
+        """사용자 데이터(계좌/잔액/거래) 변경 리스너 등록 - data_lock 안에서 listener(user_id) 호출"""
+        self._user_change_listeners.append(listener)
+    
+    def add_write_listener(self, listener):
+        """변경 리스너 등록 - listener(op, args)는 data_lock 안에서 호출되므로 짧게 유지"""
+        self._write_listeners.append(listener)
+    
+    def _log(self, op, *args):
+        """변경 내용을 WAL에 추가 (data_lock 안에서 호출해 적용 순서와 기록 순서를 일치)"""
+        if self._replaying:
+            return 0
+        
+        for listener in self._write_listeners:
+            try:
+                listener(op, args)
+            except Exception as e:
+                logger.error(f"변경 리스너 오류 ({op}): {str(e)}")
+        
+        if self.persistence is None:
+            return 0
+        return self.persistence.wal.append(op, args)
+    
+    def _sync(self, lsn):
+        """WAL 레코드가 디스크에 기록될 때까지 대기 (data_lock 밖에서 호출)"""
+        if lsn and self.persistence is not None:
+            self.persistence.wal.wait_durable(lsn)
+    
+    def replay(self, op, args):
+        """WAL 레코드 재적용 (복구용)"""
+        self._replaying = True
+        try:
+            getattr(self, f'_apply_{op}')(*args)
+        finally:
+            self._replaying = False
+    
+    def export_state(self):
+        """스냅샷용 상태 (data_lock 안에서 호출)"""
+        return {field: getattr(self, field) for field in self.SNAPSHOT_FIELDS}
+    
+    def load_state(self, state):
+        """스냅샷 상태 복원 후 파생 인덱스 재구성"""
+        for field in self.SNAPSHOT_FIELDS:
+            if field in state:  # 이전 형식 스냅샷에 없는 필드는 기본값 유지
+                setattr(self, field, state[field])
+        
+        self.recipient_index = RecipientIndex()
+        for user_id, user_data in self.users.items():
+            if user_data['is_active']:
+                self.recipient_index.add(user_data['username'], user_id)
+        
+        self.payee_indexes = defaultdict(RecipientIndex)
+        for user_id, user_payees in self.payees.items():
+            for alias, account_id in user_payees.items():
+                self.payee_indexes[user_id].add(alias, account_id)
+        
+        # 이전 형식(dict) 스냅샷은 컬럼 저장소로 변환
+        if isinstance(self.transactions, dict):
+            self.transactions = TransactionStore(
+                self.transactions[transaction_id] for transaction_id in sorted(self.transactions)
+            )
+        
+        self.user_transactions = defaultdict(_new_id_column)
+        self.user_outgoing_transactions = defaultdict(_new_id_column)
+        self.user_incoming_transactions = defaultdict(_new_id_column)
+        for transaction_id, sender_id, recipient_id in self.transactions.iter_parties():
+            self._index_transaction_ids(transaction_id, sender_id, recipient_id)
+        
+        for user_id, voice_profile in self.voice_profiles.items():
+            if voice_profile['is_active'] and self.users.get(user_id, {}).get('is_active'):
+                self.voice_profile_index.upsert(user_id, voice_profile['voice_features'])
+        
+        self.account_locks = {account_id: threading.Lock() for account_id in self.accounts}
+        
+        self.held_amounts = defaultdict(int)
+        for hold in self.transfer_holds.values():
+            self.held_amounts[hold['account_id']] += hold['amount']
+    
+    # ---------- 상태 적용 (일반 경로와 WAL 재적용 공용) ----------
+    
+    def _apply_create_user(self, user_data):
+        user_id = user_data['id']
+        self.users[user_id] = user_data
+        self.next_user_id = max(self.next_user_id, user_id + 1)
+        # 동일 사용자명이 이미 활성 상태면 먼저 생성된 사용자를 유지
+        self.username_index.setdefault(user_data['username'], user_id)
+        if user_data['is_active']:
+            self.recipient_index.add(user_data['username'], user_id)
+    
+    def _touch_users(self, *user_ids):
+        """사용자 데이터 버전 증가 (조회 응답 캐시 무효화)"""
+        for user_id in user_ids:
+            self.user_versions[user_id] += 1
+            for listener in self._user_change_listeners:
+                listener(user_id)
+    
+    def _apply_set_user_active(self, user_id, is_active):
+        user_data = self.users[user_id]
+        user_data['is_active'] = is_active
+        self._touch_users(user_id)
+        
+        if is_active:
+            self.recipient_index.add(user_data['username'], user_id)
+        else:
+            self.recipient_index.remove(user_data['username'], user_id)
+        username = user_data['username']
+        
+        # 비활성 사용자의 음성 프로필은 화자 검색 대상에서 제외
+        voice_profile = self.voice_profiles.get(user_id)
+        if is_active and voice_profile and voice_profile['is_active']:
+            self.voice_profile_index.upsert(user_id, voice_profile['voice_features'])
+        elif not is_active:
+            self.voice_profile_index.remove(user_id)
+        
+        if is_active:
+            self.username_index.setdefault(username, user_id)
+        elif self.username_index.get(username) == user_id:
+            del self.username_index[username]
+            # 같은 이름의 다른 활성 사용자가 있으면 인덱스 승계
+            for other in self.users.values():
+                if other['username'] == username and other['is_active']:
+                    self.username_index[username] = other['id']
+                    break
+    
+    def _apply_create_account(self, account_data):
+        account_id = account_data['id']
+        self.accounts[account_id] = account_data
+        self.next_account_id = max(self.next_account_id, account_id + 1)
+        self.account_number_index[account_data['account_number']] = account_id
+        self.user_accounts[account_data['user_id']].append(account_id)
+        self.account_locks.setdefault(account_id, threading.Lock())
+        self._touch_users(account_data['user_id'])
+    
+    def _apply_create_transaction(self, transaction):
+        transaction_id = transaction['id']
+        self.transactions.append(transaction)
+        self.next_transaction_id = max(self.next_transaction_id, transaction_id + 1)
+        self._index_transaction(transaction)
+        self._touch_users(transaction['sender_id'], transaction['recipient_id'])
+    
+    def _apply_update_account_balance(self, account_id, new_balance):
+        account = self.accounts[account_id]
+        account['balance'] = new_balance
+        self._touch_users(account['user_id'])
+    
+    def _apply_update_transaction_status(self, transaction_id, status, completed_at):
+        self.transactions.set_status(transaction_id, status, completed_at)
+        transaction = self.transactions[transaction_id]
+        self._touch_users(transaction['sender_id'], transaction['recipient_id'])
+    
+    def _apply_transfer(self, transaction, balances):
+        self._apply_create_transaction(transaction)
+        for account_id, new_balance in balances:
+            self._apply_update_account_balance(account_id, new_balance)
+    
+    def _apply_complete_transaction(self, transaction_id, status, completed_at, balances):
+        self._release_hold(transaction_id)
+        for account_id, new_balance in balances:
+            self._apply_update_account_balance(account_id, new_balance)
+        self._apply_update_transaction_status(transaction_id, status, completed_at)
+    
+    def _apply_prepare_transfer(self, transaction, hold):
+        self._apply_create_transaction(transaction)
+        self.transfer_holds[transaction['id']] = hold
+        self.held_amounts[hold['account_id']] += hold['amount']
+    
+    def _release_hold(self, transaction_id):
+        hold = self.transfer_holds.pop(transaction_id, None)
+        if hold is not None:
+            self.held_amounts[hold['account_id']] -= hold['amount']
+            if not self.held_amounts[hold['account_id']]:
+                del self.held_amounts[hold['account_id']]
     
-    def create_user(self, username, email, password_hash, phone_number):
+    def _apply_put_payee(self, user_id, alias, account_id):
+        previous = self.payees[user_id].get(alias)
+        if previous is not None:
+            self.payee_indexes[user_id].remove(alias, previous)
+        self.payees[user_id][alias] = account_id
+        self.payee_indexes[user_id].add(alias, account_id)
+    
+    def _apply_delete_payee(self, user_id, alias):
+        account_id = self.payees[user_id].pop(alias, None)
+        if account_id is not None:
+            self.payee_indexes[user_id].remove(alias, account_id)
+    
+    def _apply_put_voice_profile(self, user_id, voice_profile):
+        self.voice_profiles[user_id] = voice_profile
+        if voice_profile['is_active'] and self.users.get(user_id, {}).get('is_active'):
+            self.voice_profile_index.upsert(user_id, voice_profile['voice_features'])
+        else:
+            self.voice_profile_index.remove(user_id)
+    
+    # ---------- 변경 API ----------
+    
+    def _index_transaction(self, transaction):
+        """사용자별 거래 인덱스에 거래 추가"""
+        self._index_transaction_ids(transaction['id'], transaction['sender_id'], transaction['recipient_id'])
+    
+    def _index_transaction_ids(self, transaction_id, sender_id, recipient_id):
+        self.user_outgoing_transactions[sender_id].append(transaction_id)
+        self.user_incoming_transactions[recipient_id].append(transaction_id)
+        # 자기 계좌 간 이체는 전체 내역에 한 번만 인덱싱
+        self.user_transactions[sender_id].append(transaction_id)
+        if recipient_id != sender_id:
+            self.user_transactions[recipient_id].append(transaction_id)
+    
+    def create_user(self, username, email, password_hash, phone_number, is_admin=False):
         """사용자 생성"""
         with data_lock:
             user_id = self.next_user_id
-            self.next_user_id += 1
             
             user_data = {
                 'id': user_id,
@@ -263,17 +1314,30 @@ class DataStore:
                 'password_hash': password_hash,
                 'phone_number': phone_number,
                 'created_at': datetime.utcnow(),
-                'is_active': True
+                'is_active': True,
+                'is_admin': is_admin
             }
             
-            self.users[user_id] = user_data
-            return user_id
+            self._apply_create_user(user_data)
+            lsn = self._log('create_user', user_data)
+        self._sync(lsn)
+        return user_id
+    
+    def set_user_active(self, user_id, is_active):
+        """사용자 활성/비활성 전환"""
+        with data_lock:
+            if user_id not in self.users:
+                return False
+            
+            self._apply_set_user_active(user_id, is_active)
+            lsn = self._log('set_user_active', user_id, is_active)
+        self._sync(lsn)
+        return True
     
     def create_account(self, user_id, account_number, account_type, initial_balance=0):
         """계좌 생성"""
         with data_lock:
             account_id = self.next_account_id
-            self.next_account_id += 1
             
             account_data = {
                 'id': account_id,
@@ -285,16 +1349,16 @@ class DataStore:
                 'is_active': True
             }
             
-            self.accounts[account_id] = account_data
-            self.user_accounts[user_id].append(account_id)
-            return account_id
+            self._apply_create_account(account_data)
+            lsn = self._log('create_account', account_data)
+        self._sync(lsn)
+        return account_id
     
     def create_transaction(self, sender_id, recipient_id, sender_account_id, 
                           recipient_account_id, amount, fee=0, description=None):
         """거래 생성"""
         with data_lock:
             transaction_id = self.next_transaction_id
-            self.next_transaction_id += 1
             
             transaction_data = {
                 'id': transaction_id,
@@ -311,14 +1375,20 @@ class DataStore:
                 'completed_at': None
             }
             
-            self.transactions[transaction_id] = transaction_data
-            return transaction_id
+            self._apply_create_transaction(transaction_data)
+            lsn = self._log('create_transaction', transaction_data)
+        self._sync(lsn)
+        return transaction_id
     
     def get_user_by_username(self, username):
         """사용자명으로 사용자 검색"""
-        for user_data in self.users.values():
-            if user_data['username'] == username and user_data['is_active']:
-                return user_data
+        user_id = self.username_index.get(username)
+        if user_id is None:
+            return None
+        
+        user_data = self.users.get(user_id)
+        if user_data and user_data['is_active']:
+            return user_data
         return None
     
     def get_user_accounts(self, user_id):
@@ -331,84 +1401,465 @@ class DataStore:
                 accounts.append(account)
         return accounts
     
-    def get_user_transactions(self, user_id, limit=None):
-        """사용자 거래 내역 조회"""
-        transactions = []
-        for tx in self.transactions.values():
-            if tx['sender_id'] == user_id or tx['recipient_id'] == user_id:
-                transactions.append(tx)
+    def get_account_by_number(self, account_number):
+        """계좌번호로 활성 계좌 조회"""
+        account_id = self.account_number_index.get(account_number)
+        if account_id is None:
+            return None
         
-        # 최신 순으로 정렬
-        transactions.sort(key=lambda x: x['created_at'], reverse=True)
+        account = self.accounts.get(account_id)
+        if account and account['is_active']:
+            return account
+        return None
+    
+    def get_user_version(self, user_id):
+        """사용자 데이터 버전 (계좌/잔액/거래 변경 시 증가)"""
+        return self.user_versions.get(user_id, 0)
+    
+    def get_user_transactions(self, user_id, limit=None):
+        """사용자 거래 내역 조회 (최신 순)"""
+        transaction_ids = self.user_transactions.get(user_id, [])
         
+        # 인덱스가 시간순이므로 뒤에서부터 limit개만 읽음
         if limit:
-            transactions = transactions[:limit]
+            transaction_ids = transaction_ids[-limit:]
+        
+        return [self.transactions[tx_id] for tx_id in reversed(transaction_ids)]
+    
+    def get_user_transactions_page(self, user_id, limit=None, before_id=None,
+                                   start_time=None, end_time=None, direction=None):
+        """사용자 거래 내역 페이지 조회 (최신 순) - (거래 목록, 다음 커서) 반환
+
+        before_id보다 작은 ID 중 [start_time, end_time) 구간의 거래를 최대 limit개
+        반환합니다. 구간 경계는 인덱스 이진 탐색으로 찾으므로 전체 내역 크기와
+        무관하게 O(log n + limit)입니다. 다음 페이지가 없으면 커서는 None.
+        limit이 None이면 구간 전체, 0 이하이면 ValueError.
+        """
+        if limit is not None and limit <= 0:
+            raise ValueError(f"limit은 1 이상이어야 합니다: {limit}")
+        
+        if direction == 'outgoing':
+            index = self.user_outgoing_transactions
+        elif direction == 'incoming':
+            index = self.user_incoming_transactions
+        else:
+            index = self.user_transactions
+        transaction_ids = index.get(user_id, ())
+        created_at_us = self.transactions.created_at_us
         
-        return transactions
+        high = len(transaction_ids)
+        if before_id is not None:
+            high = bisect.bisect_left(transaction_ids, before_id)
+        if end_time is not None:
+            high = bisect.bisect_left(transaction_ids, _to_epoch_us(end_time), 0, high, key=created_at_us)
+        
+        low = 0
+        if start_time is not None:
+            low = bisect.bisect_left(transaction_ids, _to_epoch_us(start_time), 0, high, key=created_at_us)
+        
+        start = max(low, high - limit) if limit is not None else low
+        page = [self.transactions[tx_id] for tx_id in reversed(transaction_ids[start:high])]
+        
+        next_cursor = transaction_ids[start] if start > low else None
+        return page, next_cursor
     
     def update_account_balance(self, account_id, new_balance):
         """계좌 잔액 업데이트"""
-        with data_lock:
-            if account_id in self.accounts:
-                self.accounts[account_id]['balance'] = new_balance
-                return True
+        account_lock = self.account_locks.get(account_id)
+        if account_lock is None:
             return False
+        
+        with account_lock, data_lock:
+            self._apply_update_account_balance(account_id, new_balance)
+            lsn = self._log('update_account_balance', account_id, new_balance)
+        self._sync(lsn)
+        return True
     
-    def update_transaction_status(self, transaction_id, status):
-        """거래 상태 업데이트"""
-        with data_lock:
-            if transaction_id in self.transactions:
-                self.transactions[transaction_id]['status'] = status
-                if status == 'completed':
-                    self.transactions[transaction_id]['completed_at'] = utc_now()
-                return True
-            return False
+    def _lock_accounts(self, *account_ids):
+        """계좌 잠금을 ID 순서로 획득 (교착 상태 방지) - 잠금 목록 반환"""
+        locks = []
+        for account_id in sorted(set(account_ids)):
+            account_lock = self.account_locks.get(account_id)
+            if account_lock is None:
+                for acquired in reversed(locks):
+                    acquired.release()
+                raise TransferError('account_not_found', '계좌를 찾을 수 없습니다.')
+            account_lock.acquire()
+            locks.append(account_lock)
+        return locks
     
-    def create_voice_profile(self, user_id, voice_features):
-        """음성 프로필 생성/업데이트"""
-        with data_lock:
-            self.voice_profiles[user_id] = {
-                'user_id': user_id,
-                'voice_features': voice_features,
-                'created_at': utc_now(),
-                'updated_at': utc_now(),
-                'is_active': True
-            }
+    @staticmethod
+    def _unlock_accounts(locks):
+        for account_lock in reversed(locks):
+            account_lock.release()
     
-    def get_voice_profile(self, user_id):
-        """음성 프로필 조회"""
-        return self.voice_profiles.get(user_id)
-
-# 데이터 저장소 인스턴스
-data_store = DataStore()
-
-# ========================= AI 서비스 클래스 =========================
+    def get_available_balance(self, account_id):
+        """이용 가능 잔액 (확인 대기 중인 이체의 보류 금액 제외)"""
+        return self.accounts[account_id]['balance'] - self.held_amounts.get(account_id, 0)
+    
+    @staticmethod
+    def _check_transfer_amount(amount, fee):
+        """이체 금액/수수료 확인 (양의 정수 금액, 0 이상 정수 수수료)"""
+        if type(amount) is not int or amount <= 0 or type(fee) is not int or fee < 0:
+            raise TransferError('invalid_transfer', '이체 금액이 올바르지 않습니다.')
+    
+    def _check_transfer_accounts(self, sender_account_id, recipient_account_id, total_amount, released=0):
+        """출금/입금 계좌 상태와 이용 가능 잔액 확인 (계좌 잠금 안에서 호출)
 
-class VoiceAuthenticator:
-    def __init__(self):
-        self.threshold = 0.85  # 음성 인증 임계치
-        self.n_mfcc = 13
+        released: 이번 처리로 풀리는 자기 보류 금액 (준비된 이체 확정 시)
+        """
+        if sender_account_id == recipient_account_id:
+            raise TransferError('invalid_transfer', '같은 계좌로는 이체할 수 없습니다.')
         
-    def extract_voice_features(self, audio_file_path):
-        """음성 파일에서 MFCC 특성 추출"""
+        sender_account = self.accounts[sender_account_id]
+        recipient_account = self.accounts[recipient_account_id]
+        if not sender_account['is_active'] or not recipient_account['is_active']:
+            raise TransferError('account_not_found', '계좌를 찾을 수 없습니다.')
+        
+        available = self.get_available_balance(sender_account_id) + released
+        if available < total_amount:
+            raise TransferError('insufficient_funds', '계좌 잔액이 부족합니다.', balance=available)
+        return sender_account, recipient_account
+    
+    def transfer(self, sender_id, recipient_id, sender_account_id, recipient_account_id,
+                 amount, fee=0, description=None, transaction_type='transfer'):
+        """이체 실행 - 출금, 입금, 거래 완료를 한 번에 적용 (실패 시 TransferError)
+
+        두 계좌의 잠금만 ID 순서로 잡으므로 서로 다른 계좌 간 이체는 병렬로
+        진행됩니다. 거래 ID 부여, 인덱스 반영, WAL 기록은 짧은 data_lock 구간에서
+        함께 수행해 기록 순서와 거래 내역 순서를 일치시키고, fsync 대기는
+        모든 잠금을 놓은 뒤에 합니다.
+        """
+        self._check_transfer_amount(amount, fee)
+        total_amount = amount + fee
+        locks = self._lock_accounts(sender_account_id, recipient_account_id)
         try:
-            y, sr = librosa.load(audio_file_path, sr=22050, duration=5.0)
-            
-            # MFCC 특성 추출
-            mfcc = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=self.n_mfcc)
-            
-            # 통계적 특성 계산 (평균, 표준편차)
-            mfcc_mean = np.mean(mfcc.T, axis=0)
-            mfcc_std = np.std(mfcc.T, axis=0)
-            
-            # 특성 벡터 결합
-            features = np.concatenate([mfcc_mean, mfcc_std])
-            
-            return features
+            sender_account, recipient_account = self._check_transfer_accounts(
+                sender_account_id, recipient_account_id, total_amount
+            )
+            balances = [
+                (sender_account_id, sender_account['balance'] - total_amount),
+                (recipient_account_id, recipient_account['balance'] + amount),
+            ]
             
-        except Exception as e:
-            logger.error(f"음성 특성 추출 오류: {str(e)}")
-            return None
+            with data_lock:
+                now = utc_now()
+                transaction = {
+                    'id': self.next_transaction_id,
+                    'sender_id': sender_id,
+                    'recipient_id': recipient_id,
+                    'sender_account_id': sender_account_id,
+                    'recipient_account_id': recipient_account_id,
+                    'amount': amount,
+                    'fee': fee,
+                    'status': 'completed',
+                    'transaction_type': transaction_type,
+                    'description': description,
+                    'created_at': now,
+                    'completed_at': now
+                }
+                self._apply_transfer(transaction, balances)
+                lsn = self._log('transfer', transaction, balances)
+        finally:
+            self._unlock_accounts(locks)
+        
+        self._sync(lsn)
+        return {
+            'transaction_id': transaction['id'],
+            'sender_balance': balances[0][1],
+            'recipient_balance': balances[1][1]
+        }
+    
+    def prepare_transfer(self, sender_id, recipient_id, sender_account_id, recipient_account_id,
+                         amount, fee=0, description=None, transaction_type='voice_transfer', ttl=180):
+        """이체 준비 - 대기(pending) 거래를 만들고 출금 금액을 ttl초 동안 보류
+
+        확인(complete_transaction) 전까지 잔액은 그대로 두고 이용 가능 잔액에서만
+        빠지므로, 같은 계좌의 다른 이체가 보류 금액을 쓰지 못합니다.
+        만료된 보류는 TransferHoldSweeper가 expire_transaction으로 해제합니다.
+        """
+        self._check_transfer_amount(amount, fee)
+        total_amount = amount + fee
+        locks = self._lock_accounts(sender_account_id, recipient_account_id)
+        try:
+            self._check_transfer_accounts(sender_account_id, recipient_account_id, total_amount)
+            
+            with data_lock:
+                now = utc_now()
+                transaction = {
+                    'id': self.next_transaction_id,
+                    'sender_id': sender_id,
+                    'recipient_id': recipient_id,
+                    'sender_account_id': sender_account_id,
+                    'recipient_account_id': recipient_account_id,
+                    'amount': amount,
+                    'fee': fee,
+                    'status': 'pending',
+                    'transaction_type': transaction_type,
+                    'description': description,
+                    'created_at': now,
+                    'completed_at': None
+                }
+                hold = {
+                    'account_id': sender_account_id,
+                    'amount': total_amount,
+                    'expires_at': now + timedelta(seconds=ttl)
+                }
+                self._apply_prepare_transfer(transaction, hold)
+                available = self.get_available_balance(sender_account_id)
+                lsn = self._log('prepare_transfer', transaction, hold)
+        finally:
+            self._unlock_accounts(locks)
+        
+        self._sync(lsn)
+        return {
+            'transaction_id': transaction['id'],
+            'expires_at': hold['expires_at'],
+            'available_balance': available
+        }
+    
+    def expire_transaction(self, transaction_id, now=None):
+        """보류 기한이 지난 대기 거래를 만료 처리하고 보류 해제 (처리 여부 반환)"""
+        hold = self.transfer_holds.get(transaction_id)
+        if hold is None:
+            return False
+        
+        transaction = self.transactions[transaction_id]
+        locks = self._lock_accounts(transaction['sender_account_id'], transaction['recipient_account_id'])
+        try:
+            hold = self.transfer_holds.get(transaction_id)  # 잠금 대기 중 확정되었을 수 있음
+            if hold is None or hold['expires_at'] > (now or utc_now()):
+                return False
+            
+            with data_lock:
+                self._apply_complete_transaction(transaction_id, 'expired', None, [])
+                lsn = self._log('complete_transaction', transaction_id, 'expired', None, [])
+        finally:
+            self._unlock_accounts(locks)
+        
+        self._sync(lsn)
+        return True
+    
+    def get_transfer_holds(self):
+        """보류 목록 [(만료 시각, 거래 ID), ...] (만료 처리기 초기화용)"""
+        with data_lock:
+            return [(hold['expires_at'], transaction_id) for transaction_id, hold in self.transfer_holds.items()]
+    
+    def complete_transaction(self, transaction_id):
+        """대기(pending) 거래를 원자적으로 완료 (잔액 부족 시 거래를 실패 처리)
+
+        준비된 이체면 자기 보류 금액을 풀어 확인하고, 보류 기한이 지났으면
+        만료 처리 후 TransferError('expired')를 냅니다. 모든 조회가 ID 기반이라 O(1).
+        """
+        transaction = self.transactions.get(transaction_id)
+        if not transaction:
+            raise TransferError('not_found', '거래를 찾을 수 없습니다.')
+        
+        total_amount = transaction['amount'] + transaction['fee']
+        error = None  # 만료/실패 처리를 기록하고 잠금을 놓은 뒤 낼 오류
+        locks = self._lock_accounts(transaction['sender_account_id'], transaction['recipient_account_id'])
+        try:
+            if transaction['status'] == 'expired':
+                raise TransferError('expired', '확인 시간이 지나 이체가 취소되었습니다. 다시 요청해주세요.')
+            if transaction['status'] != 'pending':
+                raise TransferError('not_pending', '이미 처리된 거래입니다.')
+            
+            hold = self.transfer_holds.get(transaction_id)
+            if hold is not None and hold['expires_at'] <= utc_now():
+                error = TransferError('expired', '확인 시간이 지나 이체가 취소되었습니다. 다시 요청해주세요.')
+            else:
+                try:
+                    sender_account, recipient_account = self._check_transfer_accounts(
+                        transaction['sender_account_id'], transaction['recipient_account_id'], total_amount,
+                        released=hold['amount'] if hold is not None else 0
+                    )
+                except TransferError as e:
+                    error = e
+            
+            if error is not None:
+                status = 'expired' if error.code == 'expired' else 'failed'
+                with data_lock:
+                    self._apply_complete_transaction(transaction_id, status, None, [])
+                    lsn = self._log('complete_transaction', transaction_id, status, None, [])
+            else:
+                balances = [
+                    (sender_account['id'], sender_account['balance'] - total_amount),
+                    (recipient_account['id'], recipient_account['balance'] + transaction['amount']),
+                ]
+                with data_lock:
+                    completed_at = utc_now()
+                    self._apply_complete_transaction(transaction_id, 'completed', completed_at, balances)
+                    lsn = self._log('complete_transaction', transaction_id, 'completed', completed_at, balances)
+        finally:
+            self._unlock_accounts(locks)
+        
+        # fsync 대기는 계좌 잠금을 놓은 뒤 (같은 계좌의 다른 이체가 디스크를 기다리지 않도록)
+        self._sync(lsn)
+        if error is not None:
+            raise error
+        return {
+            'transaction_id': transaction_id,
+            'sender_balance': balances[0][1],
+            'recipient_balance': balances[1][1]
+        }
+    
+    def update_transaction_status(self, transaction_id, status):
+        """거래 상태 업데이트"""
+        with data_lock:
+            if transaction_id not in self.transactions:
+                return False
+            
+            completed_at = utc_now() if status == 'completed' else None
+            self._apply_update_transaction_status(transaction_id, status, completed_at)
+            lsn = self._log('update_transaction_status', transaction_id, status, completed_at)
+        self._sync(lsn)
+        return True
+    
+    def _put_voice_profile(self, user_id, voice_profile):
+        """음성 프로필 저장 (data_lock 안에서 호출, WAL LSN 반환)"""
+        self._apply_put_voice_profile(user_id, voice_profile)
+        return self._log('put_voice_profile', user_id, voice_profile)
+    
+    @staticmethod
+    def _new_voice_profile(user_id, voice_features):
+        voice_features = np.asarray(voice_features, dtype=np.float64)
+        return {
+            'user_id': user_id,
+            'voice_features': voice_features,  # 등록 샘플 평균 (중심)
+            'feature_m2': np.zeros_like(voice_features),  # 차원별 편차 제곱합 (Welford, 분산 = m2 / sample_count)
+            'sample_count': 1,
+            'created_at': utc_now(),
+            'updated_at': utc_now(),
+            'is_active': True
+        }
+    
+    def create_voice_profile(self, user_id, voice_features):
+        """음성 프로필 생성 (기존 프로필은 초기화)"""
+        with data_lock:
+            lsn = self._put_voice_profile(user_id, self._new_voice_profile(user_id, voice_features))
+        self._sync(lsn)
+    
+    def update_voice_profile(self, user_id, samples, max_samples=None, replace=False):
+        """음성 샘플들을 프로필에 누적 (Welford 온라인 평균/편차 제곱합, 샘플당 O(dim))
+
+        샘플을 모두 메모리에서 합친 뒤 프로필을 한 번만 교체/기록하므로 (WAL
+        레코드 1개) 읽는 쪽은 중간 상태를 보지 않습니다. replace=True이거나
+        활성 프로필이 없으면 첫 샘플로 새 프로필을 만듭니다.
+        max_samples를 지정하면 표본 수를 그 값에서 멈춰 최근 샘플의 가중치를
+        일정하게 유지합니다 (적응형 갱신용 지수 이동 평균/분산).
+        """
+        samples = [np.asarray(x, dtype=np.float64) for x in samples]
+        with data_lock:
+            voice_profile = self.voice_profiles.get(user_id)
+            if replace or not voice_profile or not voice_profile['is_active']:
+                voice_profile = self._new_voice_profile(user_id, samples[0])
+                samples = samples[1:]
+            
+            mean = voice_profile['voice_features']
+            m2 = voice_profile.get('feature_m2')
+            if m2 is None:
+                m2 = np.zeros_like(mean)
+            count = voice_profile['sample_count']
+            for x in samples:
+                delta = x - mean
+                if max_samples is not None and count >= max_samples:
+                    # 표본 수 상한: 평균과 함께 편차 제곱합도 같은 비율로 감쇠
+                    count = max_samples
+                    mean = mean + delta / count
+                    m2 = (m2 + delta * delta) * (1 - 1 / count)
+                else:
+                    count += 1
+                    mean = mean + delta / count
+                    m2 = m2 + delta * (x - mean)
+            
+            voice_profile = dict(
+                voice_profile,
+                voice_features=mean,
+                feature_m2=m2,
+                sample_count=count,
+                updated_at=utc_now()
+            )
+            lsn = self._put_voice_profile(user_id, voice_profile)
+        self._sync(lsn)
+        return voice_profile
+    
+    def deactivate_voice_profile(self, user_id):
+        """음성 프로필 비활성화"""
+        with data_lock:
+            voice_profile = self.voice_profiles.get(user_id)
+            if not voice_profile:
+                return False
+            
+            lsn = self._put_voice_profile(
+                user_id, dict(voice_profile, is_active=False, updated_at=utc_now())
+            )
+        self._sync(lsn)
+        return True
+    
+    def get_voice_profile(self, user_id):
+        """음성 프로필 조회"""
+        return self.voice_profiles.get(user_id)
+    
+    def save_payee(self, user_id, alias, account_id):
+        """수취인 저장 (같은 별칭이 있으면 계좌 변경)"""
+        with data_lock:
+            self._apply_put_payee(user_id, alias, account_id)
+            lsn = self._log('put_payee', user_id, alias, account_id)
+        self._sync(lsn)
+        return True
+    
+    def delete_payee(self, user_id, alias):
+        """저장된 수취인 삭제"""
+        with data_lock:
+            if alias not in self.payees.get(user_id, {}):
+                return False
+            
+            self._apply_delete_payee(user_id, alias)
+            lsn = self._log('delete_payee', user_id, alias)
+        self._sync(lsn)
+        return True
+    
+    def get_payees(self, user_id):
+        """저장된 수취인 목록 [(별칭, 계좌), ...]"""
+        return [
+            (alias, self.accounts[account_id])
+            for alias, account_id in self.payees.get(user_id, {}).items()
+        ]
+
+def _is_serving_process():
+    """요청을 처리하는 프로세스인지 (디버그 리로더의 감시 프로세스는 요청을 처리하지 않음)"""
+    return not (__name__ == '__main__' and os.environ.get('WERKZEUG_RUN_MAIN') != 'true')
+
+def _persistence_enabled():
+    """영속화 사용 여부 (디버그 리로더의 감시 프로세스는 제외)"""
+    return app.config['PERSISTENCE_ENABLED'] and _is_serving_process()
+
+# 데이터 저장소 인스턴스
+data_store = DataStore(
+    DataPersistence(
+        app.config['DATA_DIR'],
+        sync_mode=app.config['WAL_SYNC_MODE'],
+        snapshot_interval=app.config['SNAPSHOT_INTERVAL'],
+        snapshot_min_records=app.config['SNAPSHOT_MIN_RECORDS']
+    ) if _persistence_enabled() else None
+)
+
+# ========================= AI 서비스 클래스 =========================
+
+class VoiceAuthenticator:
+    def __init__(self):
+        self.threshold = 0.85  # 음성 인증 임계치
+        self.n_mfcc = 13
+        self.feature_engine = app.config['VOICE_FEATURE_ENGINE']
+        self.vad = app.config['VOICE_VAD_ENABLED']
+        
+    def feature_options(self):
+        """특성 추출 작업에 전달할 옵션"""
+        return {'n_mfcc': self.n_mfcc, 'engine': self.feature_engine, 'vad': self.vad}
+    
+    def extract_voice_features(self, audio_file_path):
+        """음성 파일에서 MFCC 특성 추출"""
+        return audio_features.extract_voice_features(audio_file_path, **self.feature_options())
     
     def authenticate_voice(self, user_id, current_features):
         """등록된 사용자 음성과 비교하여 인증"""
@@ -418,156 +1869,1560 @@ class VoiceAuthenticator:
             if not voice_profile or not voice_profile['is_active']:
                 return False, 0.0
             
-            # 저장된 음성 특성 복원
-            registered_features = voice_profile['voice_features']
+            # 정규화된 등록 벡터와 내적 = 코사인 유사도
+            registered_vector = data_store.voice_profile_index.get_vector(user_id)
+            if registered_vector is None:
+                return False, 0.0
             
-            # 코사인 유사도 계산
-            similarity = cosine_similarity(
-                [current_features], 
-                [registered_features]
-            )[0][0]
+            current_vector = VoiceProfileIndex.normalize(current_features)[0]
+            similarity = float(np.dot(current_vector, registered_vector))
             
             is_authenticated = similarity >= self.threshold
             
             logger.info(f"음성 인증 결과 - 사용자 ID: {user_id}, 유사도: {similarity:.3f}, 인증: {is_authenticated}")
             
-            return is_authenticated, float(similarity)
+            return is_authenticated, similarity
             
         except Exception as e:
             logger.error(f"음성 인증 오류: {str(e)}")
             return False, 0.0
+    
+    def score_batch(self, features_batch, user_ids=None):
+        """N개 발화 x M개 프로필 코사인 유사도를 한 번의 행렬 곱으로 계산"""
+        profile_user_ids, profile_matrix = data_store.voice_profile_index.get_matrix(user_ids)
+        if not profile_user_ids or len(features_batch) == 0:
+            return profile_user_ids, np.zeros((len(features_batch), len(profile_user_ids)), dtype=np.float32)
+        
+        queries = VoiceProfileIndex.normalize(features_batch)
+        return profile_user_ids, queries @ profile_matrix.T
+    
+    def find_similar_speakers(self, features, k=5, exclude_user_id=None, min_similarity=None):
+        """등록 프로필 중 유사한 화자 top-k 검색 (중복 등록/계정 탈취 탐지용)"""
+        exclude = [exclude_user_id] if exclude_user_id is not None else None
+        matches = data_store.voice_profile_index.search(features, k=k, exclude_user_ids=exclude)
+        if min_similarity is not None:
+            matches = [(user_id, score) for user_id, score in matches if score >= min_similarity]
+        return matches
+
+class FeatureExtractionBusyError(Exception):
+    """특성 추출 대기열이 가득 찬 경우"""
+
+class FeatureExtractionTimeoutError(Exception):
+    """특성 추출이 제한 시간 내에 끝나지 않은 경우"""
+
+class VoiceFeatureCache:
+    """음성 내용 해시(BLAKE2) -> 추출된 특성 벡터 LRU 캐시 (메모리 상한)
+
+    같은 녹음을 다시 보내거나 등록 직후 같은 녹음으로 이체할 때 MFCC를 다시
+    계산하지 않습니다. 항목에 마지막 인증 사용 시각을 함께 두어, 짧은 기간 안에
+    같은 녹음이 다시 인증에 쓰이는지(재전송 공격) 같은 색인으로 확인합니다.
+    """
+    
+    ENTRY_OVERHEAD = 256  # 항목당 키/딕셔너리/배열 헤더 추정 크기 (바이트)
+    
+    def __init__(self, max_bytes=8 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> {'features', 'size', 'authenticated_at'}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'replays': 0
+        }
+    
+    @staticmethod
+    def content_key(audio_bytes, filename, options):
+        """음성 내용 + 디코딩/추출 옵션 해시"""
+        digest = hashlib.blake2b(digest_size=16)
+        extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+        digest.update(repr((extension, sorted(options.items()))).encode())
+        digest.update(audio_bytes)
+        return digest.digest()
+    
+    def get(self, key):
+        """캐시된 특성 벡터 (읽기 전용) 또는 None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry['features'] is None:
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return entry['features']
+    
+    def put(self, key, features):
+        features = np.asarray(features)
+        features.setflags(write=False)  # 여러 요청이 공유하므로 변경 방지
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = {'features': None, 'size': self.ENTRY_OVERHEAD, 'authenticated_at': None}
+                self._bytes += entry['size']
+            elif entry['features'] is not None:
+                self._bytes -= entry['features'].nbytes
+            entry['features'] = features
+            self._bytes += features.nbytes
+            self._entries.move_to_end(key)
+            self._evict()
+    
+    def _evict(self):
+        while self._bytes > self.max_bytes and self._entries:
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry['size'] + (entry['features'].nbytes if entry['features'] is not None else 0)
+            self.stats['evictions'] += 1
+    
+    def is_replay(self, key, window):
+        """window초 안에 같은 녹음이 인증에 쓰였는지 확인"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry['authenticated_at'] is None:
+                return False
+            if time.monotonic() - entry['authenticated_at'] > window:
+                return False
+            self.stats['replays'] += 1
+            return True
+    
+    def mark_authenticated(self, key):
+        """녹음이 인증에 사용된 시각 기록 (재전송 확인용)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = {'features': None, 'size': self.ENTRY_OVERHEAD, 'authenticated_at': None}
+                self._bytes += entry['size']
+            entry['authenticated_at'] = time.monotonic()
+            self._entries.move_to_end(key)
+            self._evict()
+    
+    def get_stats(self):
+        """캐시 통계 조회 (크기 조정용)"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['entries'] = len(self._entries)
+            stats['bytes'] = self._bytes
+        stats['max_bytes'] = self.max_bytes
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        return stats
+
+class VoiceActivityStats:
+    """음성 구간 검출(VAD) 통계 - 특성 추출 워커와 스트리밍 업로드가 함께 기록
 
-class NLPService:
+    추출은 워커 프로세스에서 하므로 워커가 결과와 함께 돌려준 프레임 수를
+    부모 프로세스에서 합산합니다.
+    """
+    
     def __init__(self):
-        self.currency_words = {
-            '만': 10000,
-            '천': 1000,
-            '십': 10,
-            '백': 100,
+        self._lock = threading.Lock()
+        self.stats = {
+            'requests': 0,
+            'trimmed': 0,  # 앞뒤 비음성 프레임을 잘라낸 요청 수
+            'no_speech': 0,  # 음성을 찾지 못해 자르지 않은 요청 수
+            'frames': 0,
+            'dropped_frames': 0
+        }
+    
+    def record(self, vad_stats):
+        """추출 1건의 VAD 결과 {'frames', 'dropped', 'speech'} 반영 (None이면 무시)"""
+        if vad_stats is None:
+            return
+        with self._lock:
+            self.stats['requests'] += 1
+            self.stats['frames'] += vad_stats['frames']
+            self.stats['dropped_frames'] += vad_stats['dropped']
+            if vad_stats['dropped']:
+                self.stats['trimmed'] += 1
+            if not vad_stats['speech']:
+                self.stats['no_speech'] += 1
+    
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+        stats['dropped_ratio'] = round(stats['dropped_frames'] / stats['frames'], 4) if stats['frames'] else 0.0
+        return stats
+
+class FeatureExtractionService:
+    """음성 특성 추출을 프로세스 풀로 오프로드하는 서비스 (내용 해시 캐시 우선 조회)"""
+    
+    def __init__(self, authenticator, max_workers, max_pending, timeout, cache=None, vad_stats=None):
+        self.authenticator = authenticator
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.cache = cache  # VoiceFeatureCache 또는 None
+        self.vad_stats = vad_stats  # VoiceActivityStats 또는 None
+        
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.stats = {
+            'submitted': 0,
+            'completed': 0,
+            'rejected': 0,
+            'timeouts': 0,
+            'failed': 0
         }
     
-    def extract_transfer_info(self, text):
-        """STT 텍스트에서 이체 정보 추출"""
+    def _get_executor(self):
+        """실행기 지연 생성 (첫 요청 시 워커 프로세스 시작)"""
+        with self._executor_lock:
+            if self._executor is None:
+                if self.max_workers > 0:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        initializer=audio_features.warm_up
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=1,
+                        initializer=audio_features.warm_up
+                    )
+                logger.info(f"특성 추출 풀 시작 - 워커: {self.max_workers}, 대기열: {self.max_pending}")
+            return self._executor
+    
+    def start(self):
+        """워커 미리 시작 (첫 요청의 콜드 스타트 방지)"""
+        executor = self._get_executor()
+        futures = [executor.submit(int) for _ in range(max(self.max_workers, 1))]
+        for future in futures:
+            future.result()
+    
+    def _reset_executor(self):
+        """비정상 종료된 프로세스 풀 교체"""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+    
+    def _count(self, key):
+        with self._stats_lock:
+            self.stats[key] += 1
+    
+    def _release_slot(self, future):
+        self._slots.release()
+        self._count('failed' if future.cancelled() or future.exception() else 'completed')
+    
+    def submit(self, fn, *args, **kwargs):
+        """작업을 풀에 제출하고 Future 반환 (포화 시 FeatureExtractionBusyError)"""
+        if not self._slots.acquire(blocking=False):
+            self._count('rejected')
+            raise FeatureExtractionBusyError()
+        
         try:
-            # 수취인 추출 (예: "김철수에게", "홍길동한테")
-            recipient_patterns = [
-                r'([가-힣]{2,4})(에게|한테|께)',
-                r'([가-힣]{2,4})\s*(님)?\s*(에게|한테|께)',
-            ]
+            future = self._get_executor().submit(fn, *args, **kwargs)
+        except BrokenProcessPool:
+            self._slots.release()
+            self._reset_executor()
+            raise
+        except Exception:
+            self._slots.release()
+            raise
+        
+        self._count('submitted')
+        # 실행 중인 작업은 취소할 수 없으므로 슬롯은 작업이 실제로 끝날 때 반환
+        future.add_done_callback(self._release_slot)
+        return future
+    
+    def wait(self, future, timeout=None):
+        """제출된 작업 결과 대기 (시간 초과 시 FeatureExtractionTimeoutError)"""
+        try:
+            return future.result(timeout=self.timeout if timeout is None else timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            self._count('timeouts')
+            raise FeatureExtractionTimeoutError()
+        except BrokenProcessPool:
+            self._reset_executor()
+            raise
+    
+    def run(self, fn, *args, **kwargs):
+        """작업을 풀에 제출하고 결과 대기"""
+        return self.wait(self.submit(fn, *args, **kwargs))
+    
+    def _submit_extract(self, audio_bytes, filename):
+        return self.submit(
+            audio_features.extract_voice_features_from_bytes_with_stats,
+            audio_bytes,
+            filename,
+            spool_dir=app.config['UPLOAD_FOLDER'],
+            **self.authenticator.feature_options()
+        )
+    
+    def _wait_extract(self, future, timeout=None):
+        """추출 결과 대기 - 특성 벡터 반환 (VAD 통계는 기록)"""
+        voice_features, vad_stats = self.wait(future, timeout)
+        if self.vad_stats is not None:
+            self.vad_stats.record(vad_stats)
+        return voice_features
+    
+    def content_key(self, audio_bytes, filename):
+        """캐시/재전송 확인용 음성 내용 키"""
+        return VoiceFeatureCache.content_key(audio_bytes, filename, self.authenticator.feature_options())
+    
+    def _cache_result(self, key, voice_features):
+        if self.cache is not None and voice_features is not None:
+            self.cache.put(key, voice_features)
+        return voice_features
+    
+    def extract(self, audio_bytes, filename, key=None):
+        """업로드된 음성 바이트 특성 추출 (key: 미리 계산한 content_key)"""
+        if self.cache is None:
+            return self._wait_extract(self._submit_extract(audio_bytes, filename))
+        
+        key = key or self.content_key(audio_bytes, filename)
+        voice_features = self.cache.get(key)
+        if voice_features is not None:
+            return voice_features
+        return self._cache_result(key, self._wait_extract(self._submit_extract(audio_bytes, filename)))
+    
+    def extract_signal(self, y, sr):
+        """디코딩된 신호 특성 추출 (스트리밍 업로드를 설정된 엔진으로 계산할 때)"""
+        return self._wait_extract(self.submit(
+            audio_features.compute_features_with_stats, y, sr, **self.authenticator.feature_options()
+        ))
+    
+    def extract_many(self, uploads):
+        """여러 음성 (bytes, filename)을 병렬 추출 - 결과 순서는 입력과 동일 (캐시된 음성은 제출하지 않음)"""
+        results = [None] * len(uploads)
+        keys = [None] * len(uploads)
+        futures = []
+        try:
+            for i, (audio_bytes, filename) in enumerate(uploads):
+                if self.cache is not None:
+                    keys[i] = self.content_key(audio_bytes, filename)
+                    results[i] = self.cache.get(keys[i])
+                    if results[i] is not None:
+                        continue
+                futures.append((i, self._submit_extract(audio_bytes, filename)))
+        except FeatureExtractionBusyError:
+            # 일부만 제출된 경우 대기 중인 작업 취소
+            for _, future in futures:
+                future.cancel()
+            raise
+        
+        # 제한 시간은 일괄 요청 전체 기준
+        deadline = time.monotonic() + self.timeout
+        for i, future in futures:
+            results[i] = self._cache_result(keys[i], self._wait_extract(future, max(deadline - time.monotonic(), 0)))
+        return results
+    
+    def get_stats(self):
+        """처리 통계 조회"""
+        with self._stats_lock:
+            return dict(self.stats)
+
+class VoiceStreamError(Exception):
+    """스트리밍 업로드 처리 실패 (형식 오류, 청크 순서 오류, 세션 수 초과)"""
+    
+    def __init__(self, message, status=400, expected_index=None):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+        self.expected_index = expected_index
+
+class VoiceStreamStore:
+    """청크 단위 음성 업로드 세션 관리
+
+    세션마다 StreamingFeatureExtractor를 두고 청크가 도착할 때마다 프레임 분석을
+    진행하므로, 발화가 끝난 뒤에는 마지막 청크와 최종 통계 계산만 남습니다.
+    원본 음성은 보관하지 않고 내용 해시(재전송 확인용)만 누적합니다.
+    WAV 형식은 첫 청크들의 헤더에서 샘플링 레이트/채널/샘플 폭을 읽습니다.
+
+    점진 분석은 fast 엔진 계산이므로, 등록 프로필을 만드는 엔진
+    (VOICE_FEATURE_ENGINE)이 fast가 아니면 같은 녹음도 유사도가 낮아집니다.
+    이 경우 신호만 모아 두었다가 종료 시 설정된 엔진으로 특성 추출 풀에서
+    일괄 계산해 등록과 같은 특성을 씁니다 (풀이 가득 차면 429, 세션은 유지).
+
+    청크 분석은 프로세스 풀이 아닌 요청 스레드에서 하므로, 세션 수와 별도로
+    동시에 분석 중인 청크를 max_active_chunks개로 제한하고 넘치면 429로
+    거절합니다 (거절된 청크는 반영하지 않으므로 같은 번호로 다시 보내면 됨).
+    """
+    
+    MAX_HEADER_BYTES = 64 * 1024
+    
+    def __init__(self, authenticator, idle_timeout=30, max_sessions=256, max_active_chunks=4, vad_stats=None,
+                 feature_extractor=None):
+        self.authenticator = authenticator
+        self.feature_extractor = feature_extractor  # fast가 아닌 엔진의 종료 시 일괄 추출용
+        self.vad_stats = vad_stats  # VoiceActivityStats 또는 None
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.max_active_chunks = max_active_chunks
+        self._chunk_slots = threading.BoundedSemaphore(max_active_chunks)
+        self._sessions = {}  # stream_id -> 세션
+        self._lock = threading.Lock()
+        self.stats = {
+            'started': 0,
+            'finished': 0,
+            'expired': 0,
+            'chunks': 0,
+            'bytes': 0,
+            'busy_rejections': 0  # 분석 슬롯이 없어 429로 거절한 청크 수
+        }
+    
+    def _purge(self, now):
+        expired = [
+            stream_id for stream_id, session in self._sessions.items()
+            if now - session['last_activity'] > self.idle_timeout
+        ]
+        for stream_id in expired:
+            del self._sessions[stream_id]
+        self.stats['expired'] += len(expired)
+    
+    def create(self, user_id, audio_format='pcm', sample_rate=None, channels=1, sample_width=2):
+        """세션 시작 - stream_id 반환 (형식 오류/세션 초과 시 VoiceStreamError)"""
+        options = self.authenticator.feature_options()
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr(('stream', audio_format, sample_rate, channels, sample_width, sorted(options.items()))).encode())
+        
+        session = {
+            'user_id': user_id,
+            'format': audio_format,
+            'extractor': None,
+            'header': b'',
+            'next_index': 0,
+            'bytes': 0,
+            'digest': digest,
+            'n_mfcc': options['n_mfcc'],
+            'vad': options['vad'],
+            'keep_signal': options['engine'] != audio_features.ENGINE_FAST,
+            'finished': False,
+            'lock': threading.Lock(),
+            'last_activity': time.monotonic()
+        }
+        if audio_format == 'pcm':
+            session['extractor'] = self._new_extractor(
+                sample_rate, channels, sample_width, options['n_mfcc'], options['vad'], session['keep_signal']
+            )
+        elif audio_format != 'wav':
+            raise VoiceStreamError('지원하지 않는 형식입니다. (pcm, wav)')
+        
+        with self._lock:
+            self._purge(session['last_activity'])
+            if len(self._sessions) >= self.max_sessions:
+                raise VoiceStreamError('음성 처리 요청이 많습니다. 잠시 후 다시 시도해주세요.', status=429)
+            stream_id = uuid.uuid4().hex
+            self._sessions[stream_id] = session
+            self.stats['started'] += 1
+        return stream_id
+    
+    @staticmethod
+    def _new_extractor(sample_rate, channels, sample_width, n_mfcc, vad, keep_signal=False):
+        try:
+            return audio_features.StreamingFeatureExtractor(
+                int(sample_rate), int(channels), int(sample_width), n_mfcc=n_mfcc, vad=vad,
+                keep_signal=keep_signal
+            )
+        except (TypeError, ValueError):
+            raise VoiceStreamError('샘플링 레이트/채널/샘플 폭이 올바르지 않습니다.')
+    
+    def get(self, user_id, stream_id):
+        """본인 세션 조회 (없거나 만료되면 None)"""
+        with self._lock:
+            session = self._sessions.get(stream_id)
+            if session is None or session['user_id'] != user_id:
+                return None
+            if time.monotonic() - session['last_activity'] > self.idle_timeout:
+                del self._sessions[stream_id]
+                self.stats['expired'] += 1
+                return None
+            return session
+    
+    def append(self, session, index, data):
+        """청크 추가 - 이미 받은 청크(재전송)면 False, 처리하면 True
+
+        청크 번호가 건너뛰면 VoiceStreamError(409), 분석 슬롯이 없으면
+        VoiceStreamError(429)를 냅니다.
+        """
+        with session['lock']:
+            if session['finished']:
+                raise VoiceStreamError('음성 업로드를 찾을 수 없습니다. 다시 시작해주세요.', status=404)
+            if index < session['next_index']:
+                return False
+            if index > session['next_index']:
+                raise VoiceStreamError(
+                    '청크 순서가 맞지 않습니다.', status=409, expected_index=session['next_index']
+                )
             
-            recipient = None
-            for pattern in recipient_patterns:
-                match = re.search(pattern, text)
-                if match:
-                    recipient = match.group(1)
-                    break
+            if not self._chunk_slots.acquire(blocking=False):
+                with self._lock:
+                    self.stats['busy_rejections'] += 1
+                raise VoiceStreamError(
+                    '음성 처리 요청이 많습니다. 잠시 후 다시 시도해주세요.', status=429, expected_index=index
+                )
             
-            # 금액 추출
-            amount = self._extract_amount(text)
+            try:
+                session['digest'].update(data)
+                session['next_index'] += 1
+                session['bytes'] += len(data)
+                session['last_activity'] = time.monotonic()
+                
+                received = len(data)
+                if session['extractor'] is None:
+                    data = self._read_wav_header(session, data)
+                if data:
+                    session['extractor'].feed(data)
+            finally:
+                self._chunk_slots.release()
+        
+        with self._lock:
+            self.stats['chunks'] += 1
+            self.stats['bytes'] += received
+        return True
+    
+    def _read_wav_header(self, session, data):
+        """WAV 헤더가 완성될 때까지 모았다가 추출기 생성 - 헤더 뒤 PCM 바이트 반환"""
+        buffered = session['header'] + data
+        try:
+            header = audio_features.parse_wav_header(buffered)
+        except ValueError as e:
+            raise VoiceStreamError(str(e))
+        
+        if header is None:
+            if len(buffered) > self.MAX_HEADER_BYTES:
+                raise VoiceStreamError('WAV 헤더를 찾을 수 없습니다.')
+            session['header'] = buffered
+            return b''
+        
+        sample_rate, channels, sample_width, data_offset = header
+        session['extractor'] = self._new_extractor(
+            sample_rate, channels, sample_width, session['n_mfcc'], session['vad'], session['keep_signal']
+        )
+        session['header'] = b''
+        return buffered[data_offset:]
+    
+    def finish(self, user_id, stream_id):
+        """세션 종료 - (특성 벡터 또는 None, 내용 키), 세션이 없으면 None
+
+        일괄 추출이 FeatureExtractionBusyError/TimeoutError로 실패하면 세션을
+        남겨 두므로 같은 요청을 다시 보내면 됩니다.
+        """
+        with self._lock:
+            session = self._sessions.get(stream_id)
+            if session is None or session['user_id'] != user_id:
+                return None
+        
+        with session['lock']:
+            if session['finished']:
+                return None
             
-            return {
-                'recipient': recipient,
-                'amount': amount,
-                'original_text': text,
-                'extracted_successfully': recipient is not None and amount is not None
+            extractor = session['extractor']
+            if extractor is None:
+                voice_features = None
+            elif extractor.keep_signal:
+                voice_features = (
+                    self.feature_extractor.extract_signal(extractor.signal(), extractor.sr)
+                    if extractor.n_samples else None
+                )
+            else:
+                voice_features = extractor.finish()
+                if self.vad_stats is not None:
+                    self.vad_stats.record(extractor.vad_stats)
+            session['finished'] = True
+        
+        with self._lock:
+            if self._sessions.get(stream_id) is session:
+                del self._sessions[stream_id]
+            self.stats['finished'] += 1
+        return voice_features, session['digest'].digest()
+    
+    def discard(self, user_id, stream_id):
+        with self._lock:
+            session = self._sessions.get(stream_id)
+            if session is None or session['user_id'] != user_id:
+                return False
+            del self._sessions[stream_id]
+            return True
+    
+    @staticmethod
+    def describe(session):
+        """진행 상태 응답 필드"""
+        extractor = session['extractor']
+        return {
+            'nextChunkIndex': session['next_index'],
+            'receivedBytes': session['bytes'],
+            'duration': round(extractor.duration, 3) if extractor is not None else 0.0,
+            'frames': extractor.n_frames if extractor is not None else 0
+        }
+    
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats['active'] = len(self._sessions)
+            stats['max_active_chunks'] = self.max_active_chunks
+        return stats
+
+# 서비스 인스턴스 생성
+voice_auth = VoiceAuthenticator()
+nlp_service = NLPService()
+voice_feature_cache = (
+    VoiceFeatureCache(app.config['VOICE_FEATURE_CACHE_MAX_BYTES'])
+    if app.config['VOICE_FEATURE_CACHE_MAX_BYTES'] > 0 else None
+)
+voice_activity_stats = VoiceActivityStats()
+feature_extractor = FeatureExtractionService(
+    voice_auth,
+    max_workers=app.config['FEATURE_EXTRACTION_WORKERS'],
+    max_pending=app.config['FEATURE_EXTRACTION_QUEUE_SIZE'],
+    timeout=app.config['FEATURE_EXTRACTION_TIMEOUT'],
+    cache=voice_feature_cache,
+    vad_stats=voice_activity_stats
+)
+voice_stream_store = VoiceStreamStore(
+    voice_auth,
+    idle_timeout=app.config['VOICE_STREAM_IDLE_TIMEOUT'],
+    max_sessions=app.config['VOICE_STREAM_MAX_SESSIONS'],
+    max_active_chunks=app.config['VOICE_STREAM_MAX_ACTIVE_CHUNKS'],
+    vad_stats=voice_activity_stats,
+    feature_extractor=feature_extractor
+)
+
+# ========================= 추가 유틸리티 함수 =========================
+
+def find_account_by_user_info(recipient_name):
+    """수취인 이름으로 계좌 찾기"""
+    user = data_store.get_user_by_username(recipient_name)
+    if user:
+        accounts = data_store.get_user_accounts(user['id'])
+        if accounts:
+            return accounts[0]  # 첫 번째 활성 계좌 반환
+    return None
+
+def resolve_recipient(user_id, recipient_name):
+    """수취인 이름을 저장된 수취인 별칭과 활성 사용자명에서 찾아 후보 목록 반환
+
+    STT 오인식을 고려해 자모 편집 거리 RECIPIENT_FUZZY_MAX_DISTANCE 이내까지 찾고,
+    거리 -> 저장된 수취인 우선 -> 이름 순으로 정렬합니다.
+    후보: {'name', 'source' ('payee'/'user'), 'distance', 'account'}
+    """
+    max_distance = app.config['RECIPIENT_FUZZY_MAX_DISTANCE']
+    limit = app.config['RECIPIENT_CANDIDATE_LIMIT']
+    candidates = []
+    
+    payee_index = data_store.payee_indexes.get(user_id)
+    if payee_index is not None:
+        for alias, distance, account_ids in payee_index.search(recipient_name, max_distance, limit):
+            for account_id in account_ids:
+                account = data_store.accounts.get(account_id)
+                if account and account['is_active']:
+                    candidates.append({'name': alias, 'source': 'payee', 'distance': distance, 'account': account})
+    
+    for username, distance, user_ids in data_store.recipient_index.search(recipient_name, max_distance, limit):
+        for match_user_id in sorted(user_ids):
+            accounts = data_store.get_user_accounts(match_user_id)
+            if accounts:
+                candidates.append({'name': username, 'source': 'user', 'distance': distance, 'account': accounts[0]})
+    
+    # 같은 계좌는 한 번만 (저장된 수취인 쪽 우선)
+    candidates.sort(key=lambda candidate: (candidate['distance'], candidate['source'] != 'payee', candidate['name']))
+    seen_accounts = set()
+    ranked = []
+    for candidate in candidates:
+        if candidate['account']['id'] not in seen_accounts:
+            seen_accounts.add(candidate['account']['id'])
+            ranked.append(candidate)
+    return ranked[:limit]
+
+def pick_recipient(candidates, allow_fuzzy=False):
+    """후보 목록에서 수취인 확정 (가장 가까운 후보가 유일할 때만)
+
+    기본은 이름이 정확히 일치할 때만 확정합니다. allow_fuzzy는 사용자가 수취인을
+    확인한 뒤에 돈이 움직이는 경우(이체 준비)에만 사용하며, 이때는 자모 편집 거리
+    RECIPIENT_FUZZY_AUTO_DISTANCE 이내의 유일한 후보로 보정합니다.
+    """
+    max_distance = app.config['RECIPIENT_FUZZY_AUTO_DISTANCE'] if allow_fuzzy else 0
+    if not candidates or candidates[0]['distance'] > max_distance:
+        return None
+    if len(candidates) > 1 and candidates[1]['distance'] == candidates[0]['distance']:
+        return None
+    return candidates[0]
+
+def format_recipient_candidate_for_swift(candidate):
+    """수취인 후보 응답 형식"""
+    return {
+        'name': candidate['name'],
+        'source': candidate['source'],
+        'distance': candidate['distance'],
+        'accountNumber': mask_account_number(candidate['account']['account_number']),
+        'bankName': '신한은행'
+    }
+
+def recipient_not_found_response(recipient_name, candidates):
+    """수취인을 확정할 수 없을 때 404 응답 (후보가 있으면 함께 반환)"""
+    result = create_transfer_result_for_swift(False, f'{recipient_name}님의 계좌를 찾을 수 없습니다.')
+    if candidates:
+        result['message'] = f'{recipient_name}님을 찾을 수 없습니다. 아래 수취인 중 선택해주세요.'
+        result['candidates'] = [format_recipient_candidate_for_swift(candidate) for candidate in candidates]
+    return jsonify(result), 404
+
+def find_account_by_number(account_number):
+    """계좌번호로 계좌 찾기"""
+    if not account_number:
+        return None
+    return data_store.get_account_by_number(account_number)
+
+class SwiftViewCache:
+    """Swift 응답용 표시 필드 캐시
+
+    거래의 변하지 않는 필드(금액/수수료 문자열, 날짜, 상대방 이름 등)는 DataStore
+    변경 리스너로 쓰기 시점에 한 번만 포맷팅해 두고, 조회 시에는 보는 사람 기준의
+    송금/입금 필드만 합칩니다. 최근 max_transactions개 거래만 보관 (LRU).
+    계좌는 잔액/활성 여부를 제외한 필드를 캐시합니다.
+    """
+    
+    STATUS_NAMES = {
+        'pending': '처리중',
+        'completed': '완료',
+        'failed': '실패',
+        'expired': '만료'
+    }
+    
+    def __init__(self, store, max_transactions=100000):
+        self._store = store
+        self.max_transactions = max_transactions
+        self._transactions = OrderedDict()  # transaction_id -> (sender_id, 공통, 송금자용, 수취인용)
+        self._accounts = {}  # account_id -> 고정 필드
+        self._lock = threading.Lock()
+        store.add_write_listener(self._on_write)
+    
+    def _on_write(self, op, args):
+        if op in ('create_transaction', 'transfer', 'prepare_transfer'):
+            self._put(args[0])
+        elif op in ('update_transaction_status', 'complete_transaction'):
+            transaction = self._store.transactions.get(args[0])
+            if transaction is not None:
+                self._put(transaction)
+    
+    def _build(self, transaction):
+        users = self._store.users
+        status = transaction['status']
+        completed_at = transaction['completed_at']
+        common = {
+            'id': transaction['id'],
+            'amount': transaction['amount'],
+            'amountFormatted': format_currency(transaction['amount']),
+            'fee': transaction['fee'],
+            'feeFormatted': format_currency(transaction['fee']),
+            'description': transaction['description'],
+            'status': status,
+            'statusName': self.STATUS_NAMES.get(status, status),
+            'transactionDate': transaction['created_at'].isoformat(),
+            'completedDate': completed_at.isoformat() if completed_at else None,
+            'bankName': '신한은행'
+        }
+        outgoing = {
+            'type': 'outgoing',
+            'typeName': '송금',
+            'otherPartyName': users.get(transaction['recipient_id'], {}).get('username', '알 수 없음')
+        }
+        incoming = {
+            'type': 'incoming',
+            'typeName': '입금',
+            'otherPartyName': users.get(transaction['sender_id'], {}).get('username', '알 수 없음')
+        }
+        return transaction['sender_id'], common, outgoing, incoming
+    
+    def _put(self, transaction):
+        view = self._build(transaction)
+        with self._lock:
+            self._transactions[view[1]['id']] = view
+            self._transactions.move_to_end(view[1]['id'])
+            while len(self._transactions) > self.max_transactions:
+                self._transactions.popitem(last=False)
+        return view
+    
+    def transaction(self, transaction, user_id):
+        """user_id 기준 Swift Transaction 형식"""
+        with self._lock:
+            view = self._transactions.get(transaction['id'])
+            if view is not None:
+                self._transactions.move_to_end(transaction['id'])
+        if view is None:
+            view = self._put(transaction)
+        
+        sender_id, common, outgoing, incoming = view
+        return {**common, **(outgoing if sender_id == user_id else incoming)}
+    
+    def account(self, account, user):
+        """Swift Account 형식 (잔액/활성 여부만 매번 계산)"""
+        static = self._accounts.get(account['id'])
+        if static is None:
+            static = {
+                'id': account['id'],
+                'accountNumber': account['account_number'],
+                'accountType': account['account_type'],
+                'accountTypeName': get_account_type_name(account['account_type']),
+                'ownerName': user['username'],
+                'bankName': '신한은행',
+                'bankCode': 'SH',
+                'maskedAccountNumber': mask_account_number(account['account_number']),
+                'createdAt': account['created_at'].isoformat()
             }
+            self._accounts[account['id']] = static
+        
+        balance = account['balance']
+        available_balance = self._store.get_available_balance(account['id'])
+        return {
+            **static,
+            'balance': balance,
+            'balanceFormatted': format_currency(balance),
+            'availableBalance': available_balance,
+            'availableBalanceFormatted': format_currency(available_balance),
+            'isActive': account['is_active']
+        }
+
+class ReadModelCache:
+    """사용자별 조회 응답(계좌 목록, 잔액 요약) LRU/TTL 캐시
+
+    항목은 만들 때 읽은 사용자 데이터 버전과 함께 저장합니다. DataStore의 사용자
+    변경 알림으로 해당 사용자 항목만 즉시 제거하고, 조회 시에도 버전이 다르면
+    사용하지 않으므로 조회 중 변경이 끼어들어도 오래된 응답을 내보내지 않습니다.
+    """
+    
+    KINDS = ('accounts', 'balance')
+    
+    def __init__(self, store, max_entries=10000, ttl=60):
+        self._store = store
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # (user_id, kind) -> (version, 저장 시각, payload)
+        self._lock = threading.Lock()
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'invalidations': 0
+        }
+        store.add_user_change_listener(self.invalidate)
+    
+    def get(self, user_id, kind, version):
+        """캐시된 payload 반환 (없거나 버전이 다르거나 만료되면 None)"""
+        key = (user_id, kind)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                self.stats['misses'] += 1
+                return None
             
-        except Exception as e:
-            logger.error(f"텍스트 파싱 오류: {str(e)}")
-            return {
-                'recipient': None,
-                'amount': None,
-                'original_text': text,
-                'extracted_successfully': False,
-                'error': str(e)
+            if time.monotonic() - entry[1] > self.ttl:
+                del self._entries[key]
+                self.stats['expirations'] += 1
+                self.stats['misses'] += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return entry[2]
+    
+    def put(self, user_id, kind, version, payload):
+        """payload 저장 (만드는 동안 사용자 데이터가 바뀌었으면 저장하지 않음)"""
+        key = (user_id, kind)
+        with self._lock:
+            if self._store.get_user_version(user_id) != version:
+                return
+            
+            self._entries[key] = (version, time.monotonic(), payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+    
+    def invalidate(self, user_id):
+        """사용자 항목 제거 (DataStore 변경 알림)"""
+        with self._lock:
+            for kind in self.KINDS:
+                if self._entries.pop((user_id, kind), None) is not None:
+                    self.stats['invalidations'] += 1
+    
+    def get_stats(self):
+        """캐시 통계 조회 (크기 조정용)"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['entries'] = len(self._entries)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        return stats
+
+class IdempotencyStore:
+    """Idempotency-Key 요청 지문 -> 저장된 응답 캐시 (크기/TTL 제한)
+
+    같은 사용자가 같은 키로 다시 보낸 요청은 처음 응답을 그대로 돌려주고
+    이체/음성 처리를 다시 하지 않습니다. 처음 요청이 처리 중이면 '처리 중'으로
+    표시해 두어 동시에 도착한 재시도도 한 번만 실행됩니다. 항목은 생성 순서로
+    보관하므로 만료/초과 항목은 앞에서부터 제거합니다 (프로세스 메모리에만 보관).
+    """
+    
+    def __init__(self, max_entries=10000, ttl=86400):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # (user_id, key) -> {'fingerprint', 'created', 'response'}
+        self._lock = threading.Lock()
+        self.stats = {
+            'executed': 0,
+            'replayed': 0,
+            'in_progress': 0,
+            'mismatches': 0,
+            'evictions': 0
+        }
+    
+    @staticmethod
+    def fingerprint(req):
+        """요청 지문 (메서드, 경로, 본문 해시)
+
+        multipart 요청은 재시도마다 boundary가 바뀌므로 원본 본문 대신
+        폼 필드와 업로드 파일 내용으로 계산합니다.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f'{req.method} {req.path}\n'.encode())
+        if req.mimetype == 'multipart/form-data':
+            for name, value in sorted(req.form.items(multi=True)):
+                digest.update(f'{name}={value}\n'.encode())
+            for name, upload in sorted(req.files.items(multi=True), key=lambda item: item[0]):
+                digest.update(f'{name}:{upload.filename}\n'.encode())
+                for chunk in iter(lambda: upload.stream.read(65536), b''):
+                    digest.update(chunk)
+                upload.stream.seek(0)
+        else:
+            digest.update(req.get_data(cache=True))
+        return digest.hexdigest()
+    
+    def _purge(self, now):
+        """만료/초과 항목 제거 - 처리 중인 항목(응답 없음)은 제거하지 않음
+        
+        처리 중인 항목을 지우면 같은 키의 재시도가 다시 실행되므로, 앞쪽의
+        처리 중 항목은 건너뛰고 완료된 항목만 제거합니다.
+        """
+        excess = len(self._entries) - self.max_entries
+        evicted = []
+        for entry_key, entry in self._entries.items():
+            if excess <= 0 and now - entry['created'] <= self.ttl:
+                break
+            if entry['response'] is not None:
+                evicted.append(entry_key)
+                excess -= 1
+        
+        for entry_key in evicted:
+            del self._entries[entry_key]
+        self.stats['evictions'] += len(evicted)
+    
+    def begin(self, user_id, key, fingerprint):
+        """요청 시작 - ('execute', None), ('replay', 응답), ('in_progress', None), ('mismatch', None)"""
+        now = time.monotonic()
+        with self._lock:
+            self._purge(now)
+            entry = self._entries.get((user_id, key))
+            if entry is None:
+                self._entries[(user_id, key)] = {'fingerprint': fingerprint, 'created': now, 'response': None}
+                self.stats['executed'] += 1
+                return 'execute', None
+            
+            if entry['fingerprint'] != fingerprint:
+                self.stats['mismatches'] += 1
+                return 'mismatch', None
+            if entry['response'] is None:
+                self.stats['in_progress'] += 1
+                return 'in_progress', None
+            
+            self.stats['replayed'] += 1
+            return 'replay', entry['response']
+    
+    def finish(self, user_id, key, response=None):
+        """요청 완료 - 응답 (status, body, mimetype) 저장, None이면 키 해제 (재시도 시 다시 실행)"""
+        with self._lock:
+            entry = self._entries.get((user_id, key))
+            if entry is None:
+                return
+            if response is None:
+                del self._entries[(user_id, key)]
+            else:
+                entry['response'] = response
+    
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats['entries'] = len(self._entries)
+        return stats
+
+class EventBroker:
+    """사용자별 잔액/거래 변경 이벤트 pub/sub
+
+    DataStore 변경 리스너로 구독자가 있는 사용자에게만 이벤트를 발행합니다.
+    구독자별 큐나 스레드 없이 사용자별 최근 이벤트 버퍼(순번 포함) 하나를
+    공유하고, 구독자는 마지막으로 받은 순번만 기억합니다. 발행은 해당 사용자의
+    Condition만 깨우므로 대기 중인 구독자 수와 무관하게 O(영향받는 사용자 수).
+    이벤트 내용(Swift 형식)은 잠금 밖에서 전달 시점에 만듭니다.
+
+    대기 방식은 두 가지입니다.
+    - wait(): threading.Condition 대기. Flask의 /api/events/*가 사용하며 연결마다
+      요청 스레드 하나를 점유하므로, 다른 API의 스레드를 모두 차지하지 않도록
+      max_waiters개까지만 허용합니다 (넘치면 SSE는 거절, long-poll은 즉시 응답).
+    - subscribe(waker) + poll(): 스레드 없는 대기. AsyncEventServer가 연결마다 깨우기
+      콜백을 등록하고 코루틴으로 기다리므로 대기 연결 수가 스레드 수와 무관합니다.
+    """
+    
+    def __init__(self, store, buffer_size=100, idle_ttl=60, max_waiters=32):
+        self._store = store
+        self.buffer_size = buffer_size
+        self.idle_ttl = idle_ttl
+        self.max_waiters = max_waiters
+        self._waiters = threading.BoundedSemaphore(max_waiters)
+        self._lock = threading.Lock()
+        self._channels = {}  # user_id -> {'events': deque[(seq, event)], 'floor', 'condition', 'wakers', 'subscribers', 'idle_since'}
+        self._next_seq = 1
+        self._last_sweep = time.monotonic()
+        self.stats = {
+            'published': 0,
+            'delivered': 0,
+            'resyncs': 0,
+            'waiting': 0,
+            'waiter_rejections': 0  # 대기 슬롯이 없어 거절/즉시 응답한 연결 수
+        }
+        store.add_write_listener(self._on_write)
+    
+    # ---------- 발행 (data_lock 안에서 호출) ----------
+    
+    def _on_write(self, op, args):
+        if op in ('create_transaction', 'transfer', 'prepare_transfer'):
+            transaction = args[0]
+            self._publish_transaction(transaction['id'], transaction['sender_id'], transaction['recipient_id'])
+        elif op in ('update_transaction_status', 'complete_transaction'):
+            transaction = self._store.transactions.get(args[0])
+            if transaction is not None:
+                self._publish_transaction(transaction['id'], transaction['sender_id'], transaction['recipient_id'])
+        
+        if op in ('transfer', 'complete_transaction'):
+            for account_id, new_balance in args[-1]:
+                self._publish_balance(account_id, new_balance)
+        elif op == 'update_account_balance':
+            self._publish_balance(*args)
+    
+    def _publish_transaction(self, transaction_id, sender_id, recipient_id):
+        for user_id in {sender_id, recipient_id}:
+            self.publish(user_id, ('transaction', transaction_id))
+    
+    def _publish_balance(self, account_id, new_balance):
+        account = self._store.accounts.get(account_id)
+        if account is not None:
+            self.publish(account['user_id'], ('balance', account_id, new_balance))
+    
+    def publish(self, user_id, event):
+        """이벤트 발행 (구독자가 없는 사용자는 무시)"""
+        with self._lock:
+            channel = self._channels.get(user_id)
+            if channel is None:
+                return
+            
+            events = channel['events']
+            if len(events) == events.maxlen:
+                # 가장 오래된 이벤트가 밀려나면 그 이전 순번부터는 이어받기 불가
+                channel['floor'] = events[0][0]
+            events.append((self._next_seq, event))
+            self._next_seq += 1
+            self.stats['published'] += 1
+            channel['condition'].notify_all()
+            for waker in channel['wakers']:
+                waker()
+    
+    # ---------- 구독 ----------
+    
+    def subscribe(self, user_id, waker=None):
+        """구독 시작 - 현재 마지막 순번 반환 (이후 이벤트부터 수신)
+
+        waker를 주면 이벤트 발행 시 호출합니다 (스레드 없는 대기용). 발행 잠금 안에서
+        호출되므로 이벤트 루프에 알리기만 하고 바로 반환해야 합니다
+        (예: loop.call_soon_threadsafe). 종료 시 unsubscribe에 같은 waker를 넘깁니다.
+        """
+        with self._lock:
+            channel = self._channels.get(user_id)
+            if channel is None:
+                channel = {
+                    'events': deque(maxlen=self.buffer_size),
+                    'floor': self._next_seq - 1,  # 이 순번 이후 이벤트만 보관됨
+                    'condition': threading.Condition(self._lock),
+                    'wakers': set(),  # 스레드 없는 대기자의 깨우기 콜백 (잠금 안에서 호출되므로 즉시 반환해야 함)
+                    'subscribers': 0,
+                    'idle_since': None
+                }
+                self._channels[user_id] = channel
+            channel['subscribers'] += 1
+            channel['idle_since'] = None
+            if waker is not None:
+                channel['wakers'].add(waker)
+            return self._next_seq - 1
+    
+    def unsubscribe(self, user_id, waker=None):
+        """구독 종료 - 버퍼는 idle_ttl 동안 유지해 다음 long-poll/재연결이 이어받게 함"""
+        with self._lock:
+            channel = self._channels.get(user_id)
+            if channel is None:
+                return
+            channel['subscribers'] -= 1
+            channel['wakers'].discard(waker)
+            now = time.monotonic()
+            if channel['subscribers'] <= 0:
+                channel['idle_since'] = now
+            
+            if now - self._last_sweep >= self.idle_ttl:
+                self._last_sweep = now
+                expired = [
+                    idle_user_id for idle_user_id, idle_channel in self._channels.items()
+                    if idle_channel['idle_since'] is not None and now - idle_channel['idle_since'] >= self.idle_ttl
+                ]
+                for idle_user_id in expired:
+                    del self._channels[idle_user_id]
+    
+    def acquire_waiter(self):
+        """대기 슬롯 확보 (요청 스레드를 붙잡아도 되는지) - 실패 시 False"""
+        if not self._waiters.acquire(blocking=False):
+            with self._lock:
+                self.stats['waiter_rejections'] += 1
+            return False
+        with self._lock:
+            self.stats['waiting'] += 1
+        return True
+    
+    def release_waiter(self):
+        with self._lock:
+            self.stats['waiting'] -= 1
+        self._waiters.release()
+    
+    def wait(self, user_id, after_seq, timeout):
+        """after_seq 이후 이벤트를 최대 timeout초 대기 후 반환
+
+        반환값: (이벤트 목록, 마지막 순번, 재동기화 필요 여부). 요청한 순번이 버퍼에서
+        이미 밀려났으면 누락이 있으므로 재동기화(전체 재조회)가 필요합니다.
+        """
+        with self._lock:
+            channel = self._channels[user_id]
+            events = channel['events']
+            if timeout > 0 and (not events or events[-1][0] <= after_seq):
+                channel['condition'].wait(timeout)
+            return self._collect(channel, after_seq)
+    
+    def poll(self, user_id, after_seq):
+        """after_seq 이후 이벤트를 기다리지 않고 반환 (반환값은 wait와 같음)"""
+        with self._lock:
+            return self._collect(self._channels[user_id], after_seq)
+    
+    def _collect(self, channel, after_seq):
+        # self._lock 안에서 호출
+        if after_seq < channel['floor']:
+            self.stats['resyncs'] += 1
+            return [], self._next_seq - 1, True
+        
+        pending = [(seq, event) for seq, event in channel['events'] if seq > after_seq]
+        self.stats['delivered'] += len(pending)
+        return pending, (pending[-1][0] if pending else after_seq), False
+    
+    def render(self, user_id, event):
+        """이벤트를 Swift 응답 형식으로 변환 (잠금 밖에서 호출)"""
+        if event[0] == 'transaction':
+            transaction = self._store.transactions[event[1]]
+            return {'type': 'transaction', 'transaction': format_transaction_for_swift(transaction, user_id)}
+        
+        _, account_id, balance = event
+        account = self._store.accounts[account_id]
+        return {
+            'type': 'balance',
+            'account': {
+                'accountId': account_id,
+                'accountNumber': mask_account_number(account['account_number']),
+                'balance': balance,
+                'balanceFormatted': format_currency(balance)
             }
+        }
+    
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats['channels'] = len(self._channels)
+            stats['subscribers'] = sum(channel['subscribers'] for channel in self._channels.values())
+        stats['max_waiters'] = self.max_waiters
+        return stats
+
+class AsyncEventServer:
+    """스레드 없는 이벤트 전용 HTTP 서버 (대량 SSE/long-poll 연결용)
+    
+    Flask(WSGI)의 /api/events/*는 대기 연결마다 요청 스레드를 점유하므로, 대기
+    연결이 많은 이벤트 구독은 별도 포트의 asyncio 서버가 스레드 하나로 처리합니다.
+    연결마다 asyncio.Event 하나를 EventBroker에 깨우기 콜백으로 등록하고 코루틴으로
+    기다리며, 발행 시 해당 사용자의 연결만 loop.call_soon_threadsafe로 깨웁니다.
+    경로, 인증(JWT Bearer), 응답 형식은 Flask의 /api/events/stream, /api/events/poll과 같습니다.
+    """
+    
+    HEADER_TIMEOUT = 10  # 요청 헤더 수신 제한 시간 (초)
+    HEADER_LIMIT = 16 * 1024  # 요청 헤더 최대 크기 (바이트)
+    REASONS = {
+        200: 'OK',
+        204: 'No Content',
+        400: 'Bad Request',
+        401: 'Unauthorized',
+        404: 'Not Found',
+        503: 'Service Unavailable'
+    }
+    
+    def __init__(self, broker, max_connections=50000):
+        self._broker = broker
+        self.max_connections = max_connections
+        self.port = None
+        self._loop = None
+        self._server = None
+        self._thread = None
+        self._ready = threading.Event()
+        self._error = None
+        self._active = 0  # 이벤트 루프 스레드에서만 변경
+        self.stats = {
+            'connections': 0,
+            'streams': 0,
+            'polls': 0,
+            'rejected': 0,  # 연결 상한 초과로 거절
+            'unauthorized': 0
+        }
+    
+    # ---------- 시작/종료 ----------
+    
+    def start(self, host, port):
+        """별도 스레드에서 이벤트 루프 시작 - 바인딩이 끝나면 실제 포트 반환"""
+        self._ready.clear()
+        self._error = None
+        self._thread = threading.Thread(target=self._run, args=(host, port), name='async-event-server', daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            raise self._error
+        return self.port
+    
+    def _run(self, host, port):
+        loop = asyncio.new_event_loop()
+        try:
+            self._server = loop.run_until_complete(
+                asyncio.start_server(self._handle, host, port, limit=self.HEADER_LIMIT)
+            )
+        except OSError as e:
+            self._error = e
+            loop.close()
+            self._ready.set()
+            return
+        
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._loop = loop
+        self._ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+    
+    def stop(self, timeout=5):
+        """열린 연결을 모두 끊고 이벤트 루프 종료"""
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result(timeout)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout)
+        self._loop = None
+    
+    async def _shutdown(self):
+        self._server.close()
+        current = asyncio.current_task()
+        tasks = [task for task in asyncio.all_tasks() if task is not current]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    
+    # ---------- 요청 처리 ----------
+    
+    async def _handle(self, reader, writer):
+        self._active += 1
+        self.stats['connections'] += 1
+        try:
+            try:
+                head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), self.HEADER_TIMEOUT)
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError, ConnectionError):
+                return
+            
+            request_line, *header_lines = head.decode('latin-1').split('\r\n')
+            parts = request_line.split(' ')
+            if len(parts) != 3:
+                await self._send_json(writer, 400, {'error': '잘못된 요청입니다.', 'success': False})
+                return
+            method, target, _ = parts
+            headers = {}
+            for line in header_lines:
+                name, sep, value = line.partition(':')
+                if sep:
+                    headers[name.strip().lower()] = value.strip()
+            path, _, query = target.partition('?')
+            args = {name: values[-1] for name, values in parse_qs(query).items()}
+            
+            if method == 'OPTIONS':
+                # CORS preflight (Flask 쪽 CORS(app)와 같이 모든 출처 허용)
+                await self._send(writer, 204, {
+                    'Access-Control-Allow-Methods': 'GET, OPTIONS',
+                    'Access-Control-Allow-Headers': headers.get('access-control-request-headers', 'Authorization, Last-Event-ID'),
+                    'Access-Control-Max-Age': '600'
+                })
+                return
+            if method != 'GET' or path not in ('/api/events/stream', '/api/events/poll'):
+                await self._send_json(writer, 404, {'error': '요청한 리소스를 찾을 수 없습니다.', 'success': False})
+                return
+            
+            if self._active > self.max_connections:
+                self.stats['rejected'] += 1
+                await self._send_json(writer, 503, {
+                    'error': '이벤트 연결이 많습니다. 잠시 후 다시 연결해주세요.',
+                    'success': False
+                }, {'Retry-After': str(app.config['EVENT_STREAM_HEARTBEAT'])})
+                return
+            
+            user_id = self._authenticate(headers.get('authorization'))
+            if user_id is None:
+                self.stats['unauthorized'] += 1
+                await self._send_json(writer, 401, {'error': '인증이 필요합니다.', 'success': False})
+                return
+            
+            if path == '/api/events/stream':
+                self.stats['streams'] += 1
+                await self._stream(writer, user_id, _parse_number(headers.get('last-event-id'), int))
+            else:
+                self.stats['polls'] += 1
+                await self._poll(writer, user_id, args)
+        
+        except ConnectionError:
+            pass
+        except Exception as e:
+            logger.error(f"이벤트 서버 요청 처리 오류: {str(e)}")
+        finally:
+            self._active -= 1
+            writer.close()
+    
+    def _authenticate(self, authorization):
+        """Authorization: Bearer <access token> 검증 후 사용자 ID 반환 (실패 시 None)"""
+        if not authorization or not authorization.startswith('Bearer '):
+            return None
+        try:
+            with app.app_context():
+                decoded = decode_token(authorization[len('Bearer '):].strip())
+                identity_claim = app.config['JWT_IDENTITY_CLAIM']
+            if decoded.get('type') != 'access':
+                return None
+            return int(decoded[identity_claim])
+        except Exception:
+            return None
     
-    def _extract_amount(self, text):
-        """텍스트에서 금액 추출"""
-        # 숫자 + 단위 패턴 (예: "10만원", "5천원")
-        amount_patterns = [
-            r'(\d+)\s*만\s*원',
-            r'(\d+)\s*천\s*원',
-            r'(\d+)\s*원',
-            r'(\d+)\s*만',
-            r'(\d+)\s*천',
-        ]
+    async def _stream(self, writer, user_id, last_event_id):
+        """SSE - Flask stream_events와 같은 프레임 (ready, resync, keep-alive, 이벤트)"""
+        loop = asyncio.get_running_loop()
+        heartbeat = app.config['EVENT_STREAM_HEARTBEAT']
+        deadline = loop.time() + app.config['EVENT_STREAM_MAX_DURATION']
         
-        for pattern in amount_patterns:
-            match = re.search(pattern, text)
-            if match:
-                number = int(match.group(1))
-                
-                if '만' in pattern:
-                    return number * 10000
-                elif '천' in pattern:
-                    return number * 1000
+        wake = asyncio.Event()
+        waker = partial(loop.call_soon_threadsafe, wake.set)
+        current_seq = self._broker.subscribe(user_id, waker)
+        seq = last_event_id if last_event_id is not None else current_seq
+        try:
+            writer.write(self._head(200, {
+                'Content-Type': 'text/event-stream; charset=utf-8',
+                'Cache-Control': 'no-cache',
+                'X-Accel-Buffering': 'no'
+            }))
+            writer.write(f"retry: 3000\nid: {seq}\nevent: ready\ndata: {{}}\n\n".encode('utf-8'))
+            await writer.drain()
+            
+            while loop.time() < deadline:
+                # 확인 전에 지워야 확인과 대기 사이에 발행된 이벤트를 놓치지 않음
+                wake.clear()
+                events, seq, resync = self._broker.poll(user_id, seq)
+                if resync:
+                    writer.write(f"id: {seq}\nevent: resync\ndata: {{}}\n\n".encode('utf-8'))
+                elif not events:
+                    try:
+                        await asyncio.wait_for(wake.wait(), min(heartbeat, max(deadline - loop.time(), 0)))
+                        continue
+                    except asyncio.TimeoutError:
+                        writer.write(b": keep-alive\n\n")
                 else:
-                    return number
+                    for event_seq, event in events:
+                        payload = app.json.dumps(self._broker.render(user_id, event))
+                        writer.write(f"id: {event_seq}\nevent: {event[0]}\ndata: {payload}\n\n".encode('utf-8'))
+                await writer.drain()
+        finally:
+            self._broker.unsubscribe(user_id, waker)
+    
+    async def _poll(self, writer, user_id, args):
+        """long-poll - Flask poll_events와 같은 인자(after, timeout)와 응답 형식"""
+        loop = asyncio.get_running_loop()
+        after_seq = _parse_number(args.get('after'), int)
+        max_timeout = app.config['EVENT_POLL_MAX_TIMEOUT']
+        timeout = _parse_number(args.get('timeout'), float)
+        timeout = max_timeout if timeout is None else min(timeout, max_timeout)
+        
+        wake = asyncio.Event()
+        waker = partial(loop.call_soon_threadsafe, wake.set)
+        current_seq = self._broker.subscribe(user_id, waker)
+        try:
+            if after_seq is None:
+                events, last_seq, resync = [], current_seq, False
+            else:
+                deadline = loop.time() + timeout
+                while True:
+                    wake.clear()
+                    events, last_seq, resync = self._broker.poll(user_id, after_seq)
+                    remaining = deadline - loop.time()
+                    if events or resync or remaining <= 0:
+                        break
+                    try:
+                        await asyncio.wait_for(wake.wait(), remaining)
+                    except asyncio.TimeoutError:
+                        pass
+        finally:
+            self._broker.unsubscribe(user_id, waker)
         
+        await self._send_json(writer, 200, {
+            'events': [
+                {'id': event_seq, **self._broker.render(user_id, event)}
+                for event_seq, event in events
+            ],
+            'lastEventId': last_seq,
+            'resync': resync,
+            'success': True
+        })
+    
+    # ---------- 응답 ----------
+    
+    def _head(self, status, headers):
+        lines = [f"HTTP/1.1 {status} {self.REASONS[status]}"]
+        for name, value in {'Access-Control-Allow-Origin': '*', 'Connection': 'close', **headers}.items():
+            lines.append(f"{name}: {value}")
+        return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+    
+    async def _send(self, writer, status, headers, body=b''):
+        writer.write(self._head(status, {**headers, 'Content-Length': str(len(body))}) + body)
+        await writer.drain()
+    
+    async def _send_json(self, writer, status, payload, headers=None):
+        body = app.json.dumps(payload).encode('utf-8')
+        await self._send(writer, status, {'Content-Type': 'application/json', **(headers or {})}, body)
+    
+    def get_stats(self):
+        stats = dict(self.stats)
+        stats['active'] = self._active
+        stats['max_connections'] = self.max_connections
+        stats['port'] = self.port if self._loop is not None else None
+        return stats
+
+def _parse_number(value, number_type):
+    """쿼리/헤더 값을 숫자로 변환 (없거나 형식이 틀리면 None - request.args.get(type=...)과 같음)"""
+    if value is None:
+        return None
+    try:
+        return number_type(value)
+    except ValueError:
         return None
 
-# 서비스 인스턴스 생성
-voice_auth = VoiceAuthenticator()
-nlp_service = NLPService()
+class TransferHoldSweeper:
+    """만료된 이체 보류를 해제하는 백그라운드 처리기
 
-# ========================= 추가 유틸리티 함수 =========================
+    DataStore 변경 리스너로 준비된 이체의 만료 시각을 최소 힙에 넣고, 스레드
+    하나가 가장 이른 만료 시각까지 대기했다가 expire_transaction을 호출합니다.
+    그사이 확인된 거래는 expire_transaction이 건너뛰므로 힙에서 따로 지우지 않습니다.
+    """
+    
+    def __init__(self, store):
+        self._store = store
+        self._heap = []  # (만료 시각 timestamp, transaction_id)
+        self._condition = threading.Condition()
+        self._thread = None
+        self.stats = {
+            'scheduled': 0,
+            'expired': 0,
+            'failed': 0
+        }
+        store.add_write_listener(self._on_write)
+    
+    def _on_write(self, op, args):
+        if op == 'prepare_transfer':
+            transaction, hold = args
+            self.schedule(transaction['id'], hold['expires_at'])
+    
+    def schedule(self, transaction_id, expires_at):
+        """만료 처리 예약 (처리 스레드는 첫 보류가 생길 때 시작)"""
+        with self._condition:
+            heapq.heappush(self._heap, (expires_at.timestamp(), transaction_id))
+            self.stats['scheduled'] += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='transfer-hold-sweeper', daemon=True)
+                self._thread.start()
+            if self._heap[0][1] == transaction_id:
+                self._condition.notify()
+    
+    def start(self):
+        """복구된 보류 등록"""
+        for expires_at, transaction_id in self._store.get_transfer_holds():
+            self.schedule(transaction_id, expires_at)
+    
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._heap or self._heap[0][0] > time.time():
+                    self._condition.wait(self._heap[0][0] - time.time() if self._heap else None)
+                _, transaction_id = heapq.heappop(self._heap)
+            
+            try:
+                if self._store.expire_transaction(transaction_id):
+                    self.stats['expired'] += 1
+                    logger.info(f"이체 보류 만료 - 거래 ID: {transaction_id}")
+            except Exception as e:
+                self.stats['failed'] += 1
+                logger.error(f"이체 보류 만료 처리 오류 (거래 ID: {transaction_id}): {str(e)}")
+    
+    def get_stats(self):
+        with self._condition:
+            stats = dict(self.stats)
+            stats['queued'] = len(self._heap)
+        stats['activeHolds'] = len(self._store.transfer_holds)
+        return stats
 
-def find_account_by_user_info(recipient_name):
-    """수취인 이름으로 계좌 찾기"""
-    user = data_store.get_user_by_username(recipient_name)
-    if user:
-        accounts = data_store.get_user_accounts(user['id'])
-        if accounts:
-            return accounts[0]  # 첫 번째 활성 계좌 반환
-    return None
+swift_view_cache = SwiftViewCache(data_store, app.config['TRANSACTION_VIEW_CACHE_SIZE'])
+read_model_cache = ReadModelCache(
+    data_store,
+    max_entries=app.config['READ_MODEL_CACHE_SIZE'],
+    ttl=app.config['READ_MODEL_CACHE_TTL']
+)
+event_broker = EventBroker(
+    data_store,
+    buffer_size=app.config['EVENT_BUFFER_SIZE'],
+    idle_ttl=app.config['EVENT_CHANNEL_IDLE_TTL'],
+    max_waiters=app.config['EVENT_MAX_WAITERS']
+)
+event_server = AsyncEventServer(event_broker, max_connections=app.config['EVENT_SERVER_MAX_CONNECTIONS'])
+transfer_hold_sweeper = TransferHoldSweeper(data_store)
+idempotency_store = IdempotencyStore(
+    max_entries=app.config['IDEMPOTENCY_CACHE_SIZE'],
+    ttl=app.config['IDEMPOTENCY_KEY_TTL']
+)
+transfer_hold_sweeper.start()
+
+_IDEMPOTENT_COMMIT_OPS = frozenset({
+    'create_transaction', 'update_account_balance', 'transfer', 'prepare_transfer', 'complete_transaction'
+})
+
+def _mark_idempotent_commit(op, args):
+    """요청 스레드에서 잔액/거래 변경이 반영되면 표시 (idempotent 응답 저장 판단용)"""
+    if op in _IDEMPOTENT_COMMIT_OPS and has_request_context():
+        g.idempotent_committed = True
+
+data_store.add_write_listener(_mark_idempotent_commit)
 
 def format_account_for_swift(account, user):
     """Swift Account 구조체 형식으로 계좌 정보 포맷팅"""
-    return {
-        'id': account['id'],
-        'accountNumber': account['account_number'],
-        'accountType': account['account_type'],
-        'accountTypeName': get_account_type_name(account['account_type']),
-        'balance': account['balance'],
-        'balanceFormatted': format_currency(account['balance']),
-        'ownerName': user['username'],
-        'bankName': '신한은행',
-        'bankCode': 'SH',
-        'maskedAccountNumber': mask_account_number(account['account_number']),
-        'isActive': account['is_active'],
-        'createdAt': account['created_at'].isoformat()
-    }
+    return swift_view_cache.account(account, user)
 
 def format_transaction_for_swift(transaction, user_id):
     """Swift Transaction 구조체 형식으로 거래 정보 포맷팅"""
-    # 송금/입금 구분
-    is_outgoing = transaction['sender_id'] == user_id
-    
-    # 상대방 정보 조회
-    other_user_id = transaction['recipient_id'] if is_outgoing else transaction['sender_id']
-    other_user = data_store.users.get(other_user_id, {})
-    
-    return {
-        'id': transaction['id'],
-        'amount': transaction['amount'],
-        'amountFormatted': format_currency(transaction['amount']),
-        'fee': transaction['fee'],
-        'feeFormatted': format_currency(transaction['fee']),
-        'type': 'outgoing' if is_outgoing else 'incoming',
-        'typeName': '송금' if is_outgoing else '입금',
-        'otherPartyName': other_user.get('username', '알 수 없음'),
-        'description': transaction['description'],
-        'status': transaction['status'],
-        'statusName': {
-            'pending': '처리중',
-            'completed': '완료',
-            'failed': '실패'
-        }.get(transaction['status'], transaction['status']),
-        'transactionDate': transaction['created_at'].isoformat(),
-        'completedDate': transaction['completed_at'].isoformat() if transaction['completed_at'] else None,
-        'bankName': '신한은행'
-    }
+    return swift_view_cache.transaction(transaction, user_id)
 
 def create_transfer_result_for_swift(success, message, transaction_id=None):
     """Swift TransferResult 구조체 형식으로 이체 결과 생성"""
@@ -588,12 +3443,113 @@ def create_transfer_result_for_swift(success, message, transaction_id=None):
     
     return result
 
+def parse_date_param(value, end_of_day=False):
+    """조회 기간 파라미터 파싱 (YYYY-MM-DD 또는 ISO 8601, 시간대 없으면 UTC)
+
+    날짜만 주어진 종료일(to)은 그날 전체를 포함하도록 다음 날 0시를 반환합니다.
+    """
+    if not value:
+        return None
+    
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    if end_of_day and len(value) == 10:
+        parsed += timedelta(days=1)
+    return parsed
+
+def user_etag(user_id, version):
+    """사용자 데이터 버전 기반 ETag 값 (조회 엔드포인트 공용)"""
+    return f"{data_store.version_epoch}-{user_id}-{version}"
+
+def not_modified_response(etag):
+    """If-None-Match가 현재 ETag와 같으면 304 응답, 아니면 None"""
+    if request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+        return with_etag(response, etag)
+    return None
+
+def with_etag(response, etag):
+    """응답에 약한 ETag 설정 (클라이언트는 매번 재검증)"""
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+def admin_required(fn):
+    """관리자 권한 확인 데코레이터 (jwt_required 다음에 적용)
+
+    관리자 사용자이면서 X-Admin-Key 헤더가 ADMIN_API_KEY와 같아야 합니다.
+    """
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        user = data_store.users.get(int(get_jwt_identity()))
+        is_admin = user is not None and (user.get('is_admin') or user['username'] in app.config['ADMIN_USERNAMES'])
+        api_key = app.config['ADMIN_API_KEY']
+        key_valid = bool(api_key) and hmac.compare_digest(
+            request.headers.get('X-Admin-Key', '').encode(), api_key.encode()
+        )
+        if not is_admin or not user['is_active'] or not key_valid:
+            return jsonify({
+                'error': '관리자 권한이 필요합니다.',
+                'success': False
+            }), 403
+        return fn(*args, **kwargs)
+    return wrapper
+
+def idempotent(fn):
+    """Idempotency-Key 헤더 처리 데코레이터 (jwt_required 다음에 적용)
+
+    같은 키로 재시도된 요청은 저장된 응답을 돌려줍니다 (Idempotent-Replayed 헤더).
+    5xx와 429처럼 다시 시도하면 결과가 달라질 수 있는 응답은 저장하지 않습니다.
+    단, 요청 처리 중 이체/거래 변경이 반영되었으면(WAL 기록 실패 포함) 응답
+    코드와 관계없이 저장해 재시도가 돈을 다시 옮기지 않게 합니다.
+    """
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get('Idempotency-Key')
+        if key is None:
+            return fn(*args, **kwargs)
+        
+        if not key or len(key) > 255:
+            return jsonify(create_transfer_result_for_swift(
+                False, 'Idempotency-Key는 1~255자여야 합니다.'
+            )), 400
+        
+        user_id = int(get_jwt_identity())
+        fingerprint = idempotency_store.fingerprint(request)
+        state, stored = idempotency_store.begin(user_id, key, fingerprint)
+        
+        if state == 'replay':
+            status, body, mimetype = stored
+            return Response(body, status=status, mimetype=mimetype, headers={'Idempotent-Replayed': 'true'})
+        if state == 'in_progress':
+            return jsonify(create_transfer_result_for_swift(
+                False, '같은 요청을 처리하고 있습니다. 잠시 후 다시 시도해주세요.'
+            )), 409, {'Retry-After': '1'}
+        if state == 'mismatch':
+            return jsonify(create_transfer_result_for_swift(
+                False, '같은 Idempotency-Key로 다른 요청을 보낼 수 없습니다.'
+            )), 422
+        
+        stored = None
+        g.idempotent_committed = False
+        try:
+            response = app.make_response(fn(*args, **kwargs))
+            # 이체가 반영된 뒤의 응답은 5xx여도 저장 (재시도 시 다시 이체되지 않도록)
+            if g.idempotent_committed or (response.status_code < 500 and response.status_code != 429):
+                stored = (response.status_code, response.get_data(), response.mimetype)
+            return response
+        finally:
+            idempotency_store.finish(user_id, key, stored)
+    return wrapper
+
 def parse_transfer_request_from_swift(data):
     """Swift TransferRequest에서 이체 정보 파싱"""
     return {
         'recipient_name': data.get('recipientName'),
         'amount': data.get('amount'),
         'from_account': data.get('fromAccount'),
+        'recipient_account': data.get('recipientAccount'),
         'memo': data.get('memo'),
         'voice_authentication_score': data.get('voiceAuthenticationScore')
     }
@@ -676,6 +3632,17 @@ def get_accounts():
                 'success': False
             }), 422
         
+        # 변경이 없으면 포맷팅/인코딩 없이 304 (버전은 조회 전에 읽어 변경 누락 방지)
+        version = data_store.get_user_version(user_id)
+        etag = user_etag(user_id, version)
+        cached = not_modified_response(etag)
+        if cached:
+            return cached
+        
+        payload = read_model_cache.get(user_id, 'accounts', version)
+        if payload is not None:
+            return with_etag(jsonify(payload), etag)
+        
         user = data_store.users.get(user_id)
         
         if not user:
@@ -694,11 +3661,14 @@ def get_accounts():
             swift_account = format_account_for_swift(account, user)
             swift_accounts.append(swift_account)
         
-        return jsonify({
+        payload = {
             'accounts': swift_accounts,
             'count': len(swift_accounts),
             'success': True
-        })
+        }
+        read_model_cache.put(user_id, 'accounts', version, payload)
+        
+        return with_etag(jsonify(payload), etag)
         
     except Exception as e:
         logger.error(f"계좌 목록 조회 오류: {str(e)}")
@@ -716,6 +3686,17 @@ def get_account_balance():
     try:
         user_id_str = get_jwt_identity()
         user_id = int(user_id_str)
+        
+        version = data_store.get_user_version(user_id)
+        etag = user_etag(user_id, version)
+        cached = not_modified_response(etag)
+        if cached:
+            return cached
+        
+        payload = read_model_cache.get(user_id, 'balance', version)
+        if payload is not None:
+            return with_etag(jsonify(payload), etag)
+        
         user = data_store.users.get(user_id)
         
         if not user:
@@ -723,196 +3704,647 @@ def get_account_balance():
         
         accounts = data_store.get_user_accounts(user_id)
         
-        if not accounts:
-            return jsonify({'error': '계좌를 찾을 수 없습니다.'}), 404
+        if not accounts:
+            return jsonify({'error': '계좌를 찾을 수 없습니다.'}), 404
+        
+        # 모든 계좌의 잔액 정보 반환
+        account_balances = []
+        total_balance = 0
+        
+        for account in accounts:
+            balance_info = {
+                'accountId': account['id'],
+                'accountNumber': mask_account_number(account['account_number']),
+                'accountType': get_account_type_name(account['account_type']),
+                'balance': account['balance'],
+                'balanceFormatted': format_currency(account['balance'])
+            }
+            account_balances.append(balance_info)
+            total_balance += account['balance']
+        
+        payload = {
+            'accountBalances': account_balances,
+            'totalBalance': total_balance,
+            'totalBalanceFormatted': format_currency(total_balance),
+            'success': True
+        }
+        read_model_cache.put(user_id, 'balance', version, payload)
+        
+        return with_etag(jsonify(payload), etag)
+        
+    except Exception as e:
+        logger.error(f"잔액 조회 오류: {str(e)}")
+        return jsonify({
+            'error': '잔액 조회 중 오류가 발생했습니다.',
+            'success': False
+        }), 500
+
+@app.route('/api/transactions', methods=['GET'])
+@jwt_required()
+def get_transactions():
+    """사용자 거래 내역 조회"""
+    try:
+        user_id_str = get_jwt_identity()
+        user_id = int(user_id_str)
+        
+        etag = user_etag(user_id, data_store.get_user_version(user_id))
+        cached = not_modified_response(etag)
+        if cached:
+            return cached
+        
+        # 한 페이지 건수 (1 이상 정수, 최대 TRANSACTIONS_PAGE_MAX_LIMIT - 생략 시 최대값)
+        max_limit = app.config['TRANSACTIONS_PAGE_MAX_LIMIT']
+        limit = request.args.get('limit')
+        if limit is None:
+            limit = max_limit
+        else:
+            limit = int(limit) if limit.isdecimal() else 0
+            if limit <= 0:
+                return jsonify({
+                    'error': 'limit은 1 이상의 정수여야 합니다.',
+                    'success': False
+                }), 400
+            limit = min(limit, max_limit)
+        
+        # 페이지 커서 (이전 응답의 nextCursor 또는 before_id)
+        before_id = request.args.get('cursor') or request.args.get('before_id')
+        direction = request.args.get('direction', 'all')
+        
+        if direction not in ('all', 'incoming', 'outgoing'):
+            return jsonify({
+                'error': 'direction은 all, incoming, outgoing 중 하나여야 합니다.',
+                'success': False
+            }), 400
+        
+        try:
+            before_id = int(before_id) if before_id else None
+            start_time = parse_date_param(request.args.get('from'))
+            end_time = parse_date_param(request.args.get('to'), end_of_day=True)
+        except ValueError:
+            return jsonify({
+                'error': '잘못된 조회 조건입니다. (cursor는 거래 ID, from/to는 YYYY-MM-DD 또는 ISO 8601 형식)',
+                'success': False
+            }), 400
+        
+        transactions, next_cursor = data_store.get_user_transactions_page(
+            user_id, limit,
+            before_id=before_id,
+            start_time=start_time,
+            end_time=end_time,
+            direction=direction
+        )
+        
+        # Swift Transaction 형식으로 변환
+        swift_transactions = []
+        for transaction in transactions:
+            swift_transaction = format_transaction_for_swift(transaction, user_id)
+            swift_transactions.append(swift_transaction)
+        
+        return with_etag(jsonify({
+            'transactions': swift_transactions,
+            'count': len(swift_transactions),
+            'nextCursor': str(next_cursor) if next_cursor is not None else None,
+            'hasMore': next_cursor is not None,
+            'success': True
+        }), etag)
+        
+    except Exception as e:
+        logger.error(f"거래 내역 조회 오류: {str(e)}")
+        return jsonify({
+            'error': '거래 내역 조회 중 오류가 발생했습니다.',
+            'success': False
+        }), 500
+
+@app.route('/api/events/stream', methods=['GET'])
+@jwt_required()
+def stream_events():
+    """잔액/거래 변경 이벤트 스트림 (Server-Sent Events)
+
+    재연결 시 Last-Event-ID 헤더로 이어받고, 누락이 있으면 resync 이벤트를 보냅니다.
+    연결 동안 요청 스레드 하나를 점유하므로 대기 슬롯이 없으면 503으로 거절합니다.
+    연결이 많은 배포에서는 같은 경로의 이벤트 서버(AsyncEventServer, EVENT_SERVER_PORT)를 사용합니다.
+    """
+    user_id = int(get_jwt_identity())
+    heartbeat = app.config['EVENT_STREAM_HEARTBEAT']
+    max_duration = app.config['EVENT_STREAM_MAX_DURATION']
+    
+    last_event_id = request.headers.get('Last-Event-ID', type=int)
+    
+    if not event_broker.acquire_waiter():
+        return jsonify({
+            'error': '이벤트 연결이 많습니다. 잠시 후 다시 연결하거나 /api/events/poll을 사용해주세요.',
+            'success': False
+        }), 503, {'Retry-After': str(heartbeat)}
+    
+    def generate():
+        current_seq = event_broker.subscribe(user_id)
+        seq = last_event_id if last_event_id is not None else current_seq
+        deadline = time.monotonic() + max_duration
+        try:
+            yield f"retry: 3000\nid: {seq}\nevent: ready\ndata: {{}}\n\n"
+            while time.monotonic() < deadline:
+                events, seq, resync = event_broker.wait(user_id, seq, heartbeat)
+                if resync:
+                    yield f"id: {seq}\nevent: resync\ndata: {{}}\n\n"
+                    continue
+                if not events:
+                    yield ": keep-alive\n\n"
+                    continue
+                for event_seq, event in events:
+                    payload = app.json.dumps(event_broker.render(user_id, event))
+                    yield f"id: {event_seq}\nevent: {event[0]}\ndata: {payload}\n\n"
+        finally:
+            event_broker.unsubscribe(user_id)
+    
+    response = Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+    # 본문을 읽기 전에 연결이 끊겨도 슬롯이 반환되도록 응답 종료 시 해제
+    response.call_on_close(event_broker.release_waiter)
+    return response
+
+@app.route('/api/events/poll', methods=['GET'])
+@jwt_required()
+def poll_events():
+    """잔액/거래 변경 이벤트 long-poll (SSE를 쓸 수 없는 클라이언트용)
+
+    after(마지막으로 받은 lastEventId) 이후 이벤트가 생기거나 timeout초가 지나면 응답.
+    after 없이 호출하면 현재 순번만 받아 다음 호출부터 이어받습니다.
+    대기 슬롯이 없으면 기다리지 않고 현재까지의 이벤트로 바로 응답합니다
+    (스레드를 점유하지 않는 대기는 이벤트 서버의 같은 경로 사용).
+    """
+    try:
+        user_id = int(get_jwt_identity())
+        after_seq = request.args.get('after', type=int)
+        timeout = min(
+            request.args.get('timeout', default=app.config['EVENT_POLL_MAX_TIMEOUT'], type=float),
+            app.config['EVENT_POLL_MAX_TIMEOUT']
+        )
+        
+        current_seq = event_broker.subscribe(user_id)
+        try:
+            if after_seq is None:
+                events, last_seq, resync = [], current_seq, False
+            elif timeout > 0 and event_broker.acquire_waiter():
+                try:
+                    events, last_seq, resync = event_broker.wait(user_id, after_seq, timeout)
+                finally:
+                    event_broker.release_waiter()
+            else:
+                events, last_seq, resync = event_broker.poll(user_id, after_seq)
+        finally:
+            event_broker.unsubscribe(user_id)
+        
+        return jsonify({
+            'events': [
+                {'id': event_seq, **event_broker.render(user_id, event)}
+                for event_seq, event in events
+            ],
+            'lastEventId': last_seq,
+            'resync': resync,
+            'success': True
+        })
+    
+    except Exception as e:
+        logger.error(f"이벤트 조회 오류: {str(e)}")
+        return jsonify({
+            'error': '이벤트 조회 중 오류가 발생했습니다.',
+            'success': False
+        }), 500
+
+def voice_replay_response(user_id, content_key):
+    """최근 인증에 쓰인 녹음과 같은 음성이면 거부 응답 (재전송 확인 사용 시)"""
+    if not app.config['VOICE_REPLAY_DETECTION'] or voice_feature_cache is None:
+        return None
+    if not voice_feature_cache.is_replay(content_key, app.config['VOICE_REPLAY_WINDOW']):
+        return None
+    
+    logger.warning(f"음성 재전송 의심 - 사용자 ID: {user_id}")
+    return jsonify(create_transfer_result_for_swift(
+        False, '이미 사용된 음성입니다. 다시 말씀해주세요.'
+    )), 401
+
+def prepare_voice_transfer_request(user_id, confirm=False):
+    """음성 이체 요청 공통 처리 - 업로드 음성 특성 추출 후 plan_voice_transfer
+
+    (이체 계획, None) 또는 실패 시 (None, 응답)을 반환합니다.
+    confirm: 사용자 확인 후 실행하는 이체 준비인지 (수취인 이름 보정 허용)
+    """
+    # 음성 파일 업로드 확인
+    if 'audio' not in request.files:
+        return None, (jsonify(create_transfer_result_for_swift(
+            False, '음성 파일이 필요합니다.'
+        )), 400)
+    
+    audio_file = request.files['audio']
+    transfer_text = request.form.get('text', '')
+    
+    if audio_file.filename == '':
+        return None, (jsonify(create_transfer_result_for_swift(
+            False, '파일이 선택되지 않았습니다.'
+        )), 400)
+    
+    if not allowed_file(audio_file.filename):
+        return None, (jsonify(create_transfer_result_for_swift(
+            False, '지원되지 않는 파일 형식입니다.'
+        )), 400)
+    
+    # 업로드 데이터는 메모리에서 바로 처리 (압축 형식만 임시 파일 경유)
+    audio_bytes = audio_file.read()
+    content_key = feature_extractor.content_key(audio_bytes, audio_file.filename)
+    
+    # 재전송된 녹음은 특성 추출 전에 거부 (선택)
+    replay_response = voice_replay_response(user_id, content_key)
+    if replay_response:
+        return None, replay_response
+    
+    # 1. 음성 특성 추출 (내용 해시 캐시 -> 프로세스 풀)
+    try:
+        voice_features = feature_extractor.extract(audio_bytes, audio_file.filename, key=content_key)
+    except FeatureExtractionBusyError:
+        return None, (jsonify(create_transfer_result_for_swift(
+            False, '음성 처리 요청이 많습니다. 잠시 후 다시 시도해주세요.'
+        )), 429, {'Retry-After': '1'})
+    except FeatureExtractionTimeoutError:
+        return None, (jsonify(create_transfer_result_for_swift(
+            False, '음성 처리 시간이 초과되었습니다.'
+        )), 504)
+    
+    if voice_features is None:
+        return None, (jsonify(create_transfer_result_for_swift(
+            False, '음성 처리 중 오류가 발생했습니다.'
+        )), 500)
+    
+    return plan_voice_transfer(user_id, voice_features, transfer_text, content_key, confirm)
+
+def plan_voice_transfer(user_id, voice_features, transfer_text, content_key=None, confirm=False):
+    """음성 인증, 이체 정보 추출, 계좌 확인 (업로드/스트리밍 공용)
+
+    (이체 계획, None) 또는 실패 시 (None, 응답)을 반환합니다.
+    수취인 이름 보정(STT 오인식)은 confirm=True(확인 후 실행)일 때만 하고,
+    즉시 실행이면 정확히 일치하지 않는 이름은 후보 목록과 함께 거절합니다.
+    이체 계획: {'recipient_name', 'recipient_account', 'sender_account', 'amount', 'fee'}
+    """
+    # 2. 음성 인증
+    is_authenticated, similarity = voice_auth.authenticate_voice(user_id, voice_features)
+    
+    if not is_authenticated:
+        return None, (jsonify(create_transfer_result_for_swift(
+            False, f'음성 인증에 실패했습니다. (유사도: {similarity:.2f})'
+        )), 401)
+    
+    if content_key is not None and app.config['VOICE_REPLAY_DETECTION'] and voice_feature_cache is not None:
+        voice_feature_cache.mark_authenticated(content_key)
+    
+    # 확실한 인증 성공 샘플은 프로필에 반영 (선택)
+    if app.config['VOICE_ADAPTIVE_ENROLLMENT'] and similarity >= app.config['VOICE_ADAPTIVE_MIN_SIMILARITY']:
+        data_store.update_voice_profile(
+            user_id, [voice_features], max_samples=app.config['VOICE_ADAPTIVE_MAX_SAMPLES']
+        )
+    
+    # 3. 이체 정보 추출
+    transfer_info = nlp_service.extract_transfer_info(transfer_text)
+    
+    if not transfer_info['extracted_successfully']:
+        return None, (jsonify(create_transfer_result_for_swift(
+            False, '이체 정보를 추출할 수 없습니다. 다시 말씀해주세요.'
+        )), 400)
+    
+    recipient_name = transfer_info['recipient']
+    amount = transfer_info['amount']
+    
+    # 4. 수취인 계좌 찾기 (저장된 수취인/사용자명, 확인 단계가 있으면 STT 오인식 보정)
+    candidates = resolve_recipient(user_id, recipient_name)
+    recipient = pick_recipient(candidates, allow_fuzzy=confirm)
+    if not recipient:
+        return None, recipient_not_found_response(recipient_name, candidates)
+    
+    if recipient['name'] != recipient_name:
+        logger.info(f"수취인 보정: {recipient_name} -> {recipient['name']} (거리 {recipient['distance']})")
+    
+    # 5. 송금자 계좌 조회
+    sender_accounts = data_store.get_user_accounts(user_id)
+    if not sender_accounts:
+        return None, (jsonify(create_transfer_result_for_swift(
+            False, '송금자 계좌를 찾을 수 없습니다.'
+        )), 404)
+    
+    return {
+        'recipient_name': recipient['name'],
+        'recipient_account': recipient['account'],
+        'sender_account': sender_accounts[0],
+        'amount': amount,
+        'fee': calculate_transfer_fee(amount)
+    }, None
+
+def transfer_error_response(error, total_amount):
+    """TransferError를 Swift TransferResult 오류 응답으로 변환"""
+    if error.code == 'insufficient_funds':
+        return jsonify(create_transfer_result_for_swift(
+            False, f'계좌 잔액이 부족합니다. (필요: {format_currency(total_amount)}, 이용 가능: {format_currency(error.balance)})'
+        )), 400
+    if error.code == 'expired':
+        return jsonify(create_transfer_result_for_swift(False, error.message)), 410
+    if error.code == 'not_found':
+        return jsonify(create_transfer_result_for_swift(False, error.message)), 404
+    if error.code == 'not_pending':
+        return jsonify(create_transfer_result_for_swift(False, error.message)), 409
+    return jsonify(create_transfer_result_for_swift(False, error.message)), 400
+
+def hold_voice_transfer_plan(user_id, plan):
+    """이체 계획으로 대기 거래 생성과 출금 보류 (확인 안내 응답)"""
+    recipient_name = plan['recipient_name']
+    recipient_account = plan['recipient_account']
+    amount = plan['amount']
+    fee = plan['fee']
+    
+    try:
+        result = data_store.prepare_transfer(
+            sender_id=user_id,
+            recipient_id=recipient_account['user_id'],
+            sender_account_id=plan['sender_account']['id'],
+            recipient_account_id=recipient_account['id'],
+            amount=amount,
+            fee=fee,
+            description=f"{recipient_name}에게 음성 이체",
+            ttl=app.config['TRANSFER_HOLD_TTL']
+        )
+    except TransferError as e:
+        return transfer_error_response(e, amount + fee)
+    
+    transaction_id = result['transaction_id']
+    
+    logger.info(f"음성 이체 준비 - 거래 ID: {transaction_id}, {recipient_name}에게 {format_currency(amount)}")
+    
+    response = create_transfer_result_for_swift(
+        True,
+        f'{recipient_name}님에게 {format_currency(amount)}을 보낼까요?',
+        transaction_id
+    )
+    response.update({
+        'status': 'pending',
+        'recipientName': recipient_name,
+        'recipientAccountNumber': mask_account_number(recipient_account['account_number']),
+        'expiresAt': result['expires_at'].isoformat(),
+        'availableBalance': result['available_balance'],
+        'availableBalanceFormatted': format_currency(result['available_balance'])
+    })
+    return jsonify(response)
+
+def execute_voice_transfer_plan(user_id, plan):
+    """이체 계획을 바로 실행 (잔액 확인과 출금/입금을 계좌 잠금 안에서 원자적으로 처리)"""
+    recipient_name = plan['recipient_name']
+    recipient_account = plan['recipient_account']
+    amount = plan['amount']
+    fee = plan['fee']
+    
+    try:
+        result = data_store.transfer(
+            sender_id=user_id,
+            recipient_id=recipient_account['user_id'],
+            sender_account_id=plan['sender_account']['id'],
+            recipient_account_id=recipient_account['id'],
+            amount=amount,
+            fee=fee,
+            description=f"{recipient_name}에게 음성 이체",
+            transaction_type='voice_transfer'
+        )
+    except TransferError as e:
+        return transfer_error_response(e, amount + fee)
+    
+    transaction_id = result['transaction_id']
+    
+    logger.info(f"음성 이체 완료 - 거래 ID: {transaction_id}, {recipient_name}에게 {format_currency(amount)}")
+    
+    return jsonify(create_transfer_result_for_swift(
+        True,
+        f'{recipient_name}님에게 {format_currency(amount)} 이체가 완료되었습니다.',
+        transaction_id
+    ))
+
+@app.route('/api/transfer/voice', methods=['POST'])
+@jwt_required()
+@idempotent
+def voice_transfer():
+    """음성 이체 (Swift 호환 통합 엔드포인트, 확인 단계 없이 즉시 실행)"""
+    try:
+        user_id = int(get_jwt_identity())
+        
+        plan, error_response = prepare_voice_transfer_request(user_id)
+        if error_response:
+            return error_response
+        
+        return execute_voice_transfer_plan(user_id, plan)
+                
+    except Exception as e:
+        logger.error(f"음성 이체 오류: {str(e)}")
+        return jsonify(create_transfer_result_for_swift(
+            False, '이체 처리 중 오류가 발생했습니다.'
+        )), 500
+
+@app.route('/api/transfer/voice/prepare', methods=['POST'])
+@jwt_required()
+@idempotent
+def prepare_voice_transfer():
+    """음성 이체 준비 - 인증/분석 후 대기 거래 생성과 출금 금액 보류 (확인 전 사용자에게 표시)"""
+    try:
+        user_id = int(get_jwt_identity())
+        
+        plan, error_response = prepare_voice_transfer_request(user_id, confirm=True)
+        if error_response:
+            return error_response
         
-        # 모든 계좌의 잔액 정보 반환
-        account_balances = []
-        total_balance = 0
+        return hold_voice_transfer_plan(user_id, plan)
+    
+    except Exception as e:
+        logger.error(f"음성 이체 준비 오류: {str(e)}")
+        return jsonify(create_transfer_result_for_swift(
+            False, '이체 처리 중 오류가 발생했습니다.'
+        )), 500
+
+@app.route('/api/voice/stream', methods=['POST'])
+@jwt_required()
+def start_voice_stream():
+    """청크 단위 음성 업로드 시작
+
+    format 'pcm'(기본)은 sampleRate/channels/sampleWidth로 little-endian PCM을,
+    'wav'는 헤더가 포함된 WAV 바이트를 그대로 나눠 보냅니다.
+    """
+    try:
+        user_id = int(get_jwt_identity())
+        data = request.get_json() or {}
         
-        for account in accounts:
-            balance_info = {
-                'accountId': account['id'],
-                'accountNumber': mask_account_number(account['account_number']),
-                'accountType': get_account_type_name(account['account_type']),
-                'balance': account['balance'],
-                'balanceFormatted': format_currency(account['balance'])
-            }
-            account_balances.append(balance_info)
-            total_balance += account['balance']
+        stream_id = voice_stream_store.create(
+            user_id,
+            audio_format=data.get('format', 'pcm'),
+            sample_rate=data.get('sampleRate'),
+            channels=data.get('channels', 1),
+            sample_width=data.get('sampleWidth', 2)
+        )
         
         return jsonify({
-            'accountBalances': account_balances,
-            'totalBalance': total_balance,
-            'totalBalanceFormatted': format_currency(total_balance),
+            'streamId': stream_id,
+            'nextChunkIndex': 0,
+            'maxDuration': audio_features.MAX_DURATION,
+            'idleTimeout': app.config['VOICE_STREAM_IDLE_TIMEOUT'],
             'success': True
-        })
-        
+        }), 201
+    
+    except VoiceStreamError as e:
+        return jsonify({'error': e.message, 'success': False}), e.status
     except Exception as e:
-        logger.error(f"잔액 조회 오류: {str(e)}")
-        return jsonify({
-            'error': '잔액 조회 중 오류가 발생했습니다.',
-            'success': False
-        }), 500
+        logger.error(f"음성 스트림 시작 오류: {str(e)}")
+        return jsonify({'error': '음성 업로드 시작 중 오류가 발생했습니다.', 'success': False}), 500
 
-@app.route('/api/transactions', methods=['GET'])
+@app.route('/api/voice/stream/<stream_id>/chunks/<int:index>', methods=['PUT'])
 @jwt_required()
-def get_transactions():
-    """사용자 거래 내역 조회"""
+def append_voice_stream_chunk(stream_id, index):
+    """음성 청크 전송 (본문: 원본 바이트, index는 0부터 순서대로 - 재전송된 청크는 무시)"""
     try:
-        user_id_str = get_jwt_identity()
-        user_id = int(user_id_str)
-        limit = request.args.get('limit', type=int)
-        
-        transactions = data_store.get_user_transactions(user_id, limit)
+        user_id = int(get_jwt_identity())
+        session = voice_stream_store.get(user_id, stream_id)
+        if session is None:
+            return jsonify({'error': '음성 업로드를 찾을 수 없습니다. 다시 시작해주세요.', 'success': False}), 404
         
-        # Swift Transaction 형식으로 변환
-        swift_transactions = []
-        for transaction in transactions:
-            swift_transaction = format_transaction_for_swift(transaction, user_id)
-            swift_transactions.append(swift_transaction)
+        accepted = voice_stream_store.append(session, index, request.get_data())
         
         return jsonify({
-            'transactions': swift_transactions,
-            'count': len(swift_transactions),
+            **voice_stream_store.describe(session),
+            'duplicate': not accepted,
             'success': True
         })
-        
+    
+    except VoiceStreamError as e:
+        result = {'error': e.message, 'success': False}
+        if e.expected_index is not None:
+            result['nextChunkIndex'] = e.expected_index
+        if e.status == 429:
+            return jsonify(result), 429, {'Retry-After': '1'}
+        return jsonify(result), e.status
     except Exception as e:
-        logger.error(f"거래 내역 조회 오류: {str(e)}")
-        return jsonify({
-            'error': '거래 내역 조회 중 오류가 발생했습니다.',
-            'success': False
-        }), 500
+        logger.error(f"음성 청크 처리 오류: {str(e)}")
+        return jsonify({'error': '음성 처리 중 오류가 발생했습니다.', 'success': False}), 500
 
-@app.route('/api/transfer/voice', methods=['POST'])
+@app.route('/api/voice/stream/<stream_id>/finish', methods=['POST'])
 @jwt_required()
-def voice_transfer():
-    """음성 이체 (Swift 호환 통합 엔드포인트)"""
+@idempotent
+def finish_voice_stream(stream_id):
+    """음성 업로드 종료 후 인증/이체 처리
+
+    mode 'prepare'(기본)는 /api/transfer/voice/prepare, 'transfer'는
+    /api/transfer/voice와 같은 응답을 반환합니다. fast 엔진이면 특성 추출은
+    청크 수신 중에 끝나 있으므로 여기서는 최종 통계 계산만 하고, 그 외 엔진은
+    등록 프로필과 같은 엔진으로 모아 둔 신호를 일괄 계산합니다.
+    """
     try:
-        user_id = get_jwt_identity()
+        user_id = int(get_jwt_identity())
+        data = request.get_json() or {}
+        mode = data.get('mode', 'prepare')
         
-        # 음성 파일 업로드 확인
-        if 'audio' not in request.files:
+        if mode not in ('prepare', 'transfer'):
             return jsonify(create_transfer_result_for_swift(
-                False, '음성 파일이 필요합니다.'
+                False, '지원하지 않는 처리 방식입니다. (prepare, transfer)'
             )), 400
         
-        audio_file = request.files['audio']
-        transfer_text = request.form.get('text', '')
+        try:
+            finished = voice_stream_store.finish(user_id, stream_id)
+        except FeatureExtractionBusyError:
+            return jsonify(create_transfer_result_for_swift(
+                False, '음성 처리 요청이 많습니다. 잠시 후 다시 시도해주세요.'
+            )), 429, {'Retry-After': '1'}
+        except FeatureExtractionTimeoutError:
+            return jsonify(create_transfer_result_for_swift(
+                False, '음성 처리 시간이 초과되었습니다.'
+            )), 504
+        if finished is None:
+            return jsonify(create_transfer_result_for_swift(
+                False, '음성 업로드를 찾을 수 없습니다. 다시 시작해주세요.'
+            )), 404
         
-        if audio_file.filename == '':
+        voice_features, content_key = finished
+        if voice_features is None:
             return jsonify(create_transfer_result_for_swift(
-                False, '파일이 선택되지 않았습니다.'
+                False, '음성 데이터가 없습니다.'
             )), 400
         
-        if not allowed_file(audio_file.filename):
+        replay_response = voice_replay_response(user_id, content_key)
+        if replay_response:
+            return replay_response
+        
+        plan, error_response = plan_voice_transfer(
+            user_id, voice_features, data.get('text', ''), content_key, confirm=(mode == 'prepare')
+        )
+        if error_response:
+            return error_response
+        
+        if mode == 'transfer':
+            return execute_voice_transfer_plan(user_id, plan)
+        return hold_voice_transfer_plan(user_id, plan)
+    
+    except Exception as e:
+        logger.error(f"음성 스트림 처리 오류: {str(e)}")
+        return jsonify(create_transfer_result_for_swift(
+            False, '이체 처리 중 오류가 발생했습니다.'
+        )), 500
+
+@app.route('/api/voice/stream/<stream_id>', methods=['DELETE'])
+@jwt_required()
+def cancel_voice_stream(stream_id):
+    """음성 업로드 취소"""
+    user_id = int(get_jwt_identity())
+    if not voice_stream_store.discard(user_id, stream_id):
+        return jsonify({'error': '음성 업로드를 찾을 수 없습니다.', 'success': False}), 404
+    return jsonify({'success': True})
+
+@app.route('/api/transfer/voice/confirm', methods=['POST'])
+@jwt_required()
+def confirm_voice_transfer():
+    """준비된 음성 이체 확인 (음성은 준비 단계에서 이미 인증되어 다시 받지 않음)"""
+    try:
+        user_id = int(get_jwt_identity())
+        data = request.get_json() or {}
+        
+        transaction_id = data.get('transactionId')
+        if type(transaction_id) is not int:
             return jsonify(create_transfer_result_for_swift(
-                False, '지원되지 않는 파일 형식입니다.'
+                False, '거래 ID가 필요합니다.'
             )), 400
         
-        # 파일 저장
-        filename = secure_filename(f"{user_id}_{utc_now().timestamp()}_{audio_file.filename}")
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        audio_file.save(file_path)
+        transaction = data_store.transactions.get(transaction_id)
+        if not transaction or transaction['sender_id'] != user_id:
+            return jsonify(create_transfer_result_for_swift(
+                False, '거래를 찾을 수 없습니다.'
+            )), 404
         
         try:
-            # 1. 음성 특성 추출
-            voice_features = voice_auth.extract_voice_features(file_path)
-            
-            if voice_features is None:
-                return jsonify(create_transfer_result_for_swift(
-                    False, '음성 처리 중 오류가 발생했습니다.'
-                )), 500
-            
-            # 2. 음성 인증
-            is_authenticated, similarity = voice_auth.authenticate_voice(user_id, voice_features)
-            
-            if not is_authenticated:
-                return jsonify(create_transfer_result_for_swift(
-                    False, f'음성 인증에 실패했습니다. (유사도: {similarity:.2f})'
-                )), 401
-            
-            # 3. 이체 정보 추출
-            transfer_info = nlp_service.extract_transfer_info(transfer_text)
-            
-            if not transfer_info['extracted_successfully']:
-                return jsonify(create_transfer_result_for_swift(
-                    False, '이체 정보를 추출할 수 없습니다. 다시 말씀해주세요.'
-                )), 400
-            
-            recipient_name = transfer_info['recipient']
-            amount = transfer_info['amount']
-            
-            # 4. 수취인 계좌 찾기
-            recipient_account = find_account_by_user_info(recipient_name)
-            if not recipient_account:
-                return jsonify(create_transfer_result_for_swift(
-                    False, f'{recipient_name}님의 계좌를 찾을 수 없습니다.'
-                )), 404
-            
-            # 5. 송금자 계좌 조회
-            sender_accounts = data_store.get_user_accounts(user_id)
-            if not sender_accounts:
-                return jsonify(create_transfer_result_for_swift(
-                    False, '송금자 계좌를 찾을 수 없습니다.'
-                )), 404
-            
-            sender_account = sender_accounts[0]
-            
-            # 6. 잔액 확인
-            fee = calculate_transfer_fee(amount)
-            total_amount = amount + fee
-            
-            if sender_account['balance'] < total_amount:
-                return jsonify(create_transfer_result_for_swift(
-                    False, f'계좌 잔액이 부족합니다. (필요: {format_currency(total_amount)}, 잔액: {format_currency(sender_account["balance"])})'
-                )), 400
-            
-            # 7. 이체 실행
-            transaction_id = data_store.create_transaction(
-                sender_id=user_id,
-                recipient_id=recipient_account['user_id'],
-                sender_account_id=sender_account['id'],
-                recipient_account_id=recipient_account['id'],
-                amount=amount,
-                fee=fee,
-                description=f"{recipient_name}에게 음성 이체"
-            )
-            
-            # 8. 계좌 잔액 업데이트
-            new_sender_balance = sender_account['balance'] - total_amount
-            new_recipient_balance = recipient_account['balance'] + amount
-            
-            data_store.update_account_balance(sender_account['id'], new_sender_balance)
-            data_store.update_account_balance(recipient_account['id'], new_recipient_balance)
-            data_store.update_transaction_status(transaction_id, 'completed')
-            
-            logger.info(f"음성 이체 완료 - 거래 ID: {transaction_id}, {recipient_name}에게 {format_currency(amount)}")
-            
-            return jsonify(create_transfer_result_for_swift(
-                True,
-                f'{recipient_name}님에게 {format_currency(amount)} 이체가 완료되었습니다.',
-                transaction_id
-            ))
-            
-        finally:
-            # 임시 파일 삭제
-            if os.path.exists(file_path):
-                os.remove(file_path)
-                
+            data_store.complete_transaction(transaction_id)
+        except TransferError as e:
+            return transfer_error_response(e, transaction['amount'] + transaction['fee'])
+        
+        recipient_name = data_store.users[transaction['recipient_id']]['username']
+        
+        logger.info(f"음성 이체 완료 - 거래 ID: {transaction_id}, {recipient_name}에게 {format_currency(transaction['amount'])}")
+        
+        return jsonify(create_transfer_result_for_swift(
+            True,
+            f"{recipient_name}님에게 {format_currency(transaction['amount'])} 이체가 완료되었습니다.",
+            transaction_id
+        ))
+    
     except Exception as e:
-        logger.error(f"음성 이체 오류: {str(e)}")
+        logger.error(f"음성 이체 확인 오류: {str(e)}")
         return jsonify(create_transfer_result_for_swift(
             False, '이체 처리 중 오류가 발생했습니다.'
         )), 500
 
 @app.route('/api/transfer', methods=['POST'])
 @jwt_required()
+@idempotent
 def transfer():
     """일반 이체 (Swift TransferRequest 호환)"""
     try:
-        user_id = get_jwt_identity()
+        user_id = int(get_jwt_identity())
         data = request.get_json()
         
         # Swift TransferRequest 파싱
@@ -921,39 +4353,53 @@ def transfer():
         recipient_name = transfer_data['recipient_name']
         amount = transfer_data['amount']
         from_account = transfer_data['from_account']
+        recipient_account_number = transfer_data['recipient_account']
         memo = transfer_data['memo']
         voice_score = transfer_data['voice_authentication_score']
         
-        if not all([recipient_name, amount]):
+        if not amount or not (recipient_name or recipient_account_number):
             return jsonify(create_transfer_result_for_swift(
                 False, '필수 정보가 누락되었습니다.'
             )), 400
         
+        # 금액은 양의 정수(원)만 허용 (소수/문자열/음수 거부)
+        if type(amount) is not int or amount <= 0:
+            return jsonify(create_transfer_result_for_swift(
+                False, '이체 금액이 올바르지 않습니다.'
+            )), 400
+        
         # 음성 인증 점수 확인
         if voice_score and voice_score < 0.85:
             return jsonify(create_transfer_result_for_swift(
                 False, f'음성 인증 점수가 낮습니다. ({voice_score:.2f})'
             )), 401
         
-        # 수취인 계좌 찾기
-        recipient_account = find_account_by_user_info(recipient_name)
-        if not recipient_account:
-            return jsonify(create_transfer_result_for_swift(
-                False, f'{recipient_name}님의 계좌를 찾을 수 없습니다.'
-            )), 404
+        # 수취인 계좌 찾기 (계좌번호 지정 시 우선)
+        if recipient_account_number:
+            recipient_account = find_account_by_number(recipient_account_number)
+            if not recipient_account:
+                return jsonify(create_transfer_result_for_swift(
+                    False, '수취인 계좌를 찾을 수 없습니다.'
+                )), 404
+            if not recipient_name:
+                recipient_name = data_store.users[recipient_account['user_id']]['username']
+        else:
+            candidates = resolve_recipient(user_id, recipient_name)
+            recipient = pick_recipient(candidates)
+            if not recipient:
+                return recipient_not_found_response(recipient_name, candidates)
+            recipient_name = recipient['name']
+            recipient_account = recipient['account']
         
         # 송금자 계좌 찾기
-        sender_accounts = data_store.get_user_accounts(user_id)
-        sender_account = None
-        
         if from_account:
-            # 특정 계좌 지정된 경우
-            for acc in sender_accounts:
-                if acc['account_number'] == from_account:
-                    sender_account = acc
-                    break
+            # 특정 계좌 지정된 경우 (본인 계좌인지 확인)
+            sender_account = find_account_by_number(from_account)
+            if sender_account and sender_account['user_id'] != user_id:
+                sender_account = None
         else:
             # 첫 번째 계좌 사용
+            sender_accounts = data_store.get_user_accounts(user_id)
             sender_account = sender_accounts[0] if sender_accounts else None
         
         if not sender_account:
@@ -961,33 +4407,23 @@ def transfer():
                 False, '송금자 계좌를 찾을 수 없습니다.'
             )), 404
         
-        # 잔액 확인
+        # 이체 실행 (잔액 확인과 출금/입금을 계좌 잠금 안에서 원자적으로 처리)
         fee = calculate_transfer_fee(amount)
-        total_amount = amount + fee
-        
-        if sender_account['balance'] < total_amount:
-            return jsonify(create_transfer_result_for_swift(
-                False, f'계좌 잔액이 부족합니다.'
-            )), 400
         
-        # 이체 실행
-        transaction_id = data_store.create_transaction(
-            sender_id=user_id,
-            recipient_id=recipient_account['user_id'],
-            sender_account_id=sender_account['id'],
-            recipient_account_id=recipient_account['id'],
-            amount=amount,
-            fee=fee,
-            description=memo or f"{recipient_name}에게 이체"
-        )
-        
-        # 계좌 잔액 업데이트
-        new_sender_balance = sender_account['balance'] - total_amount
-        new_recipient_balance = recipient_account['balance'] + amount
+        try:
+            result = data_store.transfer(
+                sender_id=user_id,
+                recipient_id=recipient_account['user_id'],
+                sender_account_id=sender_account['id'],
+                recipient_account_id=recipient_account['id'],
+                amount=amount,
+                fee=fee,
+                description=memo or f"{recipient_name}에게 이체"
+            )
+        except TransferError as e:
+            return jsonify(create_transfer_result_for_swift(False, e.message)), 400
         
-        data_store.update_account_balance(sender_account['id'], new_sender_balance)
-        data_store.update_account_balance(recipient_account['id'], new_recipient_balance)
-        data_store.update_transaction_status(transaction_id, 'completed')
+        transaction_id = result['transaction_id']
         
         logger.info(f"이체 완료 - 거래 ID: {transaction_id}")
         
@@ -1008,12 +4444,12 @@ def transfer():
 def execute_transfer():
     """이체 실행"""
     try:
-        user_id = get_jwt_identity()
+        user_id = int(get_jwt_identity())
         data = request.get_json()
         
         transaction_id = data.get('transaction_id')
         
-        if not transaction_id:
+        if type(transaction_id) is not int:
             return jsonify({'error': '거래 ID가 필요합니다.'}), 400
         
         # 거래 정보 확인
@@ -1024,27 +4460,13 @@ def execute_transfer():
         if transaction['sender_id'] != user_id:
             return jsonify({'error': '권한이 없습니다.'}), 403
         
-        if transaction['status'] != 'pending':
-            return jsonify({'error': '이미 처리된 거래입니다.'}), 400
-        
-        # 계좌 정보 조회
-        sender_account = data_store.accounts[transaction['sender_account_id']]
-        recipient_account = data_store.accounts[transaction['recipient_account_id']]
-        
-        total_amount = transaction['amount'] + transaction['fee']
-        
-        # 잔액 재확인
-        if sender_account['balance'] < total_amount:
-            data_store.update_transaction_status(transaction_id, 'failed')
-            return jsonify({'error': '계좌 잔액이 부족합니다.'}), 400
-        
-        # 이체 실행
-        new_sender_balance = sender_account['balance'] - total_amount
-        new_recipient_balance = recipient_account['balance'] + transaction['amount']
+        # 잔액 재확인과 이체를 원자적으로 실행 (잔액 부족 시 거래는 failed 처리)
+        try:
+            result = data_store.complete_transaction(transaction_id)
+        except TransferError as e:
+            return jsonify({'error': e.message}), 410 if e.code == 'expired' else 400
         
-        data_store.update_account_balance(sender_account['id'], new_sender_balance)
-        data_store.update_account_balance(recipient_account['id'], new_recipient_balance)
-        data_store.update_transaction_status(transaction_id, 'completed')
+        new_sender_balance = result['sender_balance']
         
         logger.info(f"이체 완료 - 거래 ID: {transaction_id}, 금액: {transaction['amount']}")
         
@@ -1061,45 +4483,144 @@ def execute_transfer():
         logger.error(f"이체 실행 오류: {str(e)}")
         return jsonify({'error': '이체 실행 중 오류가 발생했습니다.'}), 500
 
+@app.route('/api/recipients/resolve', methods=['GET'])
+@jwt_required()
+def resolve_recipient_candidates():
+    """수취인 이름 후보 조회 (이체 전 확인용)"""
+    try:
+        user_id = int(get_jwt_identity())
+        recipient_name = (request.args.get('name') or '').strip()
+        
+        if not recipient_name:
+            return jsonify({'error': '수취인 이름이 필요합니다.', 'success': False}), 400
+        
+        candidates = resolve_recipient(user_id, recipient_name)
+        recipient = pick_recipient(candidates, allow_fuzzy=True)  # 조회 결과는 사용자가 확인 후 사용
+        
+        return jsonify({
+            'candidates': [format_recipient_candidate_for_swift(candidate) for candidate in candidates],
+            'resolved': format_recipient_candidate_for_swift(recipient) if recipient else None,
+            'success': True
+        })
+    
+    except Exception as e:
+        logger.error(f"수취인 검색 오류: {str(e)}")
+        return jsonify({'error': '수취인 검색 중 오류가 발생했습니다.', 'success': False}), 500
+
+@app.route('/api/payees', methods=['GET'])
+@jwt_required()
+def get_payees():
+    """저장된 수취인 목록"""
+    user_id = int(get_jwt_identity())
+    payees = [
+        {
+            'alias': alias,
+            'accountNumber': mask_account_number(account['account_number']),
+            'ownerName': data_store.users[account['user_id']]['username'],
+            'bankName': '신한은행'
+        }
+        for alias, account in data_store.get_payees(user_id)
+    ]
+    return jsonify({'payees': payees, 'count': len(payees), 'success': True})
+
+@app.route('/api/payees', methods=['POST'])
+@jwt_required()
+def save_payee():
+    """수취인 저장 (예: "엄마" -> 계좌번호)"""
+    try:
+        user_id = int(get_jwt_identity())
+        data = request.get_json() or {}
+        alias = (data.get('alias') or '').strip()
+        
+        if not alias or len(alias) > 20:
+            return jsonify({'error': '별칭은 1~20자여야 합니다.', 'success': False}), 400
+        
+        account = find_account_by_number(data.get('accountNumber'))
+        if not account or not account['is_active']:
+            return jsonify({'error': '계좌를 찾을 수 없습니다.', 'success': False}), 404
+        
+        data_store.save_payee(user_id, alias, account['id'])
+        logger.info(f"수취인 저장 - 사용자 ID: {user_id}, 별칭: {alias}")
+        
+        return jsonify({
+            'alias': alias,
+            'accountNumber': mask_account_number(account['account_number']),
+            'success': True
+        })
+    
+    except Exception as e:
+        logger.error(f"수취인 저장 오류: {str(e)}")
+        return jsonify({'error': '수취인 저장 중 오류가 발생했습니다.', 'success': False}), 500
+
+@app.route('/api/payees/<alias>', methods=['DELETE'])
+@jwt_required()
+def delete_payee(alias):
+    """저장된 수취인 삭제"""
+    user_id = int(get_jwt_identity())
+    if not data_store.delete_payee(user_id, alias):
+        return jsonify({'error': '저장된 수취인을 찾을 수 없습니다.', 'success': False}), 404
+    return jsonify({'success': True})
+
 @app.route('/api/voice/register', methods=['POST'])
 @jwt_required()
 def register_voice():
     """음성 프로필 등록"""
     try:
-        user_id = get_jwt_identity()
+        user_id = int(get_jwt_identity())
         
         if 'audio' not in request.files:
             return jsonify({'error': '음성 파일이 필요합니다.'}), 400
         
-        audio_file = request.files['audio']
+        # 여러 샘플을 한 번에 등록 가능 (audio 필드 반복)
+        audio_files = request.files.getlist('audio')
+        
+        if len(audio_files) > app.config['VOICE_ENROLLMENT_MAX_SAMPLES']:
+            return jsonify({
+                'error': f"음성 샘플은 최대 {app.config['VOICE_ENROLLMENT_MAX_SAMPLES']}개까지 등록할 수 있습니다."
+            }), 400
+        
+        for audio_file in audio_files:
+            if not allowed_file(audio_file.filename):
+                return jsonify({'error': '지원되지 않는 파일 형식입니다.'}), 400
         
-        if not allowed_file(audio_file.filename):
-            return jsonify({'error': '지원되지 않는 파일 형식입니다.'}), 400
+        # append=true이면 기존 프로필에 샘플 추가, 아니면 새로 등록
+        append = request.form.get('append', 'false').lower() == 'true'
         
-        # 파일 저장
-        filename = secure_filename(f"voice_reg_{user_id}_{utc_now().timestamp()}_{audio_file.filename}")
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        audio_file.save(file_path)
+        # 업로드 데이터는 메모리에서 바로 처리 (압축 형식만 임시 파일 경유)
+        uploads = [(audio_file.read(), audio_file.filename) for audio_file in audio_files]
         
+        # 음성 특성 추출 (내용 해시 캐시 -> 프로세스 풀, 샘플 병렬 처리)
         try:
-            # 음성 특성 추출
-            voice_features = voice_auth.extract_voice_features(file_path)
-            
-            if voice_features is None:
-                return jsonify({'error': '음성 처리 중 오류가 발생했습니다.'}), 500
-            
-            # 음성 프로필 저장
-            data_store.create_voice_profile(user_id, voice_features)
-            
+            samples = feature_extractor.extract_many(uploads)
+        except FeatureExtractionBusyError:
             return jsonify({
-                'success': True,
-                'message': '음성 프로필이 등록되었습니다.'
-            })
-            
-        finally:
-            # 임시 파일 삭제
-            if os.path.exists(file_path):
-                os.remove(file_path)
+                'error': '음성 처리 요청이 많습니다. 잠시 후 다시 시도해주세요.'
+            }), 429, {'Retry-After': '1'}
+        except FeatureExtractionTimeoutError:
+            return jsonify({'error': '음성 처리 시간이 초과되었습니다.'}), 504
+        
+        samples = [voice_features for voice_features in samples if voice_features is not None]
+        if not samples:
+            return jsonify({'error': '음성 처리 중 오류가 발생했습니다.'}), 500
+        failed_count = len(uploads) - len(samples)
+        
+        # 음성 프로필 저장 (원본 음성은 보관하지 않고 평균/분산만 누적, 한 번에 기록)
+        voice_profile = data_store.update_voice_profile(user_id, samples, replace=not append)
+        
+        # 다른 사용자와 같은 화자로 보이면 중복 등록 의심 (차단하지 않고 기록)
+        duplicates = voice_auth.find_similar_speakers(
+            voice_profile['voice_features'], k=3, exclude_user_id=user_id,
+            min_similarity=voice_auth.threshold
+        )
+        if duplicates:
+            logger.warning(f"중복 음성 등록 의심 - 사용자 ID: {user_id}, 유사 프로필: {duplicates}")
+        
+        return jsonify({
+            'success': True,
+            'message': '음성 프로필이 등록되었습니다.',
+            'sampleCount': voice_profile['sample_count'],
+            'failedSamples': failed_count
+        })
     
     except Exception as e:
         logger.error(f"음성 등록 오류: {str(e)}")
@@ -1110,14 +4631,15 @@ def register_voice():
 def voice_status():
     """음성 프로필 등록 상태 확인"""
     try:
-        user_id = get_jwt_identity()
+        user_id = int(get_jwt_identity())
         voice_profile = data_store.get_voice_profile(user_id)
         
         if voice_profile and voice_profile['is_active']:
             return jsonify({
                 'isRegistered': True,
                 'registeredAt': voice_profile['created_at'].isoformat(),
-                'lastUpdated': voice_profile['updated_at'].isoformat()
+                'lastUpdated': voice_profile['updated_at'].isoformat(),
+                'sampleCount': voice_profile['sample_count']
             })
         else:
             return jsonify({
@@ -1128,6 +4650,174 @@ def voice_status():
         logger.error(f"음성 상태 확인 오류: {str(e)}")
         return jsonify({'error': '음성 상태 확인 중 오류가 발생했습니다.'}), 500
 
+def parse_feature_matrix(features):
+    """JSON 특성 벡터 목록 -> (N, dim) float32 행렬, 형식이 맞지 않으면 None
+
+    길이가 제각각이거나 숫자가 아닌 값이 섞인 목록, 등록 프로필과 차원이
+    다른 벡터는 거부합니다.
+    """
+    try:
+        matrix = np.asarray(features)
+    except ValueError:
+        return None
+    if matrix.ndim != 2 or matrix.shape[0] == 0 or matrix.dtype.kind not in 'iuf':
+        return None
+    if not np.isfinite(matrix).all():
+        return None
+    
+    dim = data_store.voice_profile_index.dim
+    if dim is not None and matrix.shape[1] != dim:
+        return None
+    return matrix.astype(np.float32)
+
+@app.route('/api/admin/voice/score-batch', methods=['POST'])
+@jwt_required()
+@admin_required
+def score_voice_batch():
+    """여러 발화를 여러 음성 프로필과 일괄 비교 (관리자용)"""
+    try:
+        if request.is_json:
+            # 저장된 특성 벡터 재검증: {"features": [[...], ...], "userIds": [...]}
+            data = request.get_json()
+            features_batch = parse_feature_matrix(data.get('features'))
+            if features_batch is None:
+                return jsonify({
+                    'error': 'features는 프로필과 같은 차원의 숫자 벡터 목록이어야 합니다.',
+                    'success': False
+                }), 400
+            user_ids = data.get('userIds')
+            labels = list(range(len(features_batch)))
+        else:
+            # 음성 파일 일괄 업로드: audio 필드 여러 개, userIds=1,2,3
+            audio_files = request.files.getlist('audio')
+            if not audio_files:
+                return jsonify({'error': '음성 파일 또는 특성 벡터가 필요합니다.', 'success': False}), 400
+            
+            for audio_file in audio_files:
+                if not allowed_file(audio_file.filename):
+                    return jsonify({
+                        'error': f'지원되지 않는 파일 형식입니다: {audio_file.filename}',
+                        'success': False
+                    }), 400
+            
+            user_ids_param = request.form.get('userIds')
+            user_ids = [int(uid) for uid in user_ids_param.split(',')] if user_ids_param else None
+            labels = [audio_file.filename for audio_file in audio_files]
+            
+            try:
+                features_batch = feature_extractor.extract_many(
+                    [(audio_file.read(), audio_file.filename) for audio_file in audio_files]
+                )
+            except FeatureExtractionBusyError:
+                return jsonify({
+                    'error': '음성 처리 요청이 많습니다. 잠시 후 다시 시도해주세요.',
+                    'success': False
+                }), 429, {'Retry-After': '1'}
+            except FeatureExtractionTimeoutError:
+                return jsonify({'error': '음성 처리 시간이 초과되었습니다.', 'success': False}), 504
+        
+        # 특성 추출에 실패한 발화는 점수 계산에서 제외
+        valid = [i for i, features in enumerate(features_batch) if features is not None]
+        failed = [labels[i] for i, features in enumerate(features_batch) if features is None]
+        profile_user_ids, scores = voice_auth.score_batch(
+            np.asarray([features_batch[i] for i in valid], dtype=np.float32), user_ids
+        )
+        
+        results = []
+        for row, i in enumerate(valid):
+            result = {'input': labels[i], 'scores': [round(float(score), 4) for score in scores[row]]}
+            if profile_user_ids:
+                best = int(np.argmax(scores[row]))
+                result['bestUserId'] = profile_user_ids[best]
+                result['bestScore'] = round(float(scores[row][best]), 4)
+                result['authenticated'] = bool(scores[row][best] >= voice_auth.threshold)
+            results.append(result)
+        
+        return jsonify({
+            'userIds': profile_user_ids,
+            'threshold': voice_auth.threshold,
+            'results': results,
+            'failedInputs': failed,
+            'success': True
+        })
+    
+    except Exception as e:
+        logger.error(f"일괄 음성 검증 오류: {str(e)}")
+        return jsonify({'error': '일괄 음성 검증 중 오류가 발생했습니다.', 'success': False}), 500
+
+def is_voice_profile_active(user_id):
+    """활성 사용자의 활성 음성 프로필인지 확인 (authenticate_voice와 같은 기준)"""
+    voice_profile = data_store.get_voice_profile(user_id)
+    user = data_store.users.get(user_id)
+    return bool(voice_profile and voice_profile['is_active'] and user and user['is_active'])
+
+@app.route('/api/admin/voice/search', methods=['POST'])
+@jwt_required()
+@admin_required
+def search_voice_profiles():
+    """유사 화자 top-k 검색 (관리자용)"""
+    try:
+        data = request.get_json() or {}
+        k = int(data.get('k', 5))
+        user_id = data.get('userId')
+        
+        if user_id is not None:
+            # 등록된 사용자의 프로필과 유사한 다른 사용자 검색
+            voice_profile = data_store.get_voice_profile(user_id)
+            if not voice_profile or not voice_profile['is_active']:
+                return jsonify({'error': '음성 프로필을 찾을 수 없습니다.', 'success': False}), 404
+            features = voice_profile['voice_features']
+        elif data.get('features'):
+            features = parse_feature_matrix([data['features']])
+            if features is None:
+                return jsonify({
+                    'error': 'features는 프로필과 같은 차원의 숫자 벡터여야 합니다.',
+                    'success': False
+                }), 400
+            features = features[0]
+        else:
+            return jsonify({'error': 'userId 또는 features가 필요합니다.', 'success': False}), 400
+        
+        matches = voice_auth.find_similar_speakers(features, k=k, exclude_user_id=user_id)
+        
+        return jsonify({
+            'matches': [
+                {
+                    'userId': match_user_id,
+                    'username': data_store.users[match_user_id]['username'],
+                    'similarity': round(similarity, 4),
+                    'sameSpeaker': similarity >= voice_auth.threshold
+                }
+                for match_user_id, similarity in matches
+                if is_voice_profile_active(match_user_id)
+            ],
+            'mode': data_store.voice_profile_index.mode,
+            'profileCount': len(data_store.voice_profile_index),
+            'success': True
+        })
+    
+    except Exception as e:
+        logger.error(f"음성 프로필 검색 오류: {str(e)}")
+        return jsonify({'error': '음성 프로필 검색 중 오류가 발생했습니다.', 'success': False}), 500
+
+@app.route('/api/admin/metrics', methods=['GET'])
+@jwt_required()
+@admin_required
+def get_metrics():
+    """캐시/작업 처리 통계 조회 (관리자용)"""
+    return jsonify({
+        'readModelCache': read_model_cache.get_stats(),
+        'events': event_broker.get_stats(),
+        'eventServer': event_server.get_stats(),
+        'featureExtraction': feature_extractor.get_stats(),
+        'featureCache': voice_feature_cache.get_stats() if voice_feature_cache is not None else None,
+        'voiceStreams': voice_stream_store.get_stats(),
+        'voiceActivity': voice_activity_stats.get_stats(),
+        'transferHolds': transfer_hold_sweeper.get_stats(),
+        'idempotency': idempotency_store.get_stats(),
+        'success': True
+    })
+
 @app.route('/api/debug/token', methods=['GET'])
 @jwt_required()
 def debug_token():
@@ -1255,11 +4945,28 @@ if __name__ == '__main__':
     print("- GET  /api/transactions - 거래 내역 조회")
     print("- POST /api/voice/register - 음성 프로필 등록")
     print("- GET  /api/voice/status - 음성 등록 상태 확인")
+    print("- POST /api/admin/voice/score-batch - 음성 일괄 검증 (관리자)")
+    print("- POST /api/admin/voice/search - 유사 화자 검색 (관리자)")
+    print("- GET  /api/recipients/resolve - 수취인 이름 후보 조회")
+    print("- GET/POST /api/payees, DELETE /api/payees/<alias> - 저장된 수취인 관리")
+    print("- GET  /api/events/stream - 잔액/거래 변경 이벤트 스트림 (SSE)")
+    print("- GET  /api/events/poll - 잔액/거래 변경 이벤트 long-poll")
+    print(f"  (대량 연결용 이벤트 서버: 포트 {app.config['EVENT_SERVER_PORT']}의 같은 경로, 0이면 사용 안 함)")
+    print("- GET  /api/admin/metrics - 캐시/작업 처리 통계 (관리자)")
     print("- POST /api/transfer/voice - 음성 이체")
+    print("- POST /api/transfer/voice/prepare - 음성 이체 준비 (출금 보류)")
+    print("- POST /api/transfer/voice/confirm - 준비된 음성 이체 확인")
+    print("- POST /api/voice/stream, PUT .../chunks/<index>, POST .../finish - 청크 단위 음성 업로드 이체")
     print("- POST /api/transfer - 일반 이체")
     print("- POST /api/transfer/execute - 이체 실행")
     print("- GET  /api/users/list - 사용자 목록 (테스트용)")
     print("- POST /api/test/create-sample-data - 추가 테스트 데이터 생성")
     
+    feature_extractor.start()
+    audio_features.warm_up()  # 스트리밍 업로드는 요청 스레드에서 분석하므로 현재 프로세스도 미리 준비
+    if app.config['EVENT_SERVER_PORT'] and _is_serving_process():
+        event_server.start('0.0.0.0', app.config['EVENT_SERVER_PORT'])
+        print(f"이벤트 서버 시작 - http://127.0.0.1:{app.config['EVENT_SERVER_PORT']}/api/events/stream")
+    
     print(f"\n서버 시작중... http://127.0.0.1:8080")
     app.run(debug=True, host='0.0.0.0', port=8080)
\ No newline at end of file
@@ -0,0 +1,87 @@
+"""테스트 공통 설정
+
+server.py는 모듈 로드 시 인메모리 DataStore(테스트 데이터)를 만들고 현재
+디렉터리 아래 data/uploads를 생성하므로, 임시 디렉터리에서 불러옵니다.
+"""
+import io
+import os
+import sys
+import tempfile
+import wave
+
+import numpy as np
+import pytest
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVER_DIR)
+
+os.environ['PERSISTENCE_ENABLED'] = '0'
+os.chdir(tempfile.mkdtemp(prefix='server-tests-'))
+
+import server  # noqa: E402
+
+
+@pytest.fixture
+def client():
+    return server.app.test_client()
+
+
+@pytest.fixture
+def login(client):
+    """사용자 이름으로 로그인해 인증 헤더 반환"""
+    def _login(username):
+        response = client.post('/api/auth/login', json={'username': username})
+        return {'Authorization': 'Bearer ' + response.get_json()['access_token']}
+    return _login
+
+
+@pytest.fixture
+def admin_headers(login, monkeypatch):
+    """관리자(testuser1) 인증 헤더 - 관리자 목록과 API 키를 테스트용으로 설정"""
+    monkeypatch.setitem(server.app.config, 'ADMIN_USERNAMES', frozenset({'testuser1'}))
+    monkeypatch.setitem(server.app.config, 'ADMIN_API_KEY', 'test-admin-key')
+    return {**login('testuser1'), 'X-Admin-Key': 'test-admin-key'}
+
+
+@pytest.fixture
+def voice_profiles():
+    """사용자 ID -> 특성 벡터로 음성 프로필 등록, 테스트 후 제거"""
+    registered = []
+
+    def _register(user_id, features):
+        server.data_store.create_voice_profile(user_id, features)
+        registered.append(user_id)
+
+    yield _register
+
+    for user_id in registered:
+        server.data_store.voice_profiles.pop(user_id, None)
+        server.data_store.voice_profile_index.remove(user_id)
+
+
+def synthetic_voice(sr=16000, seconds=1.5, seed=0, silence=0.0, noise=0.003):
+    """기본 주파수가 흔들리는 배음 신호 (앞뒤 silence초 무음 추가, noise: 배경 잡음 크기)"""
+    t = np.arange(int(sr * seconds)) / sr
+    f0 = 140 + 20 * np.sin(2 * np.pi * 3 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / sr
+    y = sum(np.sin(k * phase) / k for k in range(1, 8)) * 0.2
+    y *= (np.sin(np.pi * t / seconds) > 0.2)
+
+    pad = np.zeros(int(sr * silence))
+    y = np.concatenate([pad, y, pad])
+    return y + np.random.default_rng(seed).normal(scale=noise, size=len(y))
+
+
+@pytest.fixture
+def voice_wav():
+    """합성 음성 WAV 바이트 생성 함수 (16bit 모노)"""
+    def _voice_wav(sr=16000, seconds=1.5, seed=0, silence=0.0):
+        y = synthetic_voice(sr, seconds, seed, silence)
+        buffer = io.BytesIO()
+        with wave.open(buffer, 'wb') as f:
+            f.setnchannels(1)
+            f.setsampwidth(2)
+            f.setframerate(sr)
+            f.writeframes((np.clip(y, -1, 1) * 32767).astype('<i2').tobytes())
+        return buffer.getvalue()
+    return _voice_wav
@@ -0,0 +1,48 @@
+"""관리자 음성 프로필 API (일괄 검증/화자 검색) 테스트"""
+import numpy as np
+import pytest
+
+from server import data_store, voice_auth
+
+DIM = 2 * voice_auth.feature_options()['n_mfcc']
+
+
+def vector(seed):
+    return np.random.default_rng(seed).normal(size=DIM)
+
+
+@pytest.mark.parametrize('features', [
+    [[0.1] * DIM, [0.1] * (DIM - 1)],  # 길이가 제각각
+    [[0.1] * (DIM + 1)],  # 프로필과 차원이 다름
+    [['a'] * DIM],
+    [0.1] * DIM,  # 1차원
+    []
+])
+def test_score_batch_rejects_malformed_features(client, admin_headers, voice_profiles, features):
+    voice_profiles(1, vector(1))
+
+    response = client.post('/api/admin/voice/score-batch', headers=admin_headers, json={'features': features})
+    assert response.status_code == 400
+
+
+def test_score_batch_scores_valid_features(client, admin_headers, voice_profiles):
+    voice_profiles(1, vector(1))
+
+    response = client.post(
+        '/api/admin/voice/score-batch', headers=admin_headers,
+        json={'features': [vector(1).tolist()], 'userIds': [1]}
+    )
+    assert response.status_code == 200
+    assert response.get_json()['results'][0]['bestScore'] == pytest.approx(1.0)
+
+
+def test_search_skips_deactivated_profiles(client, admin_headers, voice_profiles):
+    voice_profiles(1, vector(1))
+    voice_profiles(2, vector(1) + 0.01)
+    data_store.deactivate_voice_profile(2)
+
+    response = client.post('/api/admin/voice/search', headers=admin_headers, json={'userId': 1})
+    assert [match['userId'] for match in response.get_json()['matches']] == []
+
+    response = client.post('/api/admin/voice/search', headers=admin_headers, json={'userId': 2})
+    assert response.status_code == 404
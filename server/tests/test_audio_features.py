@@ -0,0 +1,50 @@
+"""음성 특성 추출 (audio_features) 테스트"""
+import numpy as np
+
+import audio_features
+from conftest import synthetic_voice
+
+SR = 16000
+
+
+def test_vad_trims_leading_and_trailing_silence():
+    # 배경 잡음은 -70dBFS 수준 (음성 대비 VAD 범위 밖)
+    speech = synthetic_voice(SR, seconds=1.0, noise=3e-4)
+    padded = synthetic_voice(SR, seconds=1.0, silence=1.0, noise=3e-4)
+
+    trimmed, stats = audio_features.trim_silence(padded, SR)
+
+    assert stats['speech']
+    assert stats['dropped'] > 0
+    # 앞뒤 1초씩 붙인 무음은 대부분 잘려 원래 길이에 가까워짐
+    assert len(trimmed) < len(speech) + 0.3 * SR
+
+    # 무음 길이와 관계없이 같은 발화는 거의 같은 특성
+    with_vad = audio_features.compute_features_with_engine(padded, SR, vad=True)
+    reference = audio_features.compute_features_with_engine(speech, SR, vad=True)
+    without_vad = audio_features.compute_features_with_engine(padded, SR, vad=False)
+
+    def cosine(a, b):
+        return float(a @ b / np.linalg.norm(a) / np.linalg.norm(b))
+
+    assert cosine(with_vad, reference) > cosine(without_vad, reference)
+    assert cosine(with_vad, reference) > 0.99
+
+
+def test_vad_keeps_signal_without_speech():
+    noise = np.random.default_rng(0).normal(scale=1e-4, size=SR)
+
+    trimmed, stats = audio_features.trim_silence(noise, SR)
+
+    assert len(trimmed) == len(noise)
+    assert stats['dropped'] == 0
+
+
+def test_fast_engine_matches_librosa():
+    y = synthetic_voice(audio_features.SAMPLE_RATE).astype(np.float32)
+
+    fast = audio_features.compute_features_with_engine(y, audio_features.SAMPLE_RATE, engine=audio_features.ENGINE_FAST)
+    reference = audio_features.compute_features_with_engine(y, audio_features.SAMPLE_RATE)
+
+    # 22050Hz 입력은 librosa와 float32 반올림 오차 수준
+    np.testing.assert_allclose(fast, reference, atol=1e-3)
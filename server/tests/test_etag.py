@@ -0,0 +1,30 @@
+"""조회 응답 ETag/조건부 GET(304) 테스트"""
+import pytest
+
+from server import data_store
+
+
+def transfer_to_kim(client, headers, amount=1000):
+    response = client.post('/api/transfer', headers=headers, json={'recipientName': '김철수', 'amount': amount})
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize('path', ['/api/accounts', '/api/accounts/balance', '/api/transactions'])
+def test_unchanged_data_returns_304_until_a_write(client, login, path):
+    headers = login('testuser1')
+
+    first = client.get(path, headers=headers)
+    etag = first.headers['ETag']
+    assert first.status_code == 200
+
+    unchanged = client.get(path, headers={**headers, 'If-None-Match': etag})
+    assert unchanged.status_code == 304
+    assert unchanged.headers['ETag'] == etag
+    assert unchanged.get_data() == b''
+
+    transfer_to_kim(client, headers)
+
+    changed = client.get(path, headers={**headers, 'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
+    assert changed.headers['ETag'].startswith(f'W/"{data_store.version_epoch}-')
@@ -0,0 +1,113 @@
+"""스레드 없는 이벤트 서버(AsyncEventServer) 테스트"""
+import json
+import socket
+import threading
+import time
+
+import pytest
+
+import server
+
+
+@pytest.fixture
+def event_server():
+    """임의 포트에서 이벤트 서버 시작, 테스트 후 종료"""
+    instance = server.AsyncEventServer(server.event_broker, max_connections=1000)
+    instance.start('127.0.0.1', 0)
+    yield instance
+    instance.stop()
+
+
+def send_request(port, target, headers):
+    sock = socket.create_connection(('127.0.0.1', port), timeout=10)
+    lines = [f'GET {target} HTTP/1.1', 'Host: localhost'] + [f'{name}: {value}' for name, value in headers.items()]
+    sock.sendall(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+    return sock
+
+
+def read_response(sock):
+    """연결이 닫힐 때까지 읽어 (상태 코드, JSON 본문) 반환"""
+    data = b''
+    while chunk := sock.recv(65536):
+        data += chunk
+    sock.close()
+    head, _, body = data.partition(b'\r\n\r\n')
+    return int(head.split(b' ')[1]), json.loads(body)
+
+
+def read_until(sock, marker):
+    data = b''
+    while marker not in data:
+        chunk = sock.recv(65536)
+        assert chunk, data
+        data += chunk
+    return data.decode('utf-8')
+
+
+def wait_for(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def transfer_to_kim(client, headers, amount=1000):
+    response = client.post('/api/transfer', headers=headers, json={'recipientName': '김철수', 'amount': amount})
+    assert response.status_code == 200
+
+
+def test_idle_long_polls_do_not_hold_threads(client, login, event_server):
+    headers = login('testuser1')
+    status, body = read_response(send_request(event_server.port, '/api/events/poll', headers))
+    assert status == 200
+    after = body['lastEventId']
+
+    # Flask 경로의 대기 슬롯(EVENT_MAX_WAITERS)보다 많은 연결이 스레드 없이 대기
+    waiters = 4 * server.app.config['EVENT_MAX_WAITERS']
+    threads_before = threading.active_count()
+    polls = [
+        send_request(event_server.port, f'/api/events/poll?after={after}&timeout=10', headers)
+        for _ in range(waiters)
+    ]
+    wait_for(lambda: server.event_broker.get_stats()['subscribers'] == waiters)
+    assert threading.active_count() == threads_before
+
+    transfer_to_kim(client, headers)
+    for sock in polls:
+        status, body = read_response(sock)
+        assert status == 200
+        assert body['resync'] is False
+        assert body['lastEventId'] > after
+        # long-poll은 첫 이벤트(거래)에서 응답하므로 잔액 이벤트는 다음 요청으로 넘어갈 수 있음
+        assert body['events'][0]['type'] == 'transaction'
+
+
+def test_stream_delivers_events_and_resumes_from_last_event_id(client, login, event_server):
+    headers = login('testuser1')
+    sock = send_request(event_server.port, '/api/events/stream', headers)
+    ready = read_until(sock, b'event: ready')
+    assert ready.startswith('HTTP/1.1 200')
+    assert 'text/event-stream' in ready
+    ready_id = int(ready.split('id: ')[1].split('\n')[0])
+
+    transfer_to_kim(client, headers)
+    frames = read_until(sock, b'event: balance')
+    sock.close()
+    assert 'event: transaction' in frames
+    data = json.loads(frames.split('event: balance\ndata: ')[1].split('\n')[0])
+    assert data['type'] == 'balance'
+
+    # 재연결: Last-Event-ID 이후 이벤트를 이어받음
+    sock = send_request(event_server.port, '/api/events/stream', {**headers, 'Last-Event-ID': ready_id})
+    frames = read_until(sock, b'event: balance')
+    sock.close()
+    assert 'event: transaction' in frames
+
+
+def test_requires_access_token(event_server):
+    status, body = read_response(send_request(event_server.port, '/api/events/poll', {}))
+    assert status == 401
+    assert body['success'] is False
+
+    status, _ = read_response(send_request(event_server.port, '/api/events/poll', {'Authorization': 'Bearer invalid'}))
+    assert status == 401
@@ -0,0 +1,35 @@
+"""Idempotency-Key 처리 테스트"""
+from server import IdempotencyStore, PersistenceError, calculate_transfer_fee, data_store
+
+
+def test_purge_keeps_in_progress_entries():
+    store = IdempotencyStore(max_entries=2, ttl=86400)
+
+    assert store.begin(1, 'a', 'f')[0] == 'execute'
+    assert store.begin(1, 'b', 'f')[0] == 'execute'
+    store.finish(1, 'b', (200, b'{}', 'application/json'))
+    assert store.begin(1, 'c', 'f')[0] == 'execute'
+    store.finish(1, 'c', (200, b'{}', 'application/json'))
+    store.begin(1, 'd', 'f')
+
+    # 가장 오래된 'a'는 처리 중이므로 남고, 완료된 'b'가 대신 제거됨
+    assert store.begin(1, 'a', 'f')[0] == 'in_progress'
+    assert store.begin(1, 'b', 'f')[0] == 'execute'
+
+
+def test_response_after_commit_is_stored(client, login, monkeypatch):
+    def failing_sync(lsn):
+        raise PersistenceError('WAL 기록 실패')
+
+    monkeypatch.setattr(data_store, '_sync', failing_sync)
+    headers = {**login('testuser1'), 'Idempotency-Key': 'commit-then-fail'}
+    sender_account = data_store.get_user_accounts(1)[0]
+    balance = sender_account['balance']
+
+    first = client.post('/api/transfer', headers=headers, json={'recipientName': '김철수', 'amount': 1000})
+    retry = client.post('/api/transfer', headers=headers, json={'recipientName': '김철수', 'amount': 1000})
+
+    assert first.status_code == 500
+    assert retry.status_code == 500
+    assert retry.headers['Idempotent-Replayed'] == 'true'
+    assert balance - sender_account['balance'] == 1000 + calculate_transfer_fee(1000)
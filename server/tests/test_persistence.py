@@ -0,0 +1,96 @@
+"""WAL/스냅샷 영속화 복구 테스트 (스냅샷 -> 추가 변경 -> 재시작)"""
+import os
+
+import numpy as np
+import pytest
+
+from server import DataPersistence, DataStore
+
+SENDER_ACCOUNT = 1  # testuser1 주계좌
+RECIPIENT_ACCOUNT = 4  # 김철수
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    return str(tmp_path / 'data')
+
+
+def open_store(data_dir):
+    return DataStore(DataPersistence(data_dir, sync_mode='group', snapshot_interval=3600))
+
+
+def close_store(store):
+    store.persistence.close()
+
+
+def state_of(store):
+    """복구 후 비교할 상태 (잔액, 보류, 거래/수취인/음성 색인)"""
+    return {
+        'balances': {account_id: account['balance'] for account_id, account in store.accounts.items()},
+        'holds': {tx_id: dict(hold) for tx_id, hold in store.transfer_holds.items()},
+        'held_amounts': {account_id: amount for account_id, amount in store.held_amounts.items() if amount},
+        'available': store.get_available_balance(SENDER_ACCOUNT),
+        'transactions': {user_id: list(ids) for user_id, ids in store.user_transactions.items()},
+        'statuses': [transaction['status'] for transaction in store.transactions.values()],
+        'recipients': store.recipient_index.get('김철수'),
+        'payees': store.payee_indexes[1].get('철수'),
+        'voice_vector': store.voice_profile_index.get_vector(1),
+    }
+
+
+def assert_same_state(actual, expected):
+    voice_vector, expected_vector = actual.pop('voice_vector'), expected.pop('voice_vector')
+    if expected_vector is None:
+        assert voice_vector is None
+    else:
+        np.testing.assert_allclose(voice_vector, expected_vector)
+    assert actual == expected
+
+
+def test_snapshot_then_wal_restores_state(data_dir):
+    store = open_store(data_dir)
+    store.transfer(1, 2, SENDER_ACCOUNT, RECIPIENT_ACCOUNT, 10000, 500)
+    store.persistence.snapshot(store)
+
+    # 스냅샷 이후 변경은 WAL 재적용으로만 복구됨
+    store.transfer(1, 2, SENDER_ACCOUNT, RECIPIENT_ACCOUNT, 20000, 500)
+    store.prepare_transfer(1, 2, SENDER_ACCOUNT, RECIPIENT_ACCOUNT, 30000, 500)
+    store.save_payee(1, '철수', RECIPIENT_ACCOUNT)
+    store.create_voice_profile(1, np.arange(26, dtype=np.float64))
+    expected = state_of(store)
+    close_store(store)
+
+    restarted = open_store(data_dir)
+    try:
+        assert expected['holds']
+        assert_same_state(state_of(restarted), expected)
+    finally:
+        close_store(restarted)
+
+
+def test_truncated_wal_tail_is_ignored(data_dir):
+    store = open_store(data_dir)
+    store.transfer(1, 2, SENDER_ACCOUNT, RECIPIENT_ACCOUNT, 10000, 500)
+    expected = state_of(store)
+    store.transfer(1, 2, SENDER_ACCOUNT, RECIPIENT_ACCOUNT, 20000, 500)
+    close_store(store)
+
+    # 마지막 레코드를 쓰다가 중단된 것처럼 꼬리를 잘라냄
+    _, path = store.persistence.wal.segments()[-1]
+    with open(path, 'r+b') as f:
+        f.truncate(os.path.getsize(path) - 5)
+
+    restarted = open_store(data_dir)
+    try:
+        assert_same_state(state_of(restarted), expected)
+        # 잘린 꼬리 뒤에도 새 변경은 정상 기록/복구
+        restarted.transfer(1, 2, SENDER_ACCOUNT, RECIPIENT_ACCOUNT, 1000, 500)
+        expected = state_of(restarted)
+    finally:
+        close_store(restarted)
+
+    restarted = open_store(data_dir)
+    try:
+        assert_same_state(state_of(restarted), expected)
+    finally:
+        close_store(restarted)
@@ -0,0 +1,29 @@
+"""사용자별 조회 캐시(ReadModelCache) 무효화 테스트"""
+from server import calculate_transfer_fee, read_model_cache
+
+
+def transfer_to_kim(client, headers, amount=1000):
+    response = client.post('/api/transfer', headers=headers, json={'recipientName': '김철수', 'amount': amount})
+    assert response.status_code == 200
+
+
+def test_transfer_invalidates_cached_read_models(client, login):
+    headers = login('testuser1')
+    recipient_headers = login('김철수')
+
+    client.get('/api/accounts/balance', headers=headers)
+    client.get('/api/accounts/balance', headers=recipient_headers)
+    hits = read_model_cache.get_stats()['hits']
+    before = client.get('/api/accounts/balance', headers=headers).get_json()['totalBalance']
+    recipient_before = client.get('/api/accounts/balance', headers=recipient_headers).get_json()['totalBalance']
+    assert read_model_cache.get_stats()['hits'] == hits + 2
+
+    invalidations = read_model_cache.get_stats()['invalidations']
+    transfer_to_kim(client, headers, 5000)
+
+    # 송금자와 수취인 캐시 항목이 모두 즉시 제거됨
+    assert read_model_cache.get_stats()['invalidations'] >= invalidations + 2
+    after = client.get('/api/accounts/balance', headers=headers).get_json()['totalBalance']
+    recipient_after = client.get('/api/accounts/balance', headers=recipient_headers).get_json()['totalBalance']
+    assert before - after == 5000 + calculate_transfer_fee(5000)
+    assert recipient_after - recipient_before == 5000
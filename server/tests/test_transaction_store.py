@@ -0,0 +1,56 @@
+"""컬럼형 거래 저장소 (TransactionStore) 테스트"""
+from datetime import datetime, timezone
+
+import pytest
+
+from server import TransactionStore
+
+
+def make_transaction(transaction_id, **overrides):
+    transaction = {
+        'id': transaction_id,
+        'sender_id': 1,
+        'recipient_id': 2,
+        'sender_account_id': 10,
+        'recipient_account_id': 20,
+        'amount': 1000,
+        'fee': 500,
+        'status': 'completed',
+        'transaction_type': 'transfer',
+        'description': '테스트',
+        'created_at': datetime(2026, 1, 1, tzinfo=timezone.utc),
+        'completed_at': None
+    }
+    transaction.update(overrides)
+    return transaction
+
+
+@pytest.mark.parametrize('overrides', [
+    {'amount': 1000.5},
+    {'fee': '500'},
+    {'recipient_account_id': -1},
+    {'created_at': 'yesterday'},
+])
+def test_failed_append_leaves_columns_aligned(overrides):
+    store = TransactionStore([make_transaction(1)])
+
+    with pytest.raises((TypeError, OverflowError, AttributeError)):
+        store.append(make_transaction(2, sender_id=7, **overrides))
+
+    assert {len(column) for column in store._columns.values()} == {1}
+
+    store.append(make_transaction(2, sender_id=3, recipient_id=4))
+    assert len(store) == 2
+    assert store[2]['sender_id'] == 3
+    assert store[2]['recipient_id'] == 4
+    assert store[1]['sender_id'] == 1
+
+
+def test_round_trip():
+    transaction = make_transaction(1, completed_at=datetime(2026, 1, 2, tzinfo=timezone.utc))
+    store = TransactionStore([transaction])
+
+    assert dict(store[1]) == transaction
+
+    store.set_status(1, 'failed')
+    assert store[1]['status'] == 'failed'
@@ -0,0 +1,30 @@
+"""거래 내역 조회 (/api/transactions) 테스트"""
+import pytest
+
+
+@pytest.mark.parametrize('limit', ['-5', '0', 'abc', ''])
+def test_invalid_limit_returns_400(client, login, limit):
+    response = client.get(f'/api/transactions?limit={limit}', headers=login('testuser1'))
+    assert response.status_code == 400
+
+
+def test_limit_pages_with_cursor(client, login):
+    headers = login('testuser1')
+
+    everything = client.get('/api/transactions', headers=headers).get_json()
+    first = client.get('/api/transactions?limit=2', headers=headers).get_json()
+
+    assert first['count'] == 2
+    assert first['hasMore']
+
+    second = client.get(f"/api/transactions?limit=1000&cursor={first['nextCursor']}", headers=headers).get_json()
+    ids = [transaction['id'] for transaction in first['transactions'] + second['transactions']]
+    assert ids == [transaction['id'] for transaction in everything['transactions']]
+
+
+def test_limit_is_clamped(client, login, monkeypatch):
+    from server import app
+    monkeypatch.setitem(app.config, 'TRANSACTIONS_PAGE_MAX_LIMIT', 1)
+
+    response = client.get('/api/transactions?limit=50', headers=login('testuser1')).get_json()
+    assert response['count'] == 1
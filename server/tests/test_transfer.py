@@ -0,0 +1,64 @@
+"""일반 이체 (/api/transfer) 입력 검증 테스트"""
+import pytest
+
+from server import TransferError, data_store
+
+
+def balances():
+    return [account['balance'] for account in data_store.accounts.values()]
+
+
+@pytest.mark.parametrize('amount', [-5000, '1000', 1000.5, True])
+def test_invalid_amount_returns_400_without_moving_money(client, login, amount):
+    before = balances()
+    transaction_count = len(data_store.transactions)
+
+    response = client.post(
+        '/api/transfer',
+        headers=login('testuser1'),
+        json={'recipientName': '김철수', 'amount': amount}
+    )
+
+    assert response.status_code == 400
+    assert balances() == before
+    assert len(data_store.transactions) == transaction_count
+
+
+@pytest.mark.parametrize('amount, fee', [(-5000, 500), (0, 500), (1000, -1), (1000.5, 500), ('1000', 500)])
+def test_engine_rejects_invalid_amount(amount, fee):
+    with pytest.raises(TransferError) as error:
+        data_store.transfer(1, 2, 1, 4, amount, fee)
+    assert error.value.code == 'invalid_transfer'
+
+    with pytest.raises(TransferError) as error:
+        data_store.prepare_transfer(1, 2, 1, 4, amount, fee)
+    assert error.value.code == 'invalid_transfer'
+
+
+def test_valid_transfer(client, login):
+    sender_account = data_store.get_user_accounts(1)[0]
+    balance = sender_account['balance']
+
+    response = client.post(
+        '/api/transfer',
+        headers=login('testuser1'),
+        json={'recipientName': '김철수', 'amount': 1000}
+    )
+
+    assert response.status_code == 200
+    assert sender_account['balance'] == balance - 1000 - 500
+
+
+def test_fuzzy_recipient_name_is_not_transferred_without_confirmation(client, login):
+    before = balances()
+    headers = login('testuser1')
+
+    response = client.post('/api/transfer', headers=headers, json={'recipientName': '김철주', 'amount': 10000})
+
+    assert response.status_code == 404
+    assert [candidate['name'] for candidate in response.get_json()['candidates']] == ['김철수']
+    assert balances() == before
+
+    # 확인용 조회에서는 보정 결과를 제안
+    resolved = client.get('/api/recipients/resolve?name=김철주', headers=headers).get_json()['resolved']
+    assert resolved['name'] == '김철수'
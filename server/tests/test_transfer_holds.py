@@ -0,0 +1,125 @@
+"""준비된 이체의 출금 보류, 만료, 확인 테스트"""
+from datetime import timedelta
+
+from server import data_store, utc_now
+
+SENDER_ID = 1  # testuser1
+RECIPIENT_ID = 2  # 김철수
+
+
+def accounts():
+    sender_account = data_store.get_user_accounts(SENDER_ID)[0]
+    recipient_account = data_store.get_user_accounts(RECIPIENT_ID)[0]
+    return sender_account, recipient_account
+
+
+def prepare(amount=10000, fee=500, ttl=180):
+    sender_account, recipient_account = accounts()
+    return data_store.prepare_transfer(
+        sender_id=SENDER_ID,
+        recipient_id=RECIPIENT_ID,
+        sender_account_id=sender_account['id'],
+        recipient_account_id=recipient_account['id'],
+        amount=amount,
+        fee=fee,
+        ttl=ttl
+    )
+
+
+def confirm(client, login, transaction_id):
+    return client.post(
+        '/api/transfer/voice/confirm',
+        headers=login('testuser1'),
+        json={'transactionId': transaction_id}
+    )
+
+
+def test_hold_reduces_available_balance_only(client, login):
+    sender_account, _ = accounts()
+    balance = sender_account['balance']
+    available = data_store.get_available_balance(sender_account['id'])
+
+    result = prepare(amount=10000, fee=500)
+
+    assert sender_account['balance'] == balance
+    assert result['available_balance'] == available - 10500
+    assert data_store.get_available_balance(sender_account['id']) == available - 10500
+
+    # 보류 금액은 다른 이체에 쓸 수 없음
+    response = client.post(
+        '/api/transfer',
+        headers=login('testuser1'),
+        json={'recipientName': '김철수', 'amount': available - 10500 + 1}
+    )
+    assert response.status_code == 400
+    assert sender_account['balance'] == balance
+
+    assert confirm(client, login, result['transaction_id']).status_code == 200
+    assert sender_account['balance'] == balance - 10500
+    assert data_store.get_available_balance(sender_account['id']) == available - 10500
+
+
+def test_confirm_after_ttl_returns_410_and_releases_hold(client, login):
+    sender_account, recipient_account = accounts()
+    balance = sender_account['balance']
+    recipient_balance = recipient_account['balance']
+    available = data_store.get_available_balance(sender_account['id'])
+
+    result = prepare(ttl=0)
+    response = confirm(client, login, result['transaction_id'])
+
+    assert response.status_code == 410
+    assert data_store.transactions[result['transaction_id']]['status'] == 'expired'
+    assert result['transaction_id'] not in data_store.transfer_holds
+    assert data_store.get_available_balance(sender_account['id']) == available
+    assert sender_account['balance'] == balance
+    assert recipient_account['balance'] == recipient_balance
+
+    # 만료된 거래는 다시 확인해도 410
+    assert confirm(client, login, result['transaction_id']).status_code == 410
+
+
+def test_double_confirm_returns_409(client, login):
+    sender_account, _ = accounts()
+    result = prepare(amount=3000)
+
+    assert confirm(client, login, result['transaction_id']).status_code == 200
+    balance = sender_account['balance']
+
+    response = confirm(client, login, result['transaction_id'])
+    assert response.status_code == 409
+    assert sender_account['balance'] == balance
+
+
+def test_sweeper_expires_hold():
+    sender_account, _ = accounts()
+    available = data_store.get_available_balance(sender_account['id'])
+
+    result = prepare(ttl=0)
+
+    assert data_store.expire_transaction(result['transaction_id'])
+    assert data_store.transactions[result['transaction_id']]['status'] == 'expired'
+    assert data_store.get_available_balance(sender_account['id']) == available
+    assert not data_store.expire_transaction(result['transaction_id'])
+
+
+def test_confirm_other_users_transaction_returns_404(client, login):
+    result = prepare()
+    response = client.post(
+        '/api/transfer/voice/confirm',
+        headers=login('김철수'),
+        json={'transactionId': result['transaction_id']}
+    )
+    assert response.status_code == 404
+    assert data_store.transactions[result['transaction_id']]['status'] == 'pending'
+    data_store.expire_transaction(result['transaction_id'], now=utc_now() + timedelta(days=1))
+
+
+def test_boolean_transaction_id_is_rejected(client, login):
+    # True == 1 이므로 거래 1번으로 해석되면 안 됨
+    assert data_store.transactions.get(True) is None
+
+    assert confirm(client, login, True).status_code == 400
+
+    response = client.post('/api/transfer/execute', headers=login('testuser1'), json={'transaction_id': True})
+    assert response.status_code == 400
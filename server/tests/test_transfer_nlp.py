@@ -0,0 +1,18 @@
+"""이체 발화 분석 (transfer_nlp) 테스트"""
+import pytest
+
+from bench_nlp import REGRESSION_CASES
+from transfer_nlp import NLPService
+
+nlp_service = NLPService()
+
+
+@pytest.mark.parametrize('text, recipient, amount', REGRESSION_CASES)
+def test_extract_transfer_info(text, recipient, amount):
+    result = nlp_service.extract_transfer_info(text)
+    assert (result['recipient'], result['amount']) == (recipient, amount)
+
+
+@pytest.mark.parametrize('text', ['1' * 5000 + 'x', '1,' * 3000 + 'x', '일' * 3000 + '가'])
+def test_long_input_is_parsed_without_backtracking_blowup(text):
+    nlp_service.extract_transfer_info(text)
@@ -0,0 +1,43 @@
+"""음성 내용 해시 특성 캐시 (VoiceFeatureCache) 와 재전송 확인 테스트"""
+import io
+
+import numpy as np
+
+from server import VoiceFeatureCache, app, feature_extractor
+
+
+def test_replay_is_detected_only_after_authentication():
+    cache = VoiceFeatureCache()
+    key = VoiceFeatureCache.content_key(b'audio', 'a.wav', {'engine': 'librosa'})
+    cache.put(key, np.ones(26))
+
+    assert not cache.is_replay(key, window=300)
+    cache.mark_authenticated(key)
+    assert cache.is_replay(key, window=300)
+    assert not cache.is_replay(key, window=-1)  # 확인 기간이 지난 경우
+    np.testing.assert_array_equal(cache.get(key), np.ones(26))
+
+
+def test_same_recording_is_rejected_on_second_use(client, login, voice_profiles, voice_wav, monkeypatch):
+    monkeypatch.setitem(app.config, 'VOICE_REPLAY_DETECTION', True)
+    wav = voice_wav()
+    voice_profiles(1, feature_extractor.extract(wav, 'voice.wav'))
+    headers = login('testuser1')
+
+    def prepare(audio):
+        # 금액이 없는 문장이라 인증 후 이체는 만들지 않음
+        return client.post(
+            '/api/transfer/voice/prepare', headers=headers,
+            data={'audio': (io.BytesIO(audio), 'voice.wav'), 'text': '잔액 알려줘'},
+            content_type='multipart/form-data'
+        )
+
+    first = prepare(wav)
+    assert first.status_code != 401
+
+    replayed = prepare(wav)
+    assert replayed.status_code == 401
+    assert replayed.get_json()['message'] == '이미 사용된 음성입니다. 다시 말씀해주세요.'
+
+    # 다른 녹음(같은 화자)은 재전송이 아님
+    assert prepare(voice_wav(seed=1)).status_code == first.status_code
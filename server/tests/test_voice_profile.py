@@ -0,0 +1,52 @@
+"""음성 프로필 다중 샘플 누적 (Welford) 테스트"""
+import numpy as np
+
+from server import data_store
+
+USER_ID = 4
+
+
+def samples(count, dim=26, seed=0):
+    return list(np.random.default_rng(seed).normal(size=(count, dim)))
+
+
+def test_samples_fold_into_mean_and_m2(voice_profiles):
+    voice_profiles(USER_ID, np.zeros(26))
+    enrolled = samples(5)
+
+    profile = data_store.update_voice_profile(USER_ID, enrolled, replace=True)
+
+    assert profile['sample_count'] == 5
+    np.testing.assert_allclose(profile['voice_features'], np.mean(enrolled, axis=0))
+    np.testing.assert_allclose(profile['feature_m2'] / 5, np.var(enrolled, axis=0))
+
+    more = samples(3, seed=1)
+    profile = data_store.update_voice_profile(USER_ID, more)
+    np.testing.assert_allclose(profile['voice_features'], np.mean(enrolled + more, axis=0))
+    np.testing.assert_allclose(profile['feature_m2'] / 8, np.var(enrolled + more, axis=0))
+
+
+def test_enrollment_is_written_once(voice_profiles):
+    voice_profiles(USER_ID, np.zeros(26))
+    writes = []
+    data_store.add_write_listener(lambda op, args: writes.append(op))
+    try:
+        data_store.update_voice_profile(USER_ID, samples(4), replace=True)
+    finally:
+        data_store._write_listeners.pop()
+
+    assert writes == ['put_voice_profile']
+
+
+def test_capped_updates_decay_m2_with_mean(voice_profiles):
+    voice_profiles(USER_ID, np.zeros(26))
+    data_store.update_voice_profile(USER_ID, samples(5), replace=True)
+    target = np.ones(26)
+
+    for _ in range(200):
+        profile = data_store.update_voice_profile(USER_ID, [target], max_samples=5)
+
+    # 같은 샘플만 계속 들어오면 평균은 그 샘플로, 분산은 0으로 수렴
+    assert profile['sample_count'] == 5
+    np.testing.assert_allclose(profile['voice_features'], target, atol=1e-6)
+    np.testing.assert_allclose(profile['feature_m2'], 0, atol=1e-6)
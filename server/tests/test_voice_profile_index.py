@@ -0,0 +1,18 @@
+"""음성 프로필 벡터 저장소 (VoiceProfileIndex) 테스트"""
+import numpy as np
+
+from server import VoiceProfileIndex
+
+
+def test_get_vector_is_not_moved_by_remove():
+    index = VoiceProfileIndex()
+    index.upsert(1, np.array([1.0, 0.0, 0.0]))
+    index.upsert(2, np.array([0.0, 1.0, 0.0]))
+
+    vector = index.get_vector(1)
+    # 1번을 지우면 마지막 행(2번)이 빈 자리로 옮겨짐
+    index.remove(1)
+
+    np.testing.assert_allclose(vector, [1.0, 0.0, 0.0])
+    np.testing.assert_allclose(index.get_vector(2), [0.0, 1.0, 0.0])
+    assert index.get_vector(1) is None
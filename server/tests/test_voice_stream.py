@@ -0,0 +1,54 @@
+"""스트리밍 음성 업로드 (VoiceStreamStore) 테스트"""
+import pytest
+
+import audio_features
+from server import VoiceStreamError, VoiceStreamStore, feature_extractor, voice_auth
+
+
+def test_chunk_rejected_with_429_when_analysis_slots_are_full():
+    store = VoiceStreamStore(voice_auth, max_active_chunks=1)
+    stream_id = store.create(1, sample_rate=16000)
+    session = store.get(1, stream_id)
+    chunk = bytes(3200)
+
+    store._chunk_slots.acquire()
+    with pytest.raises(VoiceStreamError) as error:
+        store.append(session, 0, chunk)
+    assert error.value.status == 429
+    assert error.value.expected_index == 0
+    assert store.describe(session)['nextChunkIndex'] == 0
+
+    # 슬롯이 풀리면 같은 번호로 다시 보낸 청크가 처리됨
+    store._chunk_slots.release()
+    assert store.append(session, 0, chunk)
+    assert store.describe(session)['nextChunkIndex'] == 1
+    assert store.get_stats()['busy_rejections'] == 1
+
+
+def test_streamed_score_matches_batch_score(client, login, voice_profiles, voice_wav, monkeypatch):
+    assert voice_auth.feature_engine != audio_features.ENGINE_FAST
+    wav = voice_wav()
+    batch_features = feature_extractor.extract(wav, 'voice.wav')
+    voice_profiles(1, batch_features)
+    _, batch_score = voice_auth.authenticate_voice(1, batch_features)
+
+    scores = []
+    authenticate_voice = voice_auth.authenticate_voice
+
+    def recording_authenticate_voice(user_id, features):
+        result = authenticate_voice(user_id, features)
+        scores.append(result[1])
+        return result
+
+    monkeypatch.setattr(voice_auth, 'authenticate_voice', recording_authenticate_voice)
+
+    headers = login('testuser1')
+    stream_id = client.post('/api/voice/stream', headers=headers, json={'format': 'wav'}).get_json()['streamId']
+    for index, start in enumerate(range(0, len(wav), 8000)):
+        response = client.put(f'/api/voice/stream/{stream_id}/chunks/{index}', headers=headers, data=wav[start:start + 8000])
+        assert response.status_code == 200
+    # 금액이 없는 문장이라 인증 후 이체는 만들지 않음
+    client.post(f'/api/voice/stream/{stream_id}/finish', headers=headers, json={'text': '잔액 알려줘'})
+
+    assert scores == [pytest.approx(batch_score, abs=1e-6)]
+    assert batch_score > 0.99
@@ -0,0 +1,361 @@
+"""이체 발화 텍스트 분석 모듈
+
+STT 결과 문장에서 수취인과 금액을 추출합니다. 패턴은 모듈 로드 시 한 번만
+컴파일하고, 수취인/금액 후보를 정규식 하나로 문장을 한 번 훑어 함께 찾습니다.
+Flask 앱이나 데이터 저장소에 의존하지 않으므로 벤치마크(bench_nlp.py)에서
+단독으로 불러 쓸 수 있습니다.
+"""
+import logging
+import re
+import threading
+from fractions import Fraction
+
+logger = logging.getLogger(__name__)
+
+# 금액 표현의 한 어절: 아라비아 숫자(쉼표/소수점 허용)와 한글 수사/단위의 연속
+# ("35만", "삼십오만", "3만5천", "1.5억") - 숫자열은 (?!\d)로 끝까지 한 토큰으로만
+# 나눌 수 있게 해 반복 안에서 분할 방법이 여러 개 생기지 않음 (역추적 폭주 방지)
+_NUMERAL_WORD = r'(?:\d(?:[\d,]*\d)?(?:\.\d+)?(?!\d)|[일이삼사오육칠팔구십백천만억조])+'
+# 한글로 시작하는 어절은 어절 첫머리(또는 수취인 조사 바로 뒤)에서만 시작
+# ("내일", "회사", "친구"의 끝 글자를 수사로 읽지 않음)
+_NUMERAL_START = r'(?:(?<![가-힣])|(?<=에게)|(?<=한테)|(?<=께))'
+# 한글로 시작하는 어절은 뒤에 '원' 또는 한글이 아닌 문자가 와야 함 ("오늘", "이체", "천천히" 제외)
+_NUMERAL_END = r'(?=\s*원|[^가-힣]|$)'
+
+# 수취인("김철수에게", "홍길동 님한테")과 금액("10만원", "삼십오만 이천원", "1억 2천만원") 후보를 한 번에 찾는 패턴
+# - 이름은 최소 길이로 매칭해 뒤따르는 호칭 '님'을 이름에서 제외
+# - 금액은 띄어 쓴 어절("삼십오만 이천원")까지 한 덩어리로 찾고 '원' 여부를 캡처
+TRANSFER_PATTERN = re.compile(
+    r'(?P<recipient>[가-힣]{2,4}?)\s*(?:님)?\s*(?:에게|한테|께)'
+    rf'|(?P<amount>(?:(?=\d){_NUMERAL_WORD}|{_NUMERAL_START}{_NUMERAL_WORD}{_NUMERAL_END})(?:\s+{_NUMERAL_WORD}{_NUMERAL_END})*)'
+    r'\s*(?P<won>원)?'
+)
+
+# 금액 표현을 숫자/한글 숫자/단위 토큰으로 분리
+NUMERAL_TOKEN_PATTERN = re.compile(r'\d(?:[\d,]*\d)?(?:\.\d+)?|[일이삼사오육칠팔구십백천만억조]')
+
+# 가장 흔한 "숫자 + 단위 하나" 형태 ("5만", "3000", "7천")는 토큰 분리 없이 바로 계산
+SIMPLE_AMOUNT_PATTERN = re.compile(r'(\d{1,16})\s*([십백천만억조]?)')
+
+# 한 자리 단위 (십/백/천)와 네 자리 단위 (만/억/조) 구분 기준
+SMALL_UNIT_LIMIT = 1000
+MAX_DIGITS = 16  # 아라비아 숫자 최대 자릿수 (오인식된 긴 숫자열 제외)
+
+
+class NLPService:
+    def __init__(self):
+        self.currency_words = {
+            '만': 10000,
+            '천': 1000,
+            '십': 10,
+            '백': 100,
+            '억': 10 ** 8,
+            '조': 10 ** 12,
+        }
+        self.hangul_digits = {
+            '일': 1, '이': 2, '삼': 3, '사': 4, '오': 5,
+            '육': 6, '칠': 7, '팔': 8, '구': 9,
+        }
+
+    def extract_transfer_info(self, text):
+        """STT 텍스트에서 이체 정보 추출"""
+        try:
+            recipient, amount = self._scan(text)
+
+            return {
+                'recipient': recipient,
+                'amount': amount,
+                'original_text': text,
+                'extracted_successfully': recipient is not None and amount is not None
+            }
+
+        except Exception as e:
+            logger.error(f"텍스트 파싱 오류: {str(e)}")
+            return {
+                'recipient': None,
+                'amount': None,
+                'original_text': text,
+                'extracted_successfully': False,
+                'error': str(e)
+            }
+
+    def _scan(self, text):
+        """문장을 한 번 훑어 (수취인, 금액) 반환
+
+        수취인은 처음 나온 것을 사용합니다. 금액 후보가 여럿이면 '원'이 붙은 것,
+        그중 큰 단위(억 > 만 > 천 ...)가 쓰인 것, 그다음 먼저 나온 것을 고릅니다.
+        '원'이 붙은 금액이 띄어쓰기만 두고 이어지면 ("삼십오만원 이천원") 한
+        금액으로 합치고, 합칠 수 없으면 ("만원 만원") 금액을 알 수 없는 것으로
+        봅니다 (말한 것보다 적은 금액을 조용히 보내지 않도록).
+        """
+        recipient = None
+        amounts = []  # [값, 가장 큰 단위, '원' 여부, 끝 위치]
+
+        for match in TRANSFER_PATTERN.finditer(text):
+            name = match.group('recipient')
+            if name is not None:
+                if recipient is None:
+                    recipient = name
+                continue
+
+            has_won = match.group('won') is not None
+            parsed = self._parse_span(match.group('amount'), has_won)
+            if parsed is None:
+                continue
+
+            value, largest_unit = parsed
+            previous = amounts[-1] if amounts else None
+            if has_won and previous is not None and previous[2] and not text[previous[3]:match.start()].strip():
+                value = self._merge_amounts(previous[0], value)
+                if value is None:
+                    return recipient, None
+                largest_unit = max(largest_unit, previous[1])
+                amounts.pop()
+            amounts.append([value, largest_unit, has_won, match.end()])
+
+        amount = None
+        best_priority = None
+        for value, largest_unit, has_won, _ in amounts:
+            priority = (0 if has_won else 1, -largest_unit)
+            if best_priority is None or priority < best_priority:
+                best_priority = priority
+                amount = value
+
+        return recipient, amount
+
+    @staticmethod
+    def _merge_amounts(head, tail):
+        """이어진 두 금액 합치기 - 뒤 금액이 앞 금액의 가장 낮은 자리보다 작을 때만
+
+        "삼십오만원 이천원" -> 352000, "삼만원 오천원" -> 35000,
+        "오천원 삼만원"/"만원 만원"처럼 자리가 겹치면 None.
+        """
+        place = 1
+        while head % (place * 10) == 0:
+            place *= 10
+        return head + tail if tail < place else None
+
+    def _parse_span(self, span, has_won):
+        """금액 후보 파싱 - 전체가 금액이 아니면 뒤쪽 어절부터 다시 시도
+
+        "이 5만", "구 3천"처럼 수사로 읽히는 앞 단어가 금액 어절에 붙어 잡힌 경우
+        실제 금액인 뒷부분("5만")을 살립니다.
+        """
+        parsed = self.parse_numeral(span, has_won)
+        if parsed is not None:
+            return parsed
+
+        words = span.split()
+        for i in range(1, len(words)):
+            parsed = self.parse_numeral(' '.join(words[i:]), has_won)
+            if parsed is not None:
+                return parsed
+        return None
+
+    def parse_numeral(self, span, has_won=True):
+        """금액 표현 파싱 - (금액, 사용된 가장 큰 단위) 또는 None
+
+        "삼십오만 이천" -> 352000, "1억 2천만" -> 120000000, "3만5천" -> 35000.
+        토큰을 한 번만 훑으며 만/억/조 단위 아래 구간(section)과 직전 숫자(number)를
+        누적합니다. 단위 없는 숫자만 있는 경우와 '원' 없이 한글로만 쓴 경우는
+        금액으로 보지 않습니다 (일반 단어/숫자 오인식 방지).
+        """
+        simple = SIMPLE_AMOUNT_PATTERN.fullmatch(span)
+        if simple is not None:
+            number, unit = simple.groups()
+            if not unit and not has_won:
+                return None
+            unit_value = self.currency_words[unit] if unit else 0
+            value = int(number) * (unit_value or 1)
+            return (value, unit_value) if value > 0 else None
+
+        total = 0
+        section = 0
+        number = None
+        largest_unit = 0
+        last_big_unit = None
+        last_small_unit = None
+        has_digits = False
+
+        for token in NUMERAL_TOKEN_PATTERN.findall(span):
+            if token[0].isdigit():
+                if number is not None:
+                    return None  # 숫자가 단위 없이 연달아 나옴 ("10 000", "이삼")
+                if len(token) > MAX_DIGITS + token.count(',') + token.count('.'):
+                    return None
+                number = Fraction(token.replace(',', '')) if '.' in token else int(token.replace(',', ''))
+                has_digits = True
+                continue
+
+            digit = self.hangul_digits.get(token)
+            if digit is not None:
+                if number is not None:
+                    return None
+                number = digit
+                continue
+
+            unit = self.currency_words[token]
+            largest_unit = max(largest_unit, unit)
+            if unit <= SMALL_UNIT_LIMIT:
+                if last_small_unit is not None and unit >= last_small_unit:
+                    return None  # "백천"처럼 작은 단위 순서가 맞지 않음
+                section += (1 if number is None else number) * unit
+                last_small_unit = unit
+            else:
+                if last_big_unit is not None and unit >= last_big_unit:
+                    return None  # "만억"처럼 큰 단위 순서가 맞지 않음
+                total += (section + (0 if number is None else number) or 1) * unit
+                section = 0
+                last_big_unit = unit
+                last_small_unit = None
+            number = None
+
+        if not largest_unit and not has_won:
+            return None
+        if not has_digits and not has_won:
+            return None
+
+        value = total + section + (0 if number is None else number)
+        if isinstance(value, Fraction):
+            if value.denominator != 1:
+                return None
+            value = int(value)
+        if value <= 0:
+            return None
+        return value, largest_unit
+
+    def _extract_amount(self, text):
+        """텍스트에서 금액 추출"""
+        return self._scan(text)[1]
+
+
+# ========================= 수취인 이름 검색 =========================
+
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+
+
+def decompose_jamo(text):
+    """한글 음절을 초성/중성/종성 자모 문자열로 분해 ("철" -> "철")
+
+    음절 단위보다 세밀하게 비교해 "김철쑤"와 "김철수"처럼 STT가 받침이나
+    된소리를 잘못 인식한 경우도 편집 거리 1로 잡습니다. 한글이 아닌 문자는 그대로.
+    """
+    jamo = []
+    for char in text:
+        code = ord(char) - HANGUL_BASE
+        if 0 <= code <= HANGUL_LAST - HANGUL_BASE:
+            jamo.append(chr(0x1100 + code // 588))
+            jamo.append(chr(0x1161 + (code % 588) // 28))
+            if code % 28:
+                jamo.append(chr(0x11A7 + code % 28))
+        else:
+            jamo.append(char)
+    return ''.join(jamo)
+
+
+def jamo_distance(a, b, max_distance):
+    """자모열 편집 거리 (max_distance를 넘으면 max_distance + 1 반환)"""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+
+    previous_row = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        row = [i]
+        for j, char_b in enumerate(b, 1):
+            row.append(min(row[j - 1] + 1, previous_row[j] + 1, previous_row[j - 1] + (char_a != char_b)))
+        if min(row) > max_distance:
+            return max_distance + 1
+        previous_row = row
+    return previous_row[-1]
+
+
+class RecipientIndex:
+    """자모 단위 삭제 이웃(symmetric delete) 기반 이름 색인 (정확/유사 검색)
+
+    이름마다 자모열과 자모 하나를 뺀 변형들을 키로 등록해 두고, 검색어도 같은
+    변형을 만들어 사전 조회만으로 후보를 찾습니다. 자모 편집 거리 1 이내의 이름은
+    모두 후보에 들어오며(거리 2 일부 포함), 후보만 실제 거리를 계산해 순위를
+    매기므로 색인 크기와 무관하게 검색어 길이에 비례하는 시간에 끝납니다.
+    """
+
+    def __init__(self):
+        self._names = {}  # 이름 -> {값, ...}
+        self._keys = {}  # 자모 변형 -> 이름 또는 {이름, ...}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _variants(jamo):
+        variants = {jamo}
+        if len(jamo) > 1:
+            variants.update(jamo[:i] + jamo[i + 1:] for i in range(len(jamo)))
+        return variants
+
+    def add(self, name, value):
+        """이름에 값(사용자 ID, 계좌 ID 등) 추가"""
+        with self._lock:
+            values = self._names.get(name)
+            if values is None:
+                values = self._names[name] = set()
+                for key in self._variants(decompose_jamo(name)):
+                    current = self._keys.get(key)
+                    if current is None:
+                        self._keys[key] = name
+                    elif isinstance(current, set):
+                        current.add(name)
+                    elif current != name:
+                        self._keys[key] = {current, name}
+            values.add(value)
+
+    def remove(self, name, value):
+        """이름에서 값 제거 (값이 모두 빠진 이름은 색인에서 제거)"""
+        with self._lock:
+            values = self._names.get(name)
+            if not values or value not in values:
+                return
+            values.discard(value)
+            if values:
+                return
+
+            del self._names[name]
+            for key in self._variants(decompose_jamo(name)):
+                current = self._keys.get(key)
+                if current == name:
+                    del self._keys[key]
+                elif isinstance(current, set):
+                    current.discard(name)
+                    if len(current) == 1:
+                        self._keys[key] = next(iter(current))
+
+    def get(self, name):
+        """정확히 일치하는 이름의 값 집합 (없으면 빈 집합)"""
+        with self._lock:
+            return set(self._names.get(name, ()))
+
+    def search(self, name, max_distance=1, limit=5):
+        """유사 이름 검색 - [(이름, 자모 편집 거리, {값, ...}), ...] (거리 오름차순)"""
+        query = decompose_jamo(name)
+        results = []
+
+        with self._lock:
+            candidates = set()
+            for key in self._variants(query):
+                current = self._keys.get(key)
+                if current is None:
+                    continue
+                if isinstance(current, set):
+                    candidates.update(current)
+                else:
+                    candidates.add(current)
+
+            for candidate in candidates:
+                distance = jamo_distance(query, decompose_jamo(candidate), max_distance)
+                if distance <= max_distance:
+                    results.append((candidate, distance, set(self._names[candidate])))
+
+        # 거리, 길이 차이, 이름 순
+        results.sort(key=lambda result: (result[1], abs(len(result[0]) - len(name)), result[0]))
+        return results[:limit]
+
+    def __len__(self):
+        return sum(len(values) for values in self._names.values())